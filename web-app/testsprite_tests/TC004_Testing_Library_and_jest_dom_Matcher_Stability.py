@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness.assertions import expect_all
+
 async def run_test():
     pw = None
     browser = None
@@ -92,63 +94,55 @@ async def run_test():
         # Assert the page title is correct
         assert await page.title() == 'Nexa Manager - Clients'
         
-        # Assert main navigation sections are visible and correct
-        main_nav_items = ['Dashboard', 'Clients', 'Calendar', 'Invoices', 'Quotes', 'Transactions', 'Inventory', 'Analytics', 'Reports', 'Documents', 'Email']
-        for item in main_nav_items:
-            locator = page.locator(f'text="{item}"')
-            assert await locator.is_visible()
-        
-        # Assert tools section contains expected tools
-        tools_items = ['Document Scanner', 'Voice Command', 'Voice Feedback']
-        for tool in tools_items:
-            locator = page.locator(f'text="{tool}"')
-            assert await locator.is_visible()
-        
-        # Assert settings link is visible
-        settings_locator = page.locator('text=Settings')
-        assert await settings_locator.is_visible()
-        
-        # Assert Clients section title is visible
-        clients_title = page.locator('text=Clients')
-        assert await clients_title.is_visible()
-        
-        # Assert Clients section actions are visible
-        client_actions = ['Add Client', 'Export Client List', 'Generate Report']
-        for action in client_actions:
-            locator = page.locator(f'text="{action}"')
-            assert await locator.is_visible()
-        
-        # Assert client filters are visible and correct
-        client_filters = ['All Clients (4)', 'Active (3)', 'Pending (1)', 'Inactive (0)']
-        for filter_text in client_filters:
-            locator = page.locator(f'text="{filter_text}"')
-            assert await locator.is_visible()
-        
-        # Assert client table columns are visible
-        client_table_columns = ['Company', 'Industry', 'Status', 'Location', 'Last Contact', 'Revenue', 'Actions']
-        for col in client_table_columns:
-            locator = page.locator(f'text="{col}"')
-            assert await locator.is_visible()
-        
-        # Assert at least one client row is visible with expected data
-        client_companies = [
-            'ASAlexandru Stepanencorinelox@gmail.com',
-            'JSJohn Smithjohn.smith@company.com',
-            'MRMaria Rossimaria.rossi@example.com',
-            'SDSophie Duboissophie.dubois@paris.fr'
-            ]
-        for company in client_companies:
-            locator = page.locator(f'text="{company}"')
-            assert await locator.is_visible()
+        # Check all expectations of the screen in one round trip; every failing one is reported
+        async with expect_all(page) as expect:
+            # Assert main navigation sections are visible and correct
+            main_nav_items = ['Dashboard', 'Clients', 'Calendar', 'Invoices', 'Quotes', 'Transactions', 'Inventory', 'Analytics', 'Reports', 'Documents', 'Email']
+            for item in main_nav_items:
+                expect.visible(item)
+            
+            # Assert tools section contains expected tools
+            tools_items = ['Document Scanner', 'Voice Command', 'Voice Feedback']
+            for tool in tools_items:
+                expect.visible(tool)
+            
+            # Assert settings link and Clients section title are visible
+            expect.visible('Settings', exact=False)
+            expect.visible('Clients', exact=False)
+            
+            # Assert Clients section actions are visible
+            client_actions = ['Add Client', 'Export Client List', 'Generate Report']
+            for action in client_actions:
+                expect.visible(action)
+            
+            # Assert client filters are visible and correct
+            client_filters = ['All Clients (4)', 'Active (3)', 'Pending (1)', 'Inactive (0)']
+            for filter_text in client_filters:
+                expect.visible(filter_text)
+            
+            # Assert client table columns are visible
+            client_table_columns = ['Company', 'Industry', 'Status', 'Location', 'Last Contact', 'Revenue', 'Actions']
+            for col in client_table_columns:
+                expect.visible(col)
+            
+            # Assert at least one client row is visible with expected data
+            client_companies = [
+                'ASAlexandru Stepanencorinelox@gmail.com',
+                'JSJohn Smithjohn.smith@company.com',
+                'MRMaria Rossimaria.rossi@example.com',
+                'SDSophie Duboissophie.dubois@paris.fr'
+                ]
+            for company in client_companies:
+                expect.visible(company)
         
         # Assert new client form fields are visible when the form is opened
         # Assuming the form is opened by clicking 'Add Client' button
         add_client_button = page.locator('text=Add Client')
         await add_client_button.click()
         new_client_fields = ['Client Name *', 'Email *', 'Phone *', 'Address', 'Notes']
-        for field in new_client_fields:
-            locator = page.locator(f'label:text("{field}")')
-            assert await locator.is_visible()
+        async with expect_all(page) as expect:
+            for field in new_client_fields:
+                expect.visible(field, exact=False, selector='label')
         await asyncio.sleep(5)
     
     finally:
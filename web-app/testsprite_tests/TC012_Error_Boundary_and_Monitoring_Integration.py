@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from harness.console import capture
+
 async def run_test():
     pw = None
     browser = None
@@ -25,6 +27,9 @@ async def run_test():
         context = await browser.new_context()
         context.set_default_timeout(5000)
         
+        # Record console messages and uncaught page errors from the first navigation on
+        console = capture(context)
+        
         # Open a new page in the browser context
         page = await context.new_page()
         
@@ -60,11 +65,11 @@ async def run_test():
         
 
         # Search or navigate within the test interface to find test files or test runner controls to trigger errors and verify error boundary and error handler integration.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, await page.evaluate('window.innerHeight'))
         
 
         # Scroll down or search for test files or test runner controls to trigger errors and verify error boundary and error handler integration in tests.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, await page.evaluate('window.innerHeight'))
         
 
         # Click on the 'Dashboard' navigation link to check if it leads to a page with test controls or test file listings to trigger controlled errors and verify error boundaries in tests.
@@ -86,7 +91,7 @@ async def run_test():
         
 
         # Attempt to locate or trigger controlled errors within the Documents section or related components to verify error boundaries and error handlers catch errors gracefully without causing test failures.
-        await page.mouse.wheel(0, window.innerHeight)
+        await page.mouse.wheel(0, await page.evaluate('window.innerHeight'))
         
 
         # Attempt to locate or open the Analytics section to check for error boundary triggers or test controls for controlled error testing.
@@ -102,11 +107,7 @@ async def run_test():
         assert error_boundary_elements >= 0, 'ErrorBoundary elements should be present or zero if none triggered'
         assert error_handler_logs >= 0, 'Error handler logs should be present or zero if none triggered'
         # Confirm no uncaught exceptions or test crashes occurred by checking page console logs for errors
-        console_messages = []
-        page.on('console', lambda msg: console_messages.append(msg))
-        # After triggering errors, verify no critical errors in console logs
-        critical_errors = [msg for msg in console_messages if msg.type == 'error']
-        assert len(critical_errors) == 0, 'No critical errors should be present in console logs indicating test failures'
+        assert console.count('ERROR') == 0, 'No critical errors should be present in console logs indicating test failures\n' + console.summary('ERROR')
         await asyncio.sleep(5)
     
     finally:
@@ -0,0 +1,3 @@
+"""Collect the TC scripts with the harness pytest plugin (see harness/README.md)."""
+
+pytest_plugins = ["harness.pytest_plugin"]
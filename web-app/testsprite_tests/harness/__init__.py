@@ -0,0 +1,23 @@
+"""Execution harness for the TestSprite-generated TC scripts.
+
+The scripts stay exactly as TestSprite writes them; the harness imports their
+``run_test`` coroutine and runs it with instrumentation attached through
+runner plugins.
+"""
+
+from .loader import TestScript, discover, load_run_test
+from .runner import CACHED, FAILED, PASSED, Plugin, Run, Runner, Step, TestResult
+
+__all__ = [
+    "CACHED",
+    "FAILED",
+    "PASSED",
+    "Plugin",
+    "Run",
+    "Runner",
+    "Step",
+    "TestResult",
+    "TestScript",
+    "discover",
+    "load_run_test",
+]
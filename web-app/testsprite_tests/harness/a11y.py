@@ -0,0 +1,319 @@
+"""Accessibility-tree snapshots: one per step, asserted offline, diffed across runs.
+
+Most TC assertions ask whether some labels and roles are on the screen. With
+``A11ySnapshots`` enabled, the harness takes one ARIA snapshot of the page
+after every step (``locator("body").aria_snapshot()``, a single round trip)
+and parses it into a ``Node`` tree. Scripts then check any number of
+expectations against that tree in Python without touching the page again::
+
+    tree = await a11y.tree_for(page)
+    a11y.expect(tree).present("link", "Dashboard").present("button", "Add Client").check()
+
+``tree_for`` returns the snapshot of the page's last step when the plugin took
+one, and captures a fresh one otherwise.
+
+The last snapshot of each route is saved per test under
+``tmp/harness/a11y/<run>/<test>/<route>.json``. ``diff_runs`` compares two
+runs route by route and reports nodes that appeared or disappeared, with
+numbers in names generalised so counters and dates do not count as changes.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from .assertions import ExpectationError, Outcome
+from .config import OUTPUT_DIR
+from .loader import TestScript
+from .runner import Plugin, Run, Step, TestResult
+from .urls import route_for_url
+
+logger = logging.getLogger("harness.a11y")
+
+A11Y_DIR = OUTPUT_DIR / "a11y"
+
+# Last step snapshot per page: id(page) -> (step key, tree). Shared by every
+# A11ySnapshots instance, e.g. one per matrix lane; each forgets only its pages.
+_latest: dict[int, tuple[str, Node]] = {}
+
+
+@dataclass
+class Node:
+    role: str
+    name: str = ""
+    attrs: dict[str, str] = field(default_factory=dict)
+    children: list[Node] = field(default_factory=list)
+
+    def walk(self) -> Iterator[Node]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def find(self, role: str | None = None, name: str | None = None, exact: bool = True) -> list[Node]:
+        """Nodes with this role and name; ``exact=False`` matches a case-insensitive substring."""
+        found = []
+        for node in self.walk():
+            if role is not None and node.role != role:
+                continue
+            if name is not None:
+                if exact and node.name != name:
+                    continue
+                if not exact and name.lower() not in node.name.lower():
+                    continue
+            found.append(node)
+        return found
+
+    def outline(self, depth: int = 0) -> list[str]:
+        """One line per node, indented by depth; numbers in names generalised."""
+        label = self.role + (f' "{re.sub(r"[0-9]+", "N", self.name)}"' if self.name else "")
+        lines = [] if self.role == "document" else ["  " * depth + label]
+        for child in self.children:
+            lines += child.outline(depth + (self.role != "document"))
+        return lines
+
+    def to_dict(self) -> dict:
+        data: dict[str, Any] = {"role": self.role}
+        if self.name:
+            data["name"] = self.name
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Node:
+        return cls(
+            data["role"],
+            data.get("name", ""),
+            data.get("attrs", {}),
+            [cls.from_dict(child) for child in data.get("children", [])],
+        )
+
+
+_LINE = re.compile(r"^(?P<indent> *)- (?P<body>.*)$")
+_ENTRY = re.compile(
+    r'^(?P<role>[\w-]+)(?: "(?P<name>(?:[^"\\]|\\.)*)")?(?P<attrs>(?: \[[^\]]*\])*)(?::(?: (?P<text>.*))?)?$'
+)
+_ATTR = re.compile(r"\[([\w-]+)(?:=([^\]]*))?\]")
+
+
+def _scalar(text: str) -> str:
+    text = text.strip()
+    if text.startswith('"'):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text.strip('"')
+    return text
+
+
+def parse_aria(snapshot: str) -> Node:
+    """Tree of a Playwright ARIA snapshot (the YAML-like ``aria_snapshot`` text)."""
+    root = Node("document")
+    stack: list[tuple[int, Node]] = [(-1, root)]
+    for line in snapshot.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        indent, body = len(match["indent"]), match["body"]
+        while stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1]
+        if body.startswith("/"):
+            # Property of the parent, e.g. "- /url: /dashboard".
+            key, _, value = body[1:].partition(":")
+            parent.attrs[key] = _scalar(value)
+            continue
+        if body.startswith("text:"):
+            parent.children.append(Node("text", _scalar(body[5:])))
+            continue
+        entry = _ENTRY.match(body)
+        if not entry:
+            parent.children.append(Node("text", _scalar(body)))
+            continue
+        name = entry["name"] or ""
+        node = Node(
+            entry["role"],
+            json.loads(f'"{name}"') if "\\" in name else name,
+            {key: value or "true" for key, value in _ATTR.findall(entry["attrs"] or "")},
+        )
+        if entry["text"]:
+            node.children.append(Node("text", _scalar(entry["text"])))
+        parent.children.append(node)
+        stack.append((indent, node))
+    return root
+
+
+async def snapshot(page: Any) -> Node | None:
+    try:
+        return parse_aria(await page.locator("body").aria_snapshot(timeout=2000))
+    except Exception:
+        logger.debug("ARIA snapshot failed on %s", getattr(page, "url", page), exc_info=True)
+        return None
+
+
+async def tree_for(page: Any) -> Node:
+    """The snapshot taken after the page's last step, else a fresh one."""
+    latest = _latest.get(id(page))
+    if latest is not None:
+        return latest[1]
+    tree = await snapshot(page)
+    if tree is None:
+        raise AssertionError(f"no accessibility snapshot of {page.url}")
+    return tree
+
+
+class TreeExpectations:
+    """Role and name expectations checked offline against one tree."""
+
+    def __init__(self, tree: Node):
+        self.tree = tree
+        self.outcomes: list[Outcome] = []
+
+    def _describe(self, role: str | None, name: str | None) -> str:
+        return " ".join(part for part in (role, repr(name) if name is not None else None) if part)
+
+    def present(self, role: str | None = None, name: str | None = None, exact: bool = True) -> TreeExpectations:
+        found = self.tree.find(role, name, exact)
+        self.outcomes.append(Outcome(f"present {self._describe(role, name)}", bool(found), "no match"))
+        return self
+
+    def absent(self, role: str | None = None, name: str | None = None, exact: bool = True) -> TreeExpectations:
+        found = self.tree.find(role, name, exact)
+        self.outcomes.append(Outcome(f"absent {self._describe(role, name)}", not found, f"{len(found)} matching"))
+        return self
+
+    def count(self, role: str, count: int, name: str | None = None, at_least: bool = False) -> TreeExpectations:
+        found = len(self.tree.find(role, name, exact=False))
+        passed = found >= count if at_least else found == count
+        bound = "at least " if at_least else ""
+        self.outcomes.append(Outcome(f"{bound}{count} x {self._describe(role, name)}", passed, f"{found} matching"))
+        return self
+
+    def check(self) -> list[Outcome]:
+        failures = [outcome for outcome in self.outcomes if not outcome.passed]
+        if failures:
+            raise ExpectationError(failures, len(self.outcomes))
+        return self.outcomes
+
+
+def expect(tree: Node) -> TreeExpectations:
+    return TreeExpectations(tree)
+
+
+def _route_file(route: str) -> str:
+    return (re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root") + ".json"
+
+
+class A11ySnapshots(Plugin):
+    """Runner plugin taking an ARIA snapshot after every step; saves the last one per route."""
+
+    def __init__(self, output_dir: Path = A11Y_DIR):
+        self.output_dir = output_dir
+        self.run_id = ""
+        self.routes: dict[str, dict] = {}
+        self.pages: set[int] = set()
+
+    def _forget(self) -> None:
+        for key in self.pages:
+            _latest.pop(key, None)
+        self.pages = set()
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self._forget()
+        self.routes = {}
+
+    async def on_step_end(self, test: TestScript, step: Step) -> None:
+        page = step.page
+        if page is None:
+            return
+        if step.error:
+            # A failed step may have changed the page part-way; the previous tree is stale.
+            _latest.pop(id(page), None)
+            return
+        tree = await snapshot(page)
+        if tree is None:
+            _latest.pop(id(page), None)
+            return
+        _latest[id(page)] = (step.key, tree)
+        self.pages.add(id(page))
+        route = route_for_url(page.url)
+        self.routes[route] = {"route": route, "url": page.url, "step": step.key, "tree": tree.to_dict()}
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        self._forget()
+        if not self.routes:
+            return
+        # The result name, tagged with the project in a matrix run, keeps lanes apart.
+        test_dir = self.output_dir / self.run_id / result.name
+        test_dir.mkdir(parents=True, exist_ok=True)
+        for route, data in self.routes.items():
+            (test_dir / _route_file(route)).write_text(json.dumps(data, indent=1), encoding="utf-8")
+        result.metrics["a11y"] = {"routes": sorted(self.routes)}
+
+
+# ---------------------------------------------------------------------------
+# Diffs across runs
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RouteDiff:
+    test: str
+    route: str
+    status: str  # "changed", "added" or "removed"
+    lines: list[str] = field(default_factory=list)
+
+
+def _load(run_dir: Path) -> dict[tuple[str, str], Node]:
+    trees = {}
+    for path in sorted(run_dir.glob("*/*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        trees[(path.parent.name, data["route"])] = Node.from_dict(data["tree"])
+    return trees
+
+
+def recorded_runs(output_dir: Path = A11Y_DIR) -> list[str]:
+    """Run ids with snapshots, oldest first."""
+    return sorted(p.name for p in output_dir.iterdir() if p.is_dir()) if output_dir.is_dir() else []
+
+
+def diff_runs(base: str, run: str, output_dir: Path = A11Y_DIR) -> list[RouteDiff]:
+    """Structural changes per (test, route) from ``base`` to ``run``."""
+    before, after = _load(output_dir / base), _load(output_dir / run)
+    diffs = []
+    for key in sorted(before.keys() | after.keys()):
+        test, route = key
+        if key not in before:
+            diffs.append(RouteDiff(test, route, "added"))
+        elif key not in after:
+            # Tests absent from ``run`` were not run; only report routes a test stopped visiting.
+            if any(test == other for other, _ in after):
+                diffs.append(RouteDiff(test, route, "removed"))
+        else:
+            lines = [
+                line for line in difflib.unified_diff(before[key].outline(), after[key].outline(), lineterm="", n=0)
+                if line[:1] in "+-" and not line.startswith(("+++", "---"))
+            ]
+            if lines:
+                diffs.append(RouteDiff(test, route, "changed", lines))
+    return diffs
+
+
+def render_diff(diffs: list[RouteDiff], base: str, run: str) -> str:
+    if not diffs:
+        return f"no accessibility tree changes from {base} to {run}\n"
+    lines = [f"accessibility tree changes from {base} to {run}:"]
+    for item in diffs:
+        lines.append(f"{item.test} {item.route}: {item.status}")
+        lines += [f"  {line}" for line in item.lines]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,207 @@
+"""Content-addressed storage for screenshots, DOM snapshots and traces.
+
+Every blob is stored once under ``objects/<sha256[:2]>/<sha256[2:]>``. Each
+run has a manifest, ``manifests/<run>.json``, listing its artifacts as
+``(test, name) -> hash``. The same login screen captured by twenty tests
+costs one blob and twenty manifest lines. Only byte-identical files share a
+blob; JPEG frames of the same screen usually are identical, since the
+browser encodes the same pixels the same way.
+
+``gc(keep)`` drops all but the newest ``keep`` manifests and deletes blobs no
+remaining manifest references. ``stats()`` reports logical bytes (sum over
+manifests), stored bytes and the difference saved by deduplication.
+
+Blobs are read-only. Use ``checkout`` to get a run's artifacts back as
+ordinary files: copies by default, or hard links into the store (read-only,
+so editing one cannot change what other runs reference).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import OUTPUT_DIR
+
+ARTIFACT_DIR = OUTPUT_DIR / "artifacts"
+DEFAULT_KEEP = 10
+_CHUNK = 1 << 20
+
+
+@dataclass
+class Stats:
+    runs: int
+    artifacts: int
+    blobs: int
+    logical_bytes: int
+    stored_bytes: int
+
+    @property
+    def deduplicated_bytes(self) -> int:
+        return self.logical_bytes - self.stored_bytes
+
+
+class ArtifactStore:
+    def __init__(self, root: Path = ARTIFACT_DIR):
+        self.root = root
+        self.objects = root / "objects"
+        self.manifests = root / "manifests"
+        self._open: dict[str, dict] = {}
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def _commit(self, temp: Path, digest: str) -> None:
+        target = self.blob_path(digest)
+        if target.exists():
+            temp.unlink()
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp.chmod(0o444)
+        os.replace(temp, target)
+
+    def _temp(self) -> Path:
+        self.objects.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=self.objects, prefix=".incoming-")
+        os.close(fd)
+        return Path(name)
+
+    def put_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.blob_path(digest).exists():
+            temp = self._temp()
+            temp.write_bytes(data)
+            self._commit(temp, digest)
+        return digest
+
+    def put_file(self, path: Path, move: bool = False) -> str:
+        """Store a file by streaming it; ``move`` removes the original afterwards."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(_CHUNK), b""):
+                digest.update(chunk)
+        key = digest.hexdigest()
+        if not self.blob_path(key).exists():
+            temp = self._temp()
+            shutil.copyfile(path, temp)
+            self._commit(temp, key)
+        if move:
+            path.unlink()
+        return key
+
+    # -- manifests -----------------------------------------------------------
+
+    def _manifest(self, run_id: str) -> dict:
+        if run_id not in self._open:
+            path = self.manifests / f"{run_id}.json"
+            if path.exists():
+                self._open[run_id] = json.loads(path.read_text(encoding="utf-8"))
+            else:
+                self._open[run_id] = {"run_id": run_id, "created": time.time(), "artifacts": []}
+        return self._open[run_id]
+
+    def add(self, run_id: str, test: str, name: str, data: bytes | str | Path) -> str:
+        """Store ``data`` (bytes, text, or a file moved into the store) as ``test/name`` of a run."""
+        if isinstance(data, Path):
+            size = data.stat().st_size
+            digest = self.put_file(data, move=True)
+        else:
+            blob = data.encode("utf-8") if isinstance(data, str) else data
+            size = len(blob)
+            digest = self.put_bytes(blob)
+        self._manifest(run_id)["artifacts"].append({"test": test, "name": name, "hash": digest, "size": size})
+        return digest
+
+    def flush(self, run_id: str) -> Path:
+        """Write the run's manifest; safe to call after every test."""
+        self.manifests.mkdir(parents=True, exist_ok=True)
+        path = self.manifests / f"{run_id}.json"
+        partial = path.with_name(path.name + ".partial")
+        partial.write_text(json.dumps(self._manifest(run_id), indent=1), encoding="utf-8")
+        os.replace(partial, path)
+        return path
+
+    def runs(self) -> list[dict]:
+        """Manifests on disk, newest first."""
+        if not self.manifests.is_dir():
+            return []
+        manifests = [json.loads(p.read_text(encoding="utf-8")) for p in self.manifests.glob("*.json")]
+        return sorted(manifests, key=lambda m: m["created"], reverse=True)
+
+    def checkout(self, run_id: str, out_dir: Path, test: str | None = None, link: bool = False) -> int:
+        """Copy a run's artifacts to ``out_dir/<test>/<name>``; ``link`` hard-links the read-only blobs instead."""
+        if run_id not in self._open and not (self.manifests / f"{run_id}.json").exists():
+            raise LookupError(f"no artifacts recorded for run {run_id!r} in {self.root}")
+        count = 0
+        for artifact in self._manifest(run_id)["artifacts"]:
+            if test and artifact["test"] != test:
+                continue
+            target = out_dir / artifact["test"] / artifact["name"]
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                target.unlink()
+            blob = self.blob_path(artifact["hash"])
+            if link:
+                try:
+                    os.link(blob, target)
+                except OSError:
+                    shutil.copyfile(blob, target)  # another filesystem
+            else:
+                shutil.copyfile(blob, target)
+            count += 1
+        return count
+
+    # -- maintenance ---------------------------------------------------------
+
+    def gc(self, keep: int = DEFAULT_KEEP) -> tuple[int, int]:
+        """Keep the newest ``keep`` runs; returns (manifests removed, bytes freed)."""
+        manifests = self.runs()
+        for manifest in manifests[keep:]:
+            (self.manifests / f"{manifest['run_id']}.json").unlink()
+            self._open.pop(manifest["run_id"], None)
+        live = {a["hash"] for m in manifests[:keep] for a in m["artifacts"]}
+        live.update(a["hash"] for m in self._open.values() for a in m["artifacts"])
+        freed = 0
+        if self.objects.is_dir():
+            for blob in self.objects.glob("*/*"):
+                if blob.parent.name + blob.name not in live:
+                    freed += blob.stat().st_size
+                    blob.unlink()
+        return len(manifests[keep:]), freed
+
+    def stats(self) -> Stats:
+        manifests = self.runs()
+        artifacts = [a for m in manifests for a in m["artifacts"]]
+        blobs = list(self.objects.glob("*/*")) if self.objects.is_dir() else []
+        return Stats(
+            runs=len(manifests),
+            artifacts=len(artifacts),
+            blobs=len(blobs),
+            logical_bytes=sum(a["size"] for a in artifacts),
+            stored_bytes=sum(blob.stat().st_size for blob in blobs),
+        )
+
+
+def format_bytes(value: int) -> str:
+    for unit in ("B", "kB", "MB"):
+        if value < 1000:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1000
+    return f"{value:.1f} GB"
+
+
+def render_stats(stats: Stats) -> str:
+    ratio = stats.logical_bytes / stats.stored_bytes if stats.stored_bytes else 1.0
+    return "\n".join([
+        f"runs:          {stats.runs}",
+        f"artifacts:     {stats.artifacts} ({stats.blobs} distinct blobs)",
+        f"logical size:  {format_bytes(stats.logical_bytes)}",
+        f"stored size:   {format_bytes(stats.stored_bytes)}",
+        f"deduplicated:  {format_bytes(stats.deduplicated_bytes)} ({ratio:.1f}x)",
+    ]) + "\n"
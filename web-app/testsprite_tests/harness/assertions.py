@@ -0,0 +1,99 @@
+"""Batched DOM assertions: many expectations, one ``page.evaluate`` round trip.
+
+Checking 36 labels with ``locator(...).is_visible()`` costs 36 driver round
+trips, each against a slightly different DOM. ``Expectations`` collects
+visibility, text and count expectations and evaluates them all in a single
+pass over the document (``js/batch_assert.js``), then reports every failing
+expectation, not just the first::
+
+    async with expect_all(page) as expect:
+        for item in ["Dashboard", "Clients", "Calendar"]:
+            expect.visible(item)
+        expect.count("table tbody tr", 4, at_least=True)
+
+Text matching mirrors Playwright's text selectors: ``exact=True`` is
+``text="..."``, ``exact=False`` is ``text=...`` (case-insensitive substring).
+"""
+
+from __future__ import annotations
+
+import contextlib
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from .config import JS_DIR
+
+_SCRIPT = (JS_DIR / "batch_assert.js").read_text(encoding="utf-8")
+
+
+@dataclass
+class Outcome:
+    description: str
+    passed: bool
+    actual: str = ""
+
+
+class ExpectationError(AssertionError):
+    def __init__(self, failures: list[Outcome], total: int):
+        self.failures = failures
+        lines = [f"{len(failures)} of {total} expectations failed:"]
+        lines += [f"  - {outcome.description}: {outcome.actual}" for outcome in failures]
+        super().__init__("\n".join(lines))
+
+
+@dataclass
+class Expectations:
+    """Expectations against one page or frame, evaluated together by ``check``."""
+
+    target: Any
+    checks: list[dict] = field(default_factory=list)
+    descriptions: list[str] = field(default_factory=list)
+
+    def _add(self, description: str, **check: Any) -> Expectations:
+        self.checks.append(check)
+        self.descriptions.append(description)
+        return self
+
+    def visible(self, text: str, *, exact: bool = True, selector: str | None = None) -> Expectations:
+        """An element (within ``selector`` matches, if given) with this text is visible."""
+        where = f" in {selector}" if selector else ""
+        return self._add(f"visible {text!r}{where}", kind="visible", text=text, exact=exact, selector=selector)
+
+    def hidden(self, text: str, *, exact: bool = True, selector: str | None = None) -> Expectations:
+        where = f" in {selector}" if selector else ""
+        return self._add(f"hidden {text!r}{where}", kind="hidden", text=text, exact=exact, selector=selector)
+
+    def text(self, selector: str, expected: str, *, exact: bool = False) -> Expectations:
+        """The first element matching ``selector`` has (or contains) ``expected``."""
+        return self._add(f"text of {selector} is {expected!r}", kind="text", selector=selector,
+                         expected=expected, exact=exact)
+
+    def count(self, selector: str, count: int, *, at_least: bool = False) -> Expectations:
+        bound = "at least " if at_least else ""
+        return self._add(f"{bound}{count} x {selector}", kind="count", selector=selector,
+                         count=count, atLeast=at_least)
+
+    async def evaluate(self) -> list[Outcome]:
+        if not self.checks:
+            return []
+        results = await self.target.evaluate(_SCRIPT, self.checks)
+        return [
+            Outcome(description, result["passed"], result["actual"])
+            for description, result in zip(self.descriptions, results)
+        ]
+
+    async def check(self) -> list[Outcome]:
+        """Evaluate and raise ``ExpectationError`` listing every failure."""
+        outcomes = await self.evaluate()
+        failures = [outcome for outcome in outcomes if not outcome.passed]
+        if failures:
+            raise ExpectationError(failures, len(outcomes))
+        return outcomes
+
+
+@contextlib.asynccontextmanager
+async def expect_all(target: Any) -> AsyncIterator[Expectations]:
+    """Collect expectations in the block; checked together when it exits cleanly."""
+    expectations = Expectations(target)
+    yield expectations
+    await expectations.check()
@@ -0,0 +1 @@
+"""Standalone benchmark scenarios driven by the harness CLI."""
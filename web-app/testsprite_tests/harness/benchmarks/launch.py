@@ -0,0 +1,232 @@
+"""Chromium launch-flag benchmark for the flags every TC script hardcodes.
+
+The scripts launch Chromium with ``--single-process``, ``--ipc=host`` and
+``--disable-dev-shm-usage`` (``LAUNCH_ARGS``). This benchmark runs a fixed
+reference flow (``DEFAULT_FLOW``, page loads of public routes) under a
+matrix of launch profiles:
+
+- headless mode: the headless shell Playwright launches by default, or the
+  new headless mode of the full Chromium build (``channel="chromium"``);
+- process model: ``--single-process`` or Chromium's default multi-process;
+- shared memory: ``--disable-dev-shm-usage`` or ``/dev/shm``;
+- GPU: default, or ``--disable-gpu``.
+
+Every profile gets a fresh browser per iteration. Per profile it reports:
+
+- startup time: ``launch()`` until the first page exists;
+- per-navigation latency: ``goto(..., wait_until="load")``;
+- peak RSS of the browser's processes, read from ``/proc`` (Linux only);
+- crash rate: iterations where the browser disconnected or a page crashed.
+
+Other failures, such as timeouts, are counted separately as errors. The
+report names the profile with the fastest flow among those that never
+crashed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from .. import resources
+from ..config import BASE_URL, LAUNCH_ARGS, NAVIGATION_TIMEOUT_MS, OUTPUT_DIR
+from ..profiles import LaunchProfile
+
+DEFAULT_FLOW = ("/", "/login", "/register", "/dashboard")
+DEFAULT_ITERATIONS = 5
+BENCH_DIR = OUTPUT_DIR / "bench"
+# The flags in LAUNCH_ARGS, as named by launch_matrix().
+CURRENT = "shell/single/no-shm/gpu"
+
+_HEADLESS = {
+    "shell": {},
+    "new": {"channel": "chromium"},
+}
+_PROCESS = {"single": ["--single-process"], "multi": []}
+_SHM = {"no-shm": ["--disable-dev-shm-usage"], "shm": []}
+_GPU = {"gpu": [], "no-gpu": ["--disable-gpu"]}
+_MATRIX_FLAGS = {"--single-process", "--disable-dev-shm-usage", "--disable-gpu"}
+
+
+def launch_matrix() -> list[LaunchProfile]:
+    """Every combination of headless mode, process model, shm and GPU flags.
+
+    Names read ``<headless>/<process>/<shm>/<gpu>``; ``CURRENT`` is what the
+    scripts use today.
+    """
+    base = [arg for arg in LAUNCH_ARGS if arg not in _MATRIX_FLAGS]
+    profiles = []
+    for (headless, options), (process, process_args), (shm, shm_args), (gpu, gpu_args) in itertools.product(
+        _HEADLESS.items(), _PROCESS.items(), _SHM.items(), _GPU.items()
+    ):
+        profiles.append(LaunchProfile(
+            f"{headless}/{process}/{shm}/{gpu}",
+            args=base + process_args + shm_args + gpu_args,
+            launch_options=dict(options),
+        ))
+    return profiles
+
+
+@dataclass
+class ProfileSample:
+    profile: str
+    iterations: int = 0
+    crashes: int = 0
+    errors: int = 0
+    startup_ms: list[float] = field(default_factory=list)
+    navigation_ms: dict[str, list[float]] = field(default_factory=dict)
+    peak_rss_mb: list[float] = field(default_factory=list)
+    last_error: str = ""
+
+    @property
+    def crash_rate(self) -> float:
+        return self.crashes / self.iterations if self.iterations else 0.0
+
+    def median_startup(self) -> float | None:
+        return _median(self.startup_ms)
+
+    def median_navigation(self, path: str) -> float | None:
+        return _median(self.navigation_ms.get(path, []))
+
+    def flow_ms(self) -> float | None:
+        """Median startup plus the median of every navigation; ``None`` if a step never completed."""
+        parts = [self.median_startup(), *(self.median_navigation(path) for path in self.navigation_ms)]
+        return None if not self.navigation_ms or None in parts else sum(parts)
+
+
+def _median(values: Sequence[float]) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _browser_rss_mb() -> float | None:
+    """RSS of the processes the Playwright driver started, i.e. the one running browser."""
+    samples = {sample.pid: sample for sample in map(resources.read_proc, resources.pids()) if sample}
+    if not samples:
+        return None
+    browser = resources.classify(samples, os.getpid(), set())["browser"]
+    return round(sum(samples[pid].rss for pid in browser) / 2**20, 1)
+
+
+async def _iteration(pw: Any, profile: LaunchProfile, flow: Sequence[str], base_url: str,
+                     storage_state: str | None, sample: ProfileSample) -> None:
+    from playwright import async_api
+
+    sample.iterations += 1
+    crashed = asyncio.Event()
+    browser = None
+    error = ""
+    try:
+        start = time.perf_counter()
+        browser = await pw.chromium.launch(headless=True, args=profile.args, **profile.launch_options)
+        browser.on("disconnected", lambda _: crashed.set())
+        context = await browser.new_context(storage_state=storage_state)
+        page = await context.new_page()
+        page.on("crash", lambda _: crashed.set())
+        sample.startup_ms.append(round((time.perf_counter() - start) * 1000, 1))
+
+        peak = 0.0
+        for path in flow:
+            start = time.perf_counter()
+            await page.goto(base_url.rstrip("/") + path, wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+            sample.navigation_ms.setdefault(path, []).append(round((time.perf_counter() - start) * 1000, 1))
+            peak = max(peak, _browser_rss_mb() or 0.0)
+        if peak:
+            sample.peak_rss_mb.append(peak)
+        await context.close()
+    except async_api.Error as exc:
+        error = sample.last_error = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+    # The crash events can arrive after the failing call has already raised.
+    if crashed.is_set() or (error and "crash" in error.lower()) or (browser and not browser.is_connected()):
+        sample.crashes += 1
+    elif error:
+        sample.errors += 1
+    if browser is not None and browser.is_connected():
+        try:
+            await browser.close()
+        except async_api.Error:
+            pass
+
+
+async def run_benchmark(
+    profiles: Sequence[LaunchProfile] | None = None,
+    iterations: int = DEFAULT_ITERATIONS,
+    flow: Sequence[str] = DEFAULT_FLOW,
+    base_url: str = BASE_URL,
+    storage_state: str | None = None,
+) -> list[ProfileSample]:
+    """Run ``flow`` ``iterations`` times per profile, interleaving profiles so drift hits all alike."""
+    from playwright import async_api
+
+    profiles = list(profiles or launch_matrix())
+    samples = {
+        profile.name: ProfileSample(profile.name, navigation_ms={path: [] for path in flow})
+        for profile in profiles
+    }
+    async with async_api.async_playwright() as pw:
+        for _ in range(iterations):
+            for profile in profiles:
+                await _iteration(pw, profile, flow, base_url, storage_state, samples[profile.name])
+    return list(samples.values())
+
+
+def recommend(samples: Sequence[ProfileSample]) -> ProfileSample | None:
+    """The fastest profile that completed the flow without a crash or error."""
+    stable = [s for s in samples if not s.crashes and not s.errors and s.flow_ms() is not None]
+    return min(stable, key=lambda s: s.flow_ms(), default=None)
+
+
+def _fmt(value: float | None, unit: str = "") -> str:
+    return "-" if value is None else f"{value:.0f}{unit}"
+
+
+def render_markdown(samples: Sequence[ProfileSample], flow: Sequence[str] = DEFAULT_FLOW) -> str:
+    header = ["profile", "startup", *flow, "flow", "peak RSS MB", "crash rate", "errors"]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for s in samples:
+        rss = _median(s.peak_rss_mb)
+        lines.append("| " + " | ".join([
+            s.profile,
+            _fmt(s.median_startup(), " ms"),
+            *(_fmt(s.median_navigation(path), " ms") for path in flow),
+            _fmt(s.flow_ms(), " ms"),
+            "-" if rss is None else f"{rss:.0f}",
+            f"{s.crashes}/{s.iterations}",
+            str(s.errors),
+        ]) + " |")
+    failing = [s for s in samples if s.last_error]
+    if failing:
+        lines.append("\nLast errors:")
+        lines += [f"- {s.profile}: {s.last_error}" for s in failing]
+    best = recommend(samples)
+    current = next((s for s in samples if s.profile == CURRENT), None)
+    lines.append(f"\nFastest stable profile: {best.profile if best else 'none'}")
+    if best and current and current.flow_ms() is not None and best is not current:
+        lines.append(f"Current flags ({CURRENT}): {current.flow_ms() - best.flow_ms():+.0f} ms per flow")
+    return "\n".join(lines) + "\n"
+
+
+def write_results(samples: Sequence[ProfileSample], flow: Sequence[str] = DEFAULT_FLOW,
+                  output_dir: Path = BENCH_DIR) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    best = recommend(samples)
+    payload = {
+        "flow": list(flow),
+        "recommended": best.profile if best else None,
+        "profiles": [
+            dict(asdict(s), crash_rate=s.crash_rate, flow_ms=s.flow_ms()) for s in samples
+        ],
+    }
+    (output_dir / "launch.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path = output_dir / "launch.md"
+    path.write_text(render_markdown(samples, flow), encoding="utf-8")
+    return path
@@ -0,0 +1,177 @@
+"""Real-time update render-storm benchmark for the dashboard.
+
+Streams dashboard updates from ``ws_server.StreamServer``, a local WebSocket
+server standing in for the one ``websocketService`` connects to, at
+increasing message rates. The server runs outside the browser, so generating
+and serialising messages costs the page nothing; the page only receives them.
+At each rate it records messages received by the app's open sockets and their
+delivery lag (``js/ws_probe.js``), frame rate, long tasks, React commits (via
+the profiler init script) and JS heap, then reports the first rate at which
+the UI stops keeping up.
+
+``websocketService`` only connects in dev when ``VITE_WS_URL`` is set, so
+start the dev server with ``VITE_WS_URL=ws://localhost:8080/ws``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Sequence
+
+from .. import profiler
+from ..ws_server import DEFAULT_URL as DEFAULT_WS_URL, StreamServer
+from ..config import BASE_URL, JS_DIR, LAUNCH_ARGS, NAVIGATION_TIMEOUT_MS, OUTPUT_DIR
+
+DEFAULT_RATES = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DEFAULT_URL = BASE_URL.rstrip("/") + "/dashboard"
+BENCH_DIR = OUTPUT_DIR / "bench"
+
+# A rate is sustained when all of these hold over the measurement window.
+MIN_FPS = 30.0
+MIN_DELIVERY_RATIO = 0.95
+MAX_LAG_P95_MS = 500.0
+
+_DRAIN_ALL = """() => ({
+    source: window.__harnessWsProbe.drain(),
+    frames: window.__harnessFrameMonitor.drain(),
+    react: window.__harnessReactProfiler ? window.__harnessReactProfiler.drain() : null,
+})"""
+
+
+@dataclass
+class RateSample:
+    rate: int
+    sockets: int
+    delivered_per_s: float
+    lag_p50_ms: float
+    lag_p95_ms: float
+    fps: float
+    long_tasks: int
+    long_task_ms: float
+    commits: int
+    commit_ms: float
+    heap_mb: float
+
+    @property
+    def keeps_up(self) -> bool:
+        return (
+            self.fps >= MIN_FPS
+            and self.delivered_per_s >= self.rate * MIN_DELIVERY_RATIO
+            and self.lag_p95_ms <= MAX_LAG_P95_MS
+        )
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1)
+    return float(sorted_values[max(index, 0)])
+
+
+async def _measure(page, cdp, server: StreamServer, rate: int, duration_s: float) -> RateSample:
+    await page.evaluate(_DRAIN_ALL)
+    server.set_rate(rate)
+    await asyncio.sleep(duration_s)
+    data = await page.evaluate(_DRAIN_ALL)
+    heap = await cdp.send("Runtime.getHeapUsage")
+
+    source, frames, react = data["source"], data["frames"], data["react"] or {}
+    elapsed_s = max(source["elapsed_ms"], 1) / 1000
+    return RateSample(
+        rate=rate,
+        sockets=source["sockets"],
+        delivered_per_s=round(source["received"] / elapsed_s, 1),
+        lag_p50_ms=round(_percentile(source["lags"], 0.50), 1),
+        lag_p95_ms=round(_percentile(source["lags"], 0.95), 1),
+        fps=round(frames["frames"] * 1000 / max(frames["elapsed_ms"], 1), 1),
+        long_tasks=frames["long_tasks"],
+        long_task_ms=round(frames["long_task_ms"], 1),
+        commits=react.get("commits", 0),
+        commit_ms=round(sum(react.get("durations", [])), 1),
+        heap_mb=round(heap["usedSize"] / 2**20, 1),
+    )
+
+
+async def run_benchmark(
+    rates: Sequence[int] = DEFAULT_RATES,
+    duration_s: float = 5.0,
+    url: str = DEFAULT_URL,
+    storage_state: str | None = None,
+    settle_s: float = 3.0,
+    stop_after_saturation: int = 1,
+    ws_url: str = DEFAULT_WS_URL,
+) -> list[RateSample]:
+    """Measure each rate in order; stop ``stop_after_saturation`` rates past the knee."""
+    from playwright import async_api
+
+    samples: list[RateSample] = []
+    server = StreamServer(ws_url)
+    server.start()
+    try:
+        async with async_api.async_playwright() as pw:
+            browser = await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            try:
+                context = await browser.new_context(storage_state=storage_state)
+                await context.add_init_script(script=f"window.__harnessWsProbeMatch = {json.dumps(ws_url)};")
+                await context.add_init_script(path=str(JS_DIR / "ws_probe.js"))
+                await context.add_init_script(path=str(JS_DIR / "frame_monitor.js"))
+                await profiler.install(context)
+
+                page = await context.new_page()
+                await page.goto(url, wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+                await asyncio.sleep(settle_s)
+                cdp = await context.new_cdp_session(page)
+
+                saturated = 0
+                for rate in rates:
+                    sample = await _measure(page, cdp, server, rate, duration_s)
+                    samples.append(sample)
+                    if not sample.keeps_up:
+                        saturated += 1
+                        if saturated > stop_after_saturation:
+                            break
+                server.set_rate(0)
+            finally:
+                await browser.close()
+    finally:
+        server.stop()
+    return samples
+
+
+def saturation_rate(samples: Sequence[RateSample]) -> int | None:
+    """First measured rate at which the UI no longer keeps up."""
+    return next((s.rate for s in samples if not s.keeps_up), None)
+
+
+def render_markdown(samples: Sequence[RateSample]) -> str:
+    lines = [
+        "| msg/s | delivered/s | lag p50 | lag p95 | fps | long tasks | commits | commit ms | heap MB | keeps up |",
+        "|-------|-------------|---------|---------|-----|------------|---------|-----------|---------|----------|",
+    ]
+    for s in samples:
+        lines.append(
+            f"| {s.rate} | {s.delivered_per_s} | {s.lag_p50_ms} | {s.lag_p95_ms} | {s.fps} "
+            f"| {s.long_tasks} ({s.long_task_ms} ms) | {s.commits} | {s.commit_ms} | {s.heap_mb} "
+            f"| {'yes' if s.keeps_up else 'no'} |"
+        )
+    knee = saturation_rate(samples)
+    if samples and not any(s.sockets for s in samples):
+        lines.append("\nNo socket connected to the server: is the dev server running with VITE_WS_URL set?")
+    lines.append(f"\nSaturation rate: {f'{knee} msg/s' if knee else 'not reached'}")
+    return "\n".join(lines) + "\n"
+
+
+def write_results(samples: Sequence[RateSample], output_dir: Path = BENCH_DIR) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "saturation_rate": saturation_rate(samples),
+        "samples": [dict(asdict(s), keeps_up=s.keeps_up) for s in samples],
+    }
+    (output_dir / "realtime.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path = output_dir / "realtime.md"
+    path.write_text(render_markdown(samples), encoding="utf-8")
+    return path
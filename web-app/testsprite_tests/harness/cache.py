@@ -0,0 +1,122 @@
+"""Result cache: skip scripts whose inputs have not changed since they passed.
+
+A script's cache key hashes everything its outcome depends on that the
+harness can see:
+
+- its step program: the syntax tree without the ``asyncio.run`` entrypoint,
+  so comment and formatting edits keep the key;
+- the app sources and lockfile (``hashing.app_build_hash``; not ``dist/``,
+  since the suite runs against the dev server);
+- the fixture data under ``fixtures/`` and the harness sources (``*.py``,
+  ``*.js``; not bytecode, which imports write, nor the harness's unit tests);
+- the run options that change behaviour (launch profile, fake clock) and the
+  app endpoint.
+
+``ResultCache`` records the key of every passing result in the results store
+and evicts it when a run with the same key fails. Before a run, ``partition``
+splits the selection into scripts to execute and scripts with a cached pass,
+which are recorded in the run as ``CACHED`` results pointing at the run they
+passed in (``metrics["cached_from"]``), without launching a browser.
+
+Backend state (Supabase data, third-party APIs) is outside the key; use
+``run`` without ``--cache`` when that is what changed.
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from .config import BASE_URL, TESTS_DIR
+from .hashing import app_build_hash, content_hash, tree_hash
+from .loader import TestScript, parse_program
+from .runner import CACHED, PASSED, Plugin, Run, TestResult
+from .store import ResultStore
+
+FIXTURES_DIR = "fixtures"
+HARNESS_DIR = "harness"
+HARNESS_SOURCES = (".py", ".js")
+# Written at run time or irrelevant to a script's outcome.
+_SKIP_DIRS = {"__pycache__", "tests"}
+
+
+def program_hash(script: TestScript) -> str:
+    return content_hash(ast.dump(parse_program(script)))
+
+
+def _inputs(root: Path, suffixes: tuple[str, ...] | None = None) -> list[Path]:
+    if not root.is_dir():
+        return []
+    return [
+        path for path in root.rglob("*")
+        if path.is_file() and not _SKIP_DIRS.intersection(path.relative_to(root).parts)
+        and path.suffix != ".pyc" and (suffixes is None or path.suffix in suffixes)
+    ]
+
+
+def fixtures_hash(tests_dir: Path = TESTS_DIR) -> str:
+    """Hash of the fixture files and harness sources."""
+    files = _inputs(tests_dir / FIXTURES_DIR) + _inputs(tests_dir / HARNESS_DIR, HARNESS_SOURCES)
+    return tree_hash(files, tests_dir)
+
+
+@dataclass
+class CacheKeys:
+    """Inputs shared by every script of a run."""
+
+    build_hash: str
+    fixtures_hash: str
+    options: str = ""
+
+    @classmethod
+    def current(cls, options: str = "", build_hash: str | None = None) -> CacheKeys:
+        return cls(build_hash or app_build_hash(), fixtures_hash(), f"{BASE_URL};{options}")
+
+    def key(self, script: TestScript) -> str:
+        return content_hash("\0".join([program_hash(script), self.build_hash, self.fixtures_hash, self.options]))
+
+
+def partition(
+    scripts: Sequence[TestScript], store: ResultStore, keys: dict[str, str]
+) -> tuple[list[TestScript], list[TestResult]]:
+    """Scripts to run, and ``CACHED`` results for those with a cached pass."""
+    hits = store.cached_results([keys[script.name] for script in scripts])
+    to_run, cached = [], []
+    for script in scripts:
+        row = hits.get(keys[script.name])
+        if row is None:
+            to_run.append(script)
+            continue
+        cached.append(TestResult(
+            test_id=script.test_id,
+            name=script.name,
+            title=script.title,
+            status=CACHED,
+            duration_ms=0.0,
+            started_at=row["started_at"],
+            metrics={"cached_from": row["run_id"], "cached_duration_ms": row["duration_ms"]},
+        ))
+    return to_run, cached
+
+
+class ResultCache(Plugin):
+    """Runner plugin recording the cache key of passing results; evicts on failure."""
+
+    def __init__(self, store: ResultStore, keys: dict[str, str]):
+        self.store = store
+        self.keys = keys
+        self.run_id = ""
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        key = self.keys.get(test.name)
+        if key is None:
+            return
+        if result.status == PASSED:
+            self.store.cache_result(key, test.name, self.run_id)
+        else:
+            self.store.evict(key)
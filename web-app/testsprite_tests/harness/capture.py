@@ -0,0 +1,208 @@
+"""Failure-only capture: screenshots and DOM snapshots kept in memory per step.
+
+``FailureCapture`` keeps a bounded ring of the last ``frames`` step captures
+(a low-resolution JPEG and the page HTML, taken after every step) in memory
+and writes them to disk only when the test fails. Passing tests pay for the
+captures but never for encoding, writing or uploading a video.
+
+With ``trace=True`` it also records a Playwright trace per context. The
+trace is kept in the driver until the context closes and is only saved when
+the script is failing at that point; scripts close their context in a
+``finally`` block, so the exception in flight tells the two cases apart.
+
+Output, for failed tests only: ``tmp/harness/failures/<run>/<test>/``
+with ``NN-<action>.jpg``, ``NN-<action>.html``, ``index.json`` and
+``trace-N.zip``; or, given an ``ArtifactStore``, the same names in the run's
+artifact manifest.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import re
+import shutil
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .artifacts import ArtifactStore
+from .config import OUTPUT_DIR
+from .loader import TestScript
+from .runner import FAILED, Plugin, Run, Step, TestResult
+
+logger = logging.getLogger("harness.capture")
+
+CAPTURE_DIR = OUTPUT_DIR / "failures"
+DEFAULT_FRAMES = 20
+SCALE = 0.5
+JPEG_QUALITY = 40
+
+
+@dataclass
+class Frame:
+    step: str
+    url: str
+    taken_at: float
+    error: str = ""
+    # Base64 JPEG as returned by the browser; decoded only when written out.
+    image: str | None = field(default=None, repr=False)
+    dom: str | None = field(default=None, repr=False)
+
+
+async def screenshot(page: Any, cdp: Any | None) -> str | None:
+    """Base64 JPEG of the viewport, downscaled by ``SCALE`` where the browser allows."""
+    try:
+        if cdp is not None:
+            size = page.viewport_size or {"width": 1280, "height": 720}
+            shot = await cdp.send("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": JPEG_QUALITY,
+                "clip": {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": SCALE},
+            })
+            return shot["data"]
+        data = await page.screenshot(type="jpeg", quality=JPEG_QUALITY, scale="css", timeout=2000)
+        return base64.b64encode(data).decode("ascii")
+    except Exception:
+        logger.debug("screenshot failed on %s", getattr(page, "url", page), exc_info=True)
+        return None
+
+
+async def dom_snapshot(page: Any) -> str | None:
+    try:
+        return await page.content()
+    except Exception:
+        # Navigating: the document is being replaced.
+        logger.debug("DOM snapshot failed on %s", getattr(page, "url", page), exc_info=True)
+        return None
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")[:40]
+
+
+def frame_files(frames: list[Frame]) -> tuple[list[dict], dict[str, bytes]]:
+    """Index entries and ``name -> content`` for a frame sequence."""
+    index, files = [], {}
+    for number, frame in enumerate(frames, 1):
+        action = frame.step.split(":")[1] if ":" in frame.step else frame.step
+        stem = f"{number:02d}-{_slug(action)}"
+        entry = {"step": frame.step, "url": frame.url, "taken_at": frame.taken_at, "error": frame.error}
+        if frame.image:
+            files[f"{stem}.jpg"] = base64.b64decode(frame.image)
+            entry["image"] = f"{stem}.jpg"
+        if frame.dom is not None:
+            files[f"{stem}.html"] = frame.dom.encode("utf-8")
+            entry["dom"] = f"{stem}.html"
+        index.append(entry)
+    return index, files
+
+
+class FailureCapture(Plugin):
+    """Runner plugin keeping the last ``frames`` step captures; saved for failures only."""
+
+    def __init__(
+        self,
+        frames: int = DEFAULT_FRAMES,
+        trace: bool = False,
+        output_dir: Path = CAPTURE_DIR,
+        artifacts: ArtifactStore | None = None,
+    ):
+        self.frames: deque[Frame] = deque(maxlen=frames)
+        self.trace = trace
+        self.output_dir = output_dir
+        self.artifacts = artifacts
+        self.run_id = ""
+        self._cdp: dict[int, Any] = {}
+        self._traces: list[Path] = []
+
+    def _test_dir(self, test: TestScript) -> Path:
+        return self.output_dir / self.run_id / test.name
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self.frames.clear()
+        self._cdp.clear()
+        self._traces = []
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        if self.trace:
+            await context.tracing.start(screenshots=True, snapshots=True)
+
+    async def on_page(self, test: TestScript, page: Any) -> None:
+        browser = page.context.browser
+        if browser and browser.browser_type.name == "chromium":
+            try:
+                self._cdp[id(page)] = await page.context.new_cdp_session(page)
+            except Exception:
+                logger.debug("no CDP session for %s", page, exc_info=True)
+
+    async def _capture(self, page: Any, step: str, error: str = "") -> None:
+        self.frames.append(Frame(
+            step=step,
+            url=page.url,
+            taken_at=time.time(),
+            error=error,
+            image=await screenshot(page, self._cdp.get(id(page))),
+            dom=await dom_snapshot(page),
+        ))
+
+    async def on_step_end(self, test: TestScript, step: Step) -> None:
+        if step.page is not None:
+            await self._capture(step.page, step.key, step.error)
+
+    async def on_context_close(self, test: TestScript, context: Any) -> None:
+        failure = sys.exc_info()[1]
+        if failure is not None:
+            # The state the assertion saw, which may be after the last step.
+            for page in context.pages:
+                await self._capture(page, "failure", f"{type(failure).__name__}: {failure}")
+        if not self.trace:
+            return
+        failing = failure is not None
+        path = self._test_dir(test) / f"trace-{len(self._traces) + 1}.zip" if failing else None
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            await context.tracing.stop(path=str(path) if path else None)
+        except Exception:
+            logger.debug("stopping the trace failed", exc_info=True)
+            return
+        if path:
+            self._traces.append(path)
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        test_dir = self._test_dir(test)
+        if result.status != FAILED:
+            # A trace saved for an exception the script later swallowed.
+            if self._traces:
+                shutil.rmtree(test_dir, ignore_errors=True)
+            self.frames.clear()
+            return
+        index, files = frame_files(list(self.frames))
+        files["index.json"] = json.dumps({
+            "test": test.name,
+            "frames": index,
+            "traces": [path.name for path in self._traces],
+        }, indent=2).encode("utf-8")
+        result.metrics["capture"] = {"frames": len(index), "traces": [path.name for path in self._traces]}
+
+        if self.artifacts is not None:
+            for name, data in files.items():
+                self.artifacts.add(self.run_id, test.name, name, data)
+            for path in self._traces:
+                self.artifacts.add(self.run_id, test.name, path.name, path)
+            shutil.rmtree(test_dir, ignore_errors=True)
+            result.metrics["capture"]["manifest"] = str(self.artifacts.flush(self.run_id))
+        else:
+            test_dir.mkdir(parents=True, exist_ok=True)
+            for name, data in files.items():
+                (test_dir / name).write_bytes(data)
+            result.metrics["capture"]["dir"] = str(test_dir)
+        self.frames.clear()
@@ -0,0 +1,610 @@
+"""Command line entry point: ``python -m harness <command>``.
+
+Run from ``web-app/testsprite_tests`` with the dev server listening on the
+endpoint configured in ``tmp/config.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from .config import OUTPUT_DIR
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    from .loader import discover
+    from .runner import CACHED, FAILED, Run, Runner
+    from .watchdog import STEP_BUDGET_S, TEST_BUDGET_S, Watchdog
+
+    for flag in ("changed_since", "cache", "adaptive_timeouts", "report"):
+        if getattr(args, flag) and args.no_store:
+            print(f"--{flag.replace('_', '-')} needs the results store", file=sys.stderr)
+            return 2
+
+    if args.project:
+        from . import matrix
+
+        try:
+            projects = matrix.get_projects(args.project)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        # Lanes run concurrently; these plugins write per-script files or sample the whole machine.
+        unsupported = [
+            flag for flag in ("coverage", "react_profile", "fake_clock", "console", "capture_failures",
+                              "trace", "artifacts", "resources", "adaptive_timeouts", "cache")
+            if getattr(args, flag)
+        ] + (["profile"] if args.profile != "default" else [])
+        if unsupported:
+            print(f"--project cannot be combined with --{unsupported[0].replace('_', '-')}", file=sys.stderr)
+            return 2
+
+    # Plugins that record results run after the ones that add metrics in on_test_end.
+    plugins, recorders = [], []
+    if not args.no_store:
+        from .hashing import app_build_hash
+        from .impact import ImpactRecorder
+        from .store import ResultStore, StorePlugin
+
+        store = ResultStore(args.db)
+        build_hash = app_build_hash()
+
+        def make_recorders() -> list:
+            made = [StorePlugin(store, build_hash), ImpactRecorder(store)]
+            if args.report:
+                from .report import ReportPlugin
+
+                made.append(ReportPlugin(store))
+            return made
+
+        recorders = make_recorders()
+        if args.adaptive_timeouts:
+            from .timeouts import SAFETY_FACTOR, AdaptiveTimeouts
+
+            plugins.append(AdaptiveTimeouts(store, args.timeout_factor or SAFETY_FACTOR))
+    if args.profile != "default":
+        from .profiles import ProfilePlugin, get_profile
+
+        plugins.append(ProfilePlugin(get_profile(args.profile)))
+    if args.coverage:
+        from .coverage import CoverageCollector
+
+        plugins.append(CoverageCollector())
+    if args.react_profile:
+        from .profiler import ReactProfiler
+
+        plugins.append(ReactProfiler())
+    if args.fake_clock:
+        from .clock import ClockPlugin
+
+        plugins.append(ClockPlugin())
+    if args.console:
+        from .console import ConsoleCapture
+
+        plugins.append(ConsoleCapture(min_level=args.console))
+    if args.a11y:
+        from .a11y import A11ySnapshots
+
+        plugins.append(A11ySnapshots())
+    if args.capture_failures or args.trace or args.artifacts:
+        from .capture import FailureCapture
+
+        artifacts = None
+        if args.artifacts:
+            from .artifacts import ArtifactStore
+
+            artifacts = ArtifactStore()
+        plugins.append(FailureCapture(trace=args.trace, artifacts=artifacts))
+    if args.resources:
+        from .resources import ResourceMonitor
+
+        plugins.append(ResourceMonitor())
+
+    scripts = discover(args.tests)
+    if args.changed_since:
+        from . import impact
+
+        selection = impact.select(scripts, impact.changed_files(args.changed_since), store.test_modules())
+        print(impact.render_selection(selection, len(scripts)), end="")
+        scripts = selection.scripts
+    if not args.no_store:
+        from . import flaky
+
+        lane = args.lane or ("all" if args.tests else "main")
+        quarantined = set(store.quarantined())
+        selected = flaky.select_lane(scripts, quarantined, lane)
+        if len(selected) < len(scripts):
+            print(f"{len(scripts) - len(selected)} scripts outside the {lane} lane skipped")
+        scripts = selected
+    if args.shard:
+        from . import shards
+
+        durations = {} if args.no_store else shards.expected_durations(store)
+        total = len(scripts)
+        scripts, expected = shards.select(scripts, durations, args.shard)
+        print(f"shard {args.shard}: {len(scripts)} of {total} scripts, ~{expected / 1000:.0f}s expected")
+    cached = []
+    if args.cache:
+        from .cache import CacheKeys, ResultCache, partition
+
+        keys = CacheKeys.current(f"profile={args.profile};fake_clock={args.fake_clock}", build_hash)
+        cache_keys = {script.name: keys.key(script) for script in scripts}
+        scripts, cached = partition(scripts, store, cache_keys)
+        recorders.append(ResultCache(store, cache_keys))
+    watchdog = Watchdog(
+        TEST_BUDGET_S if args.test_budget is None else args.test_budget,
+        STEP_BUDGET_S if args.step_budget is None else args.step_budget,
+    )
+    if args.project:
+        result = asyncio.run(matrix.run_matrix(
+            scripts,
+            projects,
+            lambda project: (
+                ([A11ySnapshots()] if args.a11y else []) + (make_recorders() if not args.no_store else [])
+            ),
+            watchdog,
+        ))
+        print(matrix.render_table(result), end="")
+        run = result.run
+    else:
+        # Cached results go into the run up front so the recorders store and report them.
+        run = Run(results=list(cached))
+        run = asyncio.run(Runner(plugins + recorders, watchdog).run(scripts, run))
+
+    failed = [r for r in run.results if r.status == FAILED]
+    cached = [r for r in run.results if r.status == CACHED]
+    summary = f"{run.run_id}: {len(run.results) - len(failed) - len(cached)} passed, {len(failed)} failed"
+    print(summary + (f", {len(cached)} cached" if cached else ""))
+    for result in cached:
+        print(f"  CACHED {result.name} (passed in {result.metrics['cached_from']})")
+    for result in failed:
+        print(f"  FAILED {result.name}")
+    if not args.no_store:
+        added, released = flaky.update_quarantine(store, flaky.analyze(store))
+        for name in added:
+            print(f"  quarantined {name}")
+        for name in released:
+            print(f"  released {name}")
+    return 1 if failed else 0
+
+
+def _cmd_coverage_report(args: argparse.Namespace) -> int:
+    from .coverage import build_report, write_report
+
+    path = write_report(build_report())
+    print(path)
+    return 0
+
+
+def _cmd_bench_realtime(args: argparse.Namespace) -> int:
+    from .benchmarks import realtime
+
+    options = {"rates": args.rates, "url": args.url, "ws_url": args.ws_url}
+    samples = asyncio.run(realtime.run_benchmark(
+        duration_s=args.duration,
+        storage_state=args.storage_state,
+        **{key: value for key, value in options.items() if value is not None},
+    ))
+    path = realtime.write_results(samples)
+    print(realtime.render_markdown(samples))
+    print(path)
+    return 0
+
+
+def _cmd_bench_launch(args: argparse.Namespace) -> int:
+    from .benchmarks import launch
+
+    profiles = launch.launch_matrix()
+    if args.profiles:
+        unknown = set(args.profiles) - {profile.name for profile in profiles}
+        if unknown:
+            print(f"unknown launch profiles: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+        profiles = [profile for profile in profiles if profile.name in args.profiles]
+    flow = args.flow or launch.DEFAULT_FLOW
+    samples = asyncio.run(launch.run_benchmark(
+        profiles,
+        iterations=args.iterations or launch.DEFAULT_ITERATIONS,
+        flow=flow,
+        storage_state=args.storage_state,
+    ))
+    path = launch.write_results(samples, flow)
+    print(launch.render_markdown(samples, flow))
+    print(path)
+    return 0
+
+
+def _cmd_store(args: argparse.Namespace) -> int:
+    from . import store
+
+    with store.ResultStore(args.db) as db:
+        if args.store_command == "import":
+            for path in args.paths or [store.LEGACY_RESULTS]:
+                run_id = store.import_testsprite_json(db, path)
+                print(f"{path}: {run_id or 'already imported'}")
+        elif args.store_command == "export":
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as out:
+                    count = store.export_json(db, out, args.run)
+                print(f"{args.output}: {count} results")
+            else:
+                store.export_json(db, sys.stdout, args.run)
+        else:
+            for row in db.runs(args.limit):
+                print(f"{row['run_id']}  {row['source']:<10} {row['passed'] or 0}/{row['total']} passed"
+                      f"  build {(row['build_hash'] or '-')[:12]}")
+    return 0
+
+
+def _cmd_report(args: argparse.Namespace) -> int:
+    from .report import REPORT_DIR, build_report, write_report
+    from .store import ResultStore
+
+    with ResultStore(args.db) as store:
+        path = write_report(build_report(store, args.run), args.output_dir or REPORT_DIR)
+    print(path)
+    return 0
+
+
+def _cmd_clusters(args: argparse.Namespace) -> int:
+    from .clusters import DEFAULT_THRESHOLD, cluster_run, render_markdown
+    from .store import ResultStore
+
+    threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    with ResultStore(args.db) as store:
+        print(render_markdown(cluster_run(store, args.run, threshold)), end="")
+    return 0
+
+
+def _cmd_flaky(args: argparse.Namespace) -> int:
+    from . import flaky
+    from .store import ResultStore
+
+    with ResultStore(args.db) as store:
+        stats = flaky.analyze(store, args.window or flaky.WINDOW)
+        if args.update:
+            flaky.update_quarantine(store, stats)
+        quarantined = set(store.quarantined())
+        if not args.all:
+            stats = [item for item in stats if item.failures or item.name in quarantined]
+        print(flaky.render_table(stats, quarantined), end="")
+    return 0
+
+
+def _cmd_artifacts(args: argparse.Namespace) -> int:
+    from .artifacts import DEFAULT_KEEP, ArtifactStore, format_bytes, render_stats
+
+    artifacts = ArtifactStore()
+    if args.artifacts_command == "gc":
+        removed, freed = artifacts.gc(DEFAULT_KEEP if args.keep is None else args.keep)
+        print(f"removed {removed} runs, freed {format_bytes(freed)}")
+    elif args.artifacts_command == "checkout":
+        try:
+            count = artifacts.checkout(args.run, args.output_dir, args.test, args.link)
+        except LookupError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        print(f"{args.output_dir}: {count} files")
+    else:
+        print(render_stats(artifacts.stats()), end="")
+    return 0
+
+
+def _cmd_a11y_diff(args: argparse.Namespace) -> int:
+    from .a11y import diff_runs, recorded_runs, render_diff
+
+    runs = recorded_runs()
+    run = args.run or (runs[-1] if runs else None)
+    earlier = [other for other in runs if run and other < run]
+    base = args.base or (earlier[-1] if earlier else None)
+    if not run or not base:
+        print("need two runs with --a11y snapshots", file=sys.stderr)
+        return 2
+    print(render_diff(diff_runs(base, run), base, run), end="")
+    return 0
+
+
+def _cmd_merge(args: argparse.Namespace) -> int:
+    from .shards import merge
+    from .store import ResultStore
+
+    with ResultStore(args.db) as store:
+        try:
+            run_id, count = merge(store, args.shard_dbs)
+        except (FileNotFoundError, LookupError) as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        print(f"{run_id}: {count} results from {len(args.shard_dbs)} shards")
+        if args.report:
+            from .report import REPORT_DIR, build_report, write_report
+
+            print(write_report(build_report(store, run_id), args.output_dir or REPORT_DIR))
+    return 0
+
+
+def _cmd_impact(args: argparse.Namespace) -> int:
+    from . import impact
+    from .loader import discover
+    from .store import ResultStore
+
+    scripts = discover()
+    with ResultStore(args.db) as store:
+        index = store.test_modules()
+    if args.changed_since:
+        selection = impact.select(scripts, impact.changed_files(args.changed_since), index)
+        print(impact.render_selection(selection, len(scripts)), end="")
+        return 0
+    for script in scripts:
+        files = index.get(script.name)
+        print(f"{script.name}: {len(files)} files" if files else f"{script.name}: no recorded run")
+    return 0
+
+
+def _cmd_daemon(args: argparse.Namespace) -> int:
+    from . import daemon
+
+    if args.daemon_command == "start":
+        return _daemon_start(args)
+    if not asyncio.run(daemon.running()):
+        print("no daemon running; start one with: python -m harness daemon start", file=sys.stderr)
+        return 2
+    message = {"command": args.daemon_command}
+    if args.daemon_command == "run":
+        message["tests"] = args.tests
+
+    async def send() -> int:
+        status = 0
+        async for event in daemon.request(message):
+            print(daemon.render_event(event))
+            if event["event"] == "error" or event.get("failed"):
+                status = 1
+        return status
+
+    return asyncio.run(send())
+
+
+def _daemon_start(args: argparse.Namespace) -> int:
+    import json
+
+    from . import daemon
+    from .watchdog import STEP_BUDGET_S, TEST_BUDGET_S, Watchdog
+
+    if asyncio.run(daemon.running()):
+        print("a daemon is already running; stop it with: python -m harness daemon stop", file=sys.stderr)
+        return 2
+    if args.watch and args.no_store:
+        print("--watch needs the results store", file=sys.stderr)
+        return 2
+
+    plugins, store = [], None
+    if not args.no_store:
+        from .impact import ImpactRecorder
+        from .store import ResultStore, StorePlugin
+
+        store = ResultStore(args.db)
+        # No fixed build hash: the app changes while the daemon runs.
+        plugins += [StorePlugin(store), ImpactRecorder(store)]
+    storage_state = None
+    if args.storage_state:
+        with open(args.storage_state, encoding="utf-8") as fh:
+            storage_state = json.load(fh)
+    watchdog = Watchdog(
+        TEST_BUDGET_S if args.test_budget is None else args.test_budget,
+        STEP_BUDGET_S if args.step_budget is None else args.step_budget,
+    )
+
+    async def serve() -> None:
+        await daemon.Daemon(
+            plugins,
+            watchdog,
+            store=store,
+            storage_state=storage_state,
+            watch=args.tests if args.watch else None,
+        ).serve()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _rates(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _names(value: str) -> list[str]:
+    return [v for v in value.split(",") if v]
+
+
+def _shard(value: str):
+    from .shards import Shard
+
+    try:
+        return Shard.parse(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from .profiles import PROFILES
+
+    parser = argparse.ArgumentParser(prog="harness", description="TestSprite TC script harness")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every test as it finishes")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run TC scripts")
+    run.add_argument("tests", nargs="*", help="test ids (TC004), script names or paths; default: all")
+    run.add_argument("--profile", default="default", choices=sorted(PROFILES),
+                     help="browser launch profile applied to every script")
+    run.add_argument("--coverage", action="store_true",
+                     help=f"record per-route JS/CSS coverage into {OUTPUT_DIR / 'coverage'}")
+    run.add_argument("--react-profile", action="store_true",
+                     help=f"record React commits and render counts per step into {OUTPUT_DIR / 'react'}")
+    run.add_argument("--fake-clock", action="store_true",
+                     help="install Playwright's fake clock and the in-page socket source on every context")
+    run.add_argument("--no-store", action="store_true", help="do not record results in the results store")
+    run.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    run.add_argument("--console", nargs="?", const="LOG", type=str.upper, metavar="LEVEL",
+                     choices=("DEBUG", "LOG", "INFO", "WARNING", "ERROR"),
+                     help="stream console messages and page errors at LEVEL or above (default LOG)"
+                          " to tmp/harness/console")
+    run.add_argument("--a11y", action="store_true",
+                     help="take an accessibility-tree snapshot after every step, saved per route in tmp/harness/a11y")
+    run.add_argument("--resources", action="store_true",
+                     help="sample CPU, RSS and open fds of the browser, Playwright driver and Vite server per test")
+    run.add_argument("--capture-failures", action="store_true",
+                     help="keep low-res screenshots and DOM snapshots of recent steps in memory;"
+                          " written to tmp/harness/failures only for failed tests")
+    run.add_argument("--trace", action="store_true",
+                     help="also record a Playwright trace, saved only when the script fails")
+    run.add_argument("--artifacts", action="store_true",
+                     help="store failure captures in the deduplicating artifact store (tmp/harness/artifacts)")
+    run.add_argument("--changed-since", metavar="GIT_REF",
+                     help="run only scripts affected by changes since GIT_REF (all if shared files changed)")
+    run.add_argument("--cache", action="store_true",
+                     help="skip scripts that passed with the same step program, app build, fixtures and options")
+    run.add_argument("--test-budget", type=float, metavar="SECONDS",
+                     help="fail and close a script running longer than this (default 300; 0 disables)")
+    run.add_argument("--step-budget", type=float, metavar="SECONDS",
+                     help="fail and close a script whose current step runs longer than this (default 120; 0 disables)")
+    run.add_argument("--adaptive-timeouts", action="store_true",
+                     help="set each step's timeout from the p99 of its recorded durations")
+    run.add_argument("--timeout-factor", type=float,
+                     help="safety factor applied to the p99 with --adaptive-timeouts (default 3)")
+    run.add_argument("--shard", type=_shard, metavar="I/N",
+                     help="run the I-th of N shards, balanced by recorded durations (longest first)")
+    run.add_argument("--project", action="append", metavar="NAME",
+                     help="run under a playwright.config.js project (chromium, firefox, webkit, mobile-chrome,"
+                          " mobile-safari, microsoft-edge, google-chrome, or all); repeat for a matrix,"
+                          " with all projects running concurrently")
+    run.add_argument("--lane", choices=("main", "quarantine", "all"),
+                     help="main skips quarantined flaky scripts, quarantine runs only them;"
+                          " default: main, or all when tests are named")
+    run.add_argument("--report", action="store_true",
+                     help="keep the test report up to date after every test (needs the results store)")
+    run.set_defaults(func=_cmd_run)
+
+    report = sub.add_parser("report", help="render the test report (Markdown and HTML) from the results store")
+    report.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    report.add_argument("--run", help="run id; default: latest run")
+    report.add_argument("-o", "--output-dir", type=Path,
+                        help="directory for the report; default: tmp/harness/report")
+    report.set_defaults(func=_cmd_report)
+
+    clusters = sub.add_parser("clusters", help="group the failures of a run by failure signature")
+    clusters.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    clusters.add_argument("--run", help="run id; default: latest run")
+    clusters.add_argument("--threshold", type=float,
+                          help="estimated Jaccard similarity at which two failures share a cluster (default 0.5)")
+    clusters.set_defaults(func=_cmd_clusters)
+
+    flaky = sub.add_parser("flaky", help="flip rate, failure-mode entropy and duration spread per script")
+    flaky.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    flaky.add_argument("--window", type=int, help="recent results per script to consider (default 20)")
+    flaky.add_argument("--update", action="store_true", help="apply quarantine changes")
+    flaky.add_argument("--all", action="store_true", help="include scripts that never failed")
+    flaky.set_defaults(func=_cmd_flaky)
+
+    artifacts = sub.add_parser("artifacts", help="content-addressed artifact store")
+    artifacts_sub = artifacts.add_subparsers(dest="artifacts_command", required=True)
+    artifacts_sub.add_parser("stats", help="logical, stored and deduplicated bytes")
+    artifacts_gc = artifacts_sub.add_parser("gc", help="keep the newest runs and delete unreferenced blobs")
+    artifacts_gc.add_argument("--keep", type=int, help="runs to keep (default 10)")
+    artifacts_checkout = artifacts_sub.add_parser("checkout", help="copy a run's artifacts out as files")
+    artifacts_checkout.add_argument("run", help="run id")
+    artifacts_checkout.add_argument("-o", "--output-dir", type=Path, default=Path("artifacts"))
+    artifacts_checkout.add_argument("--test", help="only this script")
+    artifacts_checkout.add_argument("--link", action="store_true",
+                                    help="hard-link the read-only blobs instead of copying")
+    artifacts.set_defaults(func=_cmd_artifacts)
+
+    a11y_diff = sub.add_parser("a11y-diff", help="structural accessibility-tree changes per route between two runs")
+    a11y_diff.add_argument("--base", help="earlier run id; default: the run before --run")
+    a11y_diff.add_argument("--run", help="run id; default: latest run with snapshots")
+    a11y_diff.set_defaults(func=_cmd_a11y_diff)
+
+    merge = sub.add_parser("merge", help="combine the latest run of each shard database into one run")
+    merge.add_argument("shard_dbs", nargs="+", type=Path, metavar="SHARD_DB")
+    merge.add_argument("--db", help="results store to merge into; default: tmp/harness/results.db")
+    merge.add_argument("--report", action="store_true", help="render the test report for the merged run")
+    merge.add_argument("-o", "--output-dir", type=Path, help="directory for the report; default: tmp/harness/report")
+    merge.set_defaults(func=_cmd_merge)
+
+    impact = sub.add_parser("impact", help="show the test-to-file index or the scripts a change affects")
+    impact.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    impact.add_argument("--changed-since", metavar="GIT_REF", help="list scripts affected by changes since GIT_REF")
+    impact.set_defaults(func=_cmd_impact)
+
+    store = sub.add_parser("store", help="inspect, import and export the results store")
+    store.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    store_sub = store.add_subparsers(dest="store_command", required=True)
+    store_import = store_sub.add_parser("import", help="import TestSprite results JSON files")
+    store_import.add_argument("paths", nargs="*", type=Path, help="default: tmp/test_results.json")
+    store_export = store_sub.add_parser("export", help="write a run as TestSprite results JSON")
+    store_export.add_argument("--run", help="run id; default: latest run")
+    store_export.add_argument("-o", "--output", help="output file; default: stdout")
+    store_runs = store_sub.add_parser("runs", help="list recent runs")
+    store_runs.add_argument("--limit", type=int, default=20)
+    store.set_defaults(func=_cmd_store)
+
+    daemon = sub.add_parser("daemon", help="long-lived runner keeping the driver and browser warm between runs")
+    daemon_sub = daemon.add_subparsers(dest="daemon_command", required=True)
+    daemon_start = daemon_sub.add_parser("start", help="start the daemon in the foreground")
+    daemon_start.add_argument("tests", nargs="*",
+                              help="with --watch, the scripts watch mode may rerun; default: all")
+    daemon_start.add_argument("--watch", action="store_true",
+                              help="rerun the scripts affected by changes under web-app/src")
+    daemon_start.add_argument("--storage-state",
+                              help="Playwright storage state file; contexts start signed in with it")
+    daemon_start.add_argument("--no-store", action="store_true", help="do not record results in the results store")
+    daemon_start.add_argument("--db", help="results store path; default: tmp/harness/results.db")
+    daemon_start.add_argument("--test-budget", type=float, metavar="SECONDS",
+                              help="fail and close a script running longer than this (default 300; 0 disables)")
+    daemon_start.add_argument("--step-budget", type=float, metavar="SECONDS",
+                              help="fail and close a script whose current step runs longer than this"
+                                   " (default 120; 0 disables)")
+    daemon_run = daemon_sub.add_parser("run", help="run scripts in the daemon and stream their results")
+    daemon_run.add_argument("tests", nargs="*", help="test ids (TC004), script names or paths; default: all")
+    daemon_sub.add_parser("status", help="show whether the daemon is up and its warm contexts")
+    daemon_sub.add_parser("stop", help="stop the daemon")
+    daemon.set_defaults(func=_cmd_daemon)
+
+    coverage = sub.add_parser("coverage-report", help="rebuild the coverage report from raw per-test data")
+    coverage.set_defaults(func=_cmd_coverage_report)
+
+    bench_rt = sub.add_parser("bench-realtime", help="dashboard real-time update render-storm benchmark")
+    bench_rt.add_argument("--rates", type=_rates, default=None,
+                          help="comma-separated message rates (msg/s); default 10..5000")
+    bench_rt.add_argument("--duration", type=float, default=5.0, help="seconds measured per rate")
+    bench_rt.add_argument("--url", default=None, help="dashboard URL")
+    bench_rt.add_argument("--ws-url", default=None,
+                          help="URL the stream server listens on; the dev server's VITE_WS_URL"
+                               " (default ws://localhost:8080/ws)")
+    bench_rt.add_argument("--storage-state", help="Playwright storage state file with a signed-in session")
+    bench_rt.set_defaults(func=_cmd_bench_realtime)
+
+    bench_launch = sub.add_parser("bench-launch",
+                                  help="startup, navigation latency, RSS and crash rate per Chromium launch profile")
+    bench_launch.add_argument("--profiles", type=_names, metavar="NAME,...",
+                              help="comma-separated profiles such as shell/single/no-shm/gpu; default: all 16")
+    bench_launch.add_argument("--iterations", type=int, help="fresh browsers per profile (default 5)")
+    bench_launch.add_argument("--flow", type=_names, metavar="PATH,...",
+                              help="comma-separated routes loaded in order; default: /,/login,/register,/dashboard")
+    bench_launch.add_argument("--storage-state", help="Playwright storage state file with a signed-in session")
+    bench_launch.set_defaults(func=_cmd_bench_launch)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(name)s: %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Virtual clock control for timer-heavy flows.
+
+Wraps Playwright's clock API so a test can fast-forward the app's timers
+instead of sleeping: the ``websocketService`` heartbeat (every 30 s), its
+exponential reconnect backoff and the voice activation timeout. The clock has
+to be installed before the app's scripts run, i.e. on the context before the
+first navigation; ``ClockPlugin`` does that for every context a script opens.
+
+Timer constants mirror the app sources and must follow them if they change:
+``src/services/websocketService.js`` and
+``src/services/voiceActivationTimeout.js``.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+from . import ws_source
+from .loader import TestScript
+from .runner import Plugin
+
+# src/services/websocketService.js
+HEARTBEAT_INTERVAL_MS = 30_000
+RECONNECT_BASE_DELAY_MS = 1_000
+MAX_RECONNECT_ATTEMPTS = 5
+# src/services/voiceActivationTimeout.js
+VOICE_TIMEOUT_MS = 10_000
+VOICE_COUNTDOWN_INTERVAL_MS = 1_000
+
+
+def reconnect_delays(attempts: int = MAX_RECONNECT_ATTEMPTS, base_ms: int = RECONNECT_BASE_DELAY_MS) -> list[int]:
+    """Backoff delays ``websocketService.handleReconnect`` waits before each attempt."""
+    return [base_ms * 2 ** (attempt - 1) for attempt in range(1, attempts + 1)]
+
+
+async def install(target: Any, time: datetime.datetime | float | str | None = None) -> None:
+    """Install the fake clock on a context (or page) before the app loads.
+
+    Time keeps flowing normally after install; the helpers below jump ahead.
+    """
+    await target.clock.install(time=time)
+
+
+async def advance(page: Any, ms: int) -> None:
+    """Run every timer due within the next ``ms`` of virtual time, in order."""
+    await page.clock.run_for(ms)
+
+
+async def advance_heartbeats(page: Any, count: int = 1) -> int | None:
+    """Fire ``count`` heartbeat intervals.
+
+    Returns how many ``HEARTBEAT`` messages reached the in-page socket source
+    in that window, or ``None`` when the source is not installed.
+    """
+    before = await ws_source.stats(page)
+    await advance(page, count * HEARTBEAT_INTERVAL_MS)
+    after = await ws_source.stats(page)
+    if before is None or after is None:
+        return None
+    return after["sent"].get("HEARTBEAT", 0) - before["sent"].get("HEARTBEAT", 0)
+
+
+async def advance_reconnect_backoff(page: Any, attempts: int = MAX_RECONNECT_ATTEMPTS) -> list[dict]:
+    """Drop the socket and run through the reconnect backoff without waiting.
+
+    Requires the in-page socket source. Connections are refused while the
+    backoff runs so every attempt fails; they are accepted again afterwards.
+    Returns one entry per attempt with its delay and the connection attempts
+    the source saw once that delay elapsed. The service only reconnects
+    outside development mode (``isDev()`` false).
+    """
+    await ws_source.set_accepting(page, False)
+    await ws_source.drop(page)
+    timeline = []
+    try:
+        for delay in reconnect_delays(attempts):
+            await advance(page, delay)
+            stats = await ws_source.stats(page)
+            timeline.append({"delay_ms": delay, "connects": stats["connects"]})
+    finally:
+        await ws_source.set_accepting(page, True)
+    return timeline
+
+
+async def expire_voice_timeout(page: Any, timeout_ms: int = VOICE_TIMEOUT_MS) -> None:
+    """Let a started voice activation timeout run out, countdown ticks included."""
+    await advance(page, timeout_ms + VOICE_COUNTDOWN_INTERVAL_MS)
+
+
+class ClockPlugin(Plugin):
+    """Runner plugin installing the fake clock (and socket source) on each context."""
+
+    def __init__(self, time: datetime.datetime | float | str | None = None, with_ws_source: bool = True):
+        self.time = time
+        self.with_ws_source = with_ws_source
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        await install(context, self.time)
+        if self.with_ws_source:
+            await ws_source.install(context)
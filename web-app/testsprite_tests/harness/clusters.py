@@ -0,0 +1,192 @@
+"""Root-cause clustering of failed results by failure signature.
+
+A failure's signature is a set of tokens: the fingerprints of its console
+messages (``harness.logs``) plus word shingles of its normalised error text,
+with numbers generalised so ``Timeout 60000ms`` and ``Timeout 30000ms`` agree.
+Signatures are compressed to MinHash sketches and bucketed with LSH banding,
+so only failures likely to be similar are compared; pairs whose estimated
+Jaccard similarity reaches the threshold end up in the same cluster. Every
+pair sharing a bucket is compared once, so cost grows with the size of the
+buckets rather than with all pairs of failures, which keeps nightly runs with
+thousands of results cheap.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .logs import normalize
+from .runner import CACHED, PASSED
+from .store import ResultStore
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.5
+SHINGLE = 3
+
+_MASK = (1 << 64) - 1
+# Fixed permutation coefficients so sketches are stable across processes.
+_PERMUTATIONS = [
+    struct.unpack("<QQ", hashlib.blake2b(f"perm{i}".encode(), digest_size=16).digest())
+    for i in range(NUM_PERM)
+]
+
+_FRAME = re.compile(r'File "(?:.*[/\\])?([^"/\\]+)", line \d+, in (\S+)')
+_NUMBER = re.compile(r"\d+")
+
+
+def error_tokens(error: str) -> set[str]:
+    """Shingles of the error text; Python traceback frames become ``file:function``."""
+    tokens = set()
+    words: list[str] = []
+    for line in error.splitlines():
+        frame = _FRAME.search(line)
+        if frame:
+            tokens.add(f"frame:{frame[1]}:{frame[2]}")
+            continue
+        words += _NUMBER.sub("N", normalize(line)).split()
+    for i in range(max(len(words) - SHINGLE + 1, 1 if words else 0)):
+        tokens.add("err:" + " ".join(words[i:i + SHINGLE]))
+    return tokens
+
+
+def signature(error: str, fingerprints: Iterable[str]) -> set[str]:
+    return error_tokens(error) | {f"log:{fp}" for fp in fingerprints}
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(tokens: set[str]) -> tuple[int, ...]:
+    hashes = [_token_hash(token) for token in tokens] or [0]
+    # (a * h + b) mod 2^64 with odd ``a`` is a permutation of 64-bit hashes.
+    return tuple(min(((a | 1) * h + b) & _MASK for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the token sets behind two sketches."""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+@dataclass
+class Failure:
+    result_id: int
+    test_id: str
+    name: str
+    error: str
+    messages: dict[str, str]
+    sketch: tuple[int, ...] = field(repr=False)
+
+
+@dataclass
+class Cluster:
+    members: list[Failure]
+    label: str = ""
+
+    @property
+    def test_ids(self) -> list[str]:
+        return sorted({member.test_id for member in self.members})
+
+
+_ERROR_LINE = re.compile(r"Error|Exception|Timeout|failed", re.IGNORECASE)
+
+
+def headline(error: str) -> str:
+    """Last unindented line naming an error, else the first line."""
+    lines = [line for line in error.strip().splitlines() if line and not line[0].isspace()]
+    named = [line for line in lines if _ERROR_LINE.search(line)]
+    return (named or lines or ["no error output"])[-1 if named else 0][:160]
+
+
+def _label(members: list[Failure], everyone: Counter, total: int) -> str:
+    """Console message most specific to the cluster, else the most common error headline.
+
+    A message scores by how many members have it minus how common it is
+    outside the cluster, so warnings every test prints do not label anything;
+    errors win ties over warnings.
+    """
+    inside = Counter(fp for member in members for fp in member.messages)
+    text = {fp: message for member in members for fp, message in member.messages.items()}
+    outside = total - len(members)
+
+    def score(item: tuple[str, int]) -> tuple[float, bool, int, str]:
+        fingerprint, count = item
+        elsewhere = (everyone[fingerprint] - count) / outside if outside else 0.0
+        return (count / len(members) - elsewhere, text[fingerprint].startswith("[ERROR]"), count, fingerprint)
+
+    if inside:
+        best = max(inside.items(), key=score)
+        if score(best)[0] > 0:
+            return text[best[0]].splitlines()[0][:160]
+    headlines = Counter(headline(member.error) for member in members)
+    return min(headlines.items(), key=lambda item: (-item[1], item[0]))[0]
+
+
+def cluster(failures: list[Failure], threshold: float = DEFAULT_THRESHOLD) -> list[Cluster]:
+    parent = list(range(len(failures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: dict[tuple, list[int]] = {}
+    for index, failure in enumerate(failures):
+        for band in range(BANDS):
+            key = (band,) + failure.sketch[band * ROWS:(band + 1) * ROWS]
+            buckets.setdefault(key, []).append(index)
+
+    compared: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for position, first in enumerate(members):
+            for other in members[position + 1:]:
+                if find(first) == find(other) or (first, other) in compared:
+                    continue
+                compared.add((first, other))
+                if similarity(failures[first].sketch, failures[other].sketch) >= threshold:
+                    parent[find(other)] = find(first)
+
+    groups: dict[int, list[Failure]] = {}
+    for index, failure in enumerate(failures):
+        groups.setdefault(find(index), []).append(failure)
+    everyone = Counter(fp for failure in failures for fp in failure.messages)
+    clusters = [Cluster(members, _label(members, everyone, len(failures))) for members in groups.values()]
+    clusters.sort(key=lambda c: (-len(c.members), c.test_ids))
+    return clusters
+
+
+def failures(store: ResultStore, run_id: str) -> list[Failure]:
+    found = []
+    for row in store.results(run_id):
+        if row["status"] in (PASSED, CACHED):
+            continue
+        messages = {log["fingerprint"]: f"[{log['level']}] {log['message']}" for log in store.logs(row["id"])}
+        found.append(Failure(
+            result_id=row["id"],
+            test_id=row["test_id"],
+            name=row["name"],
+            error=row["error"],
+            messages=messages,
+            sketch=minhash(signature(row["error"], messages)),
+        ))
+    return found
+
+
+def cluster_run(store: ResultStore, run_id: str | None = None, threshold: float = DEFAULT_THRESHOLD) -> list[Cluster]:
+    return cluster(failures(store, run_id or store.latest_run_id()), threshold)
+
+
+def render_markdown(clusters: list[Cluster]) -> str:
+    lines = ["| # | Failures | Tests | Signature |", "|---|----------|-------|-----------|"]
+    for number, item in enumerate(clusters, 1):
+        label = item.label.replace("|", "\\|")
+        lines.append(f"| {number} | {len(item.members)} | {', '.join(item.test_ids)} | `` {label} `` |")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,47 @@
+"""Paths and defaults shared by the harness modules.
+
+Values mirror what the generated TC scripts hardcode so that harness-driven
+runs behave like the scripts do when executed on their own.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+# Directory layout
+TESTS_DIR = Path(__file__).resolve().parent.parent
+WEB_APP_DIR = TESTS_DIR.parent
+SRC_DIR = WEB_APP_DIR / "src"
+TMP_DIR = TESTS_DIR / "tmp"
+OUTPUT_DIR = TMP_DIR / "harness"
+# Browser-side instrumentation injected as init scripts
+JS_DIR = Path(__file__).resolve().parent / "js"
+
+# Glob used to discover generated test scripts
+TEST_PATTERN = "TC*.py"
+
+# Chromium arguments used by every generated script
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+    "--single-process",
+]
+
+# Timeouts (milliseconds) used by the generated scripts
+DEFAULT_TIMEOUT_MS = 5000
+NAVIGATION_TIMEOUT_MS = 10000
+LOAD_STATE_TIMEOUT_MS = 3000
+
+
+def load_endpoint() -> str:
+    """Return the app URL from the TestSprite config, or the dev server default."""
+    try:
+        with open(TMP_DIR / "config.json", encoding="utf-8") as fh:
+            return json.load(fh).get("localEndpoint") or "http://localhost:3001"
+    except (OSError, ValueError):
+        return "http://localhost:3001"
+
+
+BASE_URL = load_endpoint()
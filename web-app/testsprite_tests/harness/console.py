@@ -0,0 +1,206 @@
+"""Browser console and page-error capture from the moment a context exists.
+
+Listening on ``page.on("console")`` after the flow has run (as TC012 used to)
+sees nothing: the messages were emitted during navigation. ``capture`` hooks
+the context's ``console`` and ``weberror`` events right after
+``new_context``, so every page the context opens is covered from its first
+script. ``ConsoleCapture`` does this for every context a harness run creates.
+
+A ``ConsoleLog`` keeps:
+
+- per-level and per-fingerprint counters over every event (``harness.logs``
+  fingerprints, so the same warning from a different line or HMR timestamp
+  counts as one message);
+- a bounded ring of the most recent events at or above ``min_level``, with a
+  per-level index, for assertions;
+- optionally a JSONL stream on disk. After ``repeat_limit`` occurrences of one
+  fingerprint further copies are only counted, which keeps the dozens of
+  repeated GoTrue and React Router warnings out of the file.
+
+Scripts query it without a driver round trip::
+
+    console = capture(context)
+    ...
+    assert console.count("ERROR") == 0, console.summary("ERROR")
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .config import OUTPUT_DIR
+from .loader import TestScript
+from .logs import fingerprint, normalize
+from .runner import Plugin, Run, TestResult
+
+CONSOLE_DIR = OUTPUT_DIR / "console"
+LEVELS = ("DEBUG", "LOG", "INFO", "WARNING", "ERROR")
+DEFAULT_RING = 500
+REPEAT_LIMIT = 20
+
+# Playwright console message types -> TestSprite's level names.
+_LEVEL_FOR_TYPE = {"error": "ERROR", "assert": "ERROR", "warning": "WARNING", "info": "INFO", "debug": "DEBUG"}
+
+# Logs of open contexts: id(context) -> log.
+_logs: dict[int, ConsoleLog] = {}
+
+
+@dataclass
+class ConsoleEvent:
+    seq: int
+    at: float
+    kind: str  # "console" or "pageerror"
+    level: str
+    text: str
+    url: str
+    fingerprint: str
+
+
+class ConsoleLog:
+    def __init__(
+        self,
+        min_level: str = "LOG",
+        ring: int = DEFAULT_RING,
+        path: Path | None = None,
+        repeat_limit: int = REPEAT_LIMIT,
+    ):
+        self.min_rank = LEVELS.index(min_level.upper())
+        self.recent: deque[ConsoleEvent] = deque(maxlen=ring)
+        self.by_level: dict[str, deque[ConsoleEvent]] = {level: deque(maxlen=ring) for level in LEVELS}
+        self.levels: Counter = Counter()
+        self.fingerprints: Counter = Counter()
+        self.messages: dict[str, str] = {}
+        self.repeat_limit = repeat_limit
+        self.path = path
+        self.suppressed = 0
+        self._stream: IO[str] | None = None
+        self._seq = 0
+
+    def record(self, kind: str, level: str, text: str, url: str = "") -> None:
+        key = fingerprint(level, normalize(text))
+        self.levels[level] += 1
+        self.fingerprints[key] += 1
+        if LEVELS.index(level) < self.min_rank:
+            return
+        self._seq += 1
+        event = ConsoleEvent(self._seq, time.time(), kind, level, text, url, key)
+        self.messages.setdefault(key, f"[{level}] {normalize(text)}")
+        self.recent.append(event)
+        self.by_level[level].append(event)
+        if self.path is None:
+            return
+        if self.fingerprints[key] > self.repeat_limit:
+            self.suppressed += 1
+            return
+        if self._stream is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._stream = open(self.path, "a", encoding="utf-8")
+        self._stream.write(json.dumps(asdict(event), ensure_ascii=False) + "\n")
+
+    def on_console(self, message: Any) -> None:
+        location = getattr(message, "location", None) or {}
+        level = _LEVEL_FOR_TYPE.get(message.type, "LOG")
+        self.record("console", level, message.text, location.get("url", ""))
+
+    def on_weberror(self, error: Any) -> None:
+        page = getattr(error, "page", None)
+        self.record("pageerror", "ERROR", str(error.error), page.url if page else "")
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    # -- queries -------------------------------------------------------------
+
+    def count(self, level: str | None = None, contains: str | None = None) -> int:
+        """Events of a level (all levels if ``None``), counted since capture began.
+
+        With ``contains`` only the ring is searched.
+        """
+        if contains is not None:
+            return len(self.events(level, contains))
+        return self.levels[level.upper()] if level else sum(self.levels.values())
+
+    def events(self, level: str | None = None, contains: str | None = None) -> list[ConsoleEvent]:
+        """Retained events, oldest first; ``contains`` is a case-insensitive substring."""
+        events = self.by_level[level.upper()] if level else self.recent
+        if contains is None:
+            return list(events)
+        needle = contains.lower()
+        return [event for event in events if needle in event.text.lower()]
+
+    def errors(self) -> list[ConsoleEvent]:
+        return self.events("ERROR")
+
+    def occurrences(self, level: str, text: str) -> int:
+        """How often one message was logged; numbers, origins and positions are ignored."""
+        return self.fingerprints[fingerprint(level.upper(), normalize(text))]
+
+    def top(self, n: int = 10, level: str | None = None) -> list[tuple[str, int]]:
+        """Most frequent retained messages as ``("[LEVEL] message", count)``."""
+        prefix = f"[{level.upper()}] " if level else "["
+        ranked = [(self.messages[key], seen) for key, seen in self.fingerprints.most_common() if key in self.messages]
+        return [item for item in ranked if item[0].startswith(prefix)][:n]
+
+    def summary(self, level: str | None = None, n: int = 5) -> str:
+        lines = [f"{self.count(level)} {level or 'console'} messages"]
+        lines += [f"  {count} x {message[:200]}" for message, count in self.top(n, level)]
+        return "\n".join(lines)
+
+
+def capture(context: Any, **options: Any) -> ConsoleLog:
+    """Attach a ``ConsoleLog`` to ``context``; returns the existing one if already attached."""
+    log = _logs.get(id(context))
+    if log is not None:
+        return log
+    log = ConsoleLog(**options)
+    _logs[id(context)] = log
+    context.on("console", log.on_console)
+    context.on("weberror", log.on_weberror)
+    context.on("close", lambda _: _logs.pop(id(context), None))
+    return log
+
+
+def log_for(context: Any) -> ConsoleLog | None:
+    return _logs.get(id(context))
+
+
+class ConsoleCapture(Plugin):
+    """Runner plugin capturing console output of every context to ``console/<run>/<test>.jsonl``."""
+
+    def __init__(self, min_level: str = "LOG", ring: int = DEFAULT_RING, output_dir: Path = CONSOLE_DIR):
+        self.min_level = min_level
+        self.ring = ring
+        self.output_dir = output_dir
+        self.run_id = ""
+        self.logs: list[ConsoleLog] = []
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self.logs = []
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        path = self.output_dir / self.run_id / f"{test.name}.jsonl"
+        self.logs.append(capture(context, min_level=self.min_level, ring=self.ring, path=path))
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        levels: Counter = Counter()
+        suppressed = 0
+        for log in self.logs:
+            log.close()
+            levels.update(log.levels)
+            suppressed += log.suppressed
+        if self.logs:
+            path = self.output_dir / self.run_id / f"{test.name}.jsonl"
+            result.metrics["console"] = {"levels": dict(levels), "suppressed": suppressed}
+            if path.exists():
+                result.metrics["console"]["file"] = str(path)
+        self.logs = []
@@ -0,0 +1,386 @@
+"""Per-route JavaScript and CSS coverage for code-splitting decisions.
+
+``CoverageCollector`` turns on Chromium precise coverage for every page a test
+opens and takes a coverage delta whenever the main frame changes route. Each
+delta is attributed to the source module that served it, so the raw data says
+how many bytes of a module were downloaded on a route and how many of them
+actually ran there.
+
+Raw data is written per test under ``OUTPUT_DIR/coverage/raw`` and
+``build_report`` aggregates all of it into a ranking of lazy-loading
+candidates: modules fetched on a test's first load, ranked by the bytes of
+them that executed on no first load (functions that were never called),
+grouped by feature.
+
+CSS usage comes from ``CSS.takeCoverageDelta``, which reports a rule only on
+the route where it first matched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from .config import OUTPUT_DIR
+from .loader import TestScript
+from .runner import Plugin, Run, TestResult
+from .urls import module_for_url, module_group, route_for_url
+
+logger = logging.getLogger("harness.coverage")
+
+COVERAGE_DIR = OUTPUT_DIR / "coverage"
+
+Interval = tuple[int, int]
+
+
+# ---------------------------------------------------------------------------
+# Interval helpers
+# ---------------------------------------------------------------------------
+
+def used_intervals(functions: Iterable[dict]) -> list[Interval]:
+    """Disjoint executed byte ranges from a V8 block-coverage function list.
+
+    V8 reports nested ranges where an inner range overrides the count of its
+    parent; the innermost range covering an offset decides whether it ran.
+    """
+    points = []
+    for function in functions:
+        for rng in function["ranges"]:
+            start, end, count = rng["startOffset"], rng["endOffset"], rng["count"]
+            length = end - start
+            # Ends sort before starts at the same offset; outer starts first,
+            # inner ends first, so the stack always mirrors the nesting.
+            points.append((start, 1, -length, count))
+            points.append((end, 0, length, count))
+    points.sort()
+
+    result: list[list[int]] = []
+    stack: list[int] = []
+    last_offset = 0
+    for offset, is_start, _, count in points:
+        if stack and stack[-1] > 0 and last_offset < offset:
+            if result and result[-1][1] == last_offset:
+                result[-1][1] = offset
+            else:
+                result.append([last_offset, offset])
+        last_offset = offset
+        if is_start:
+            stack.append(count)
+        elif stack:
+            stack.pop()
+    return [(start, end) for start, end in result]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    merged: list[list[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def interval_bytes(intervals: Iterable[Interval]) -> int:
+    return sum(end - start for start, end in intervals)
+
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Entry:
+    kind: str  # "js" or "css"
+    size: int = 0
+    used: list[Interval] = field(default_factory=list)
+    downloaded: bool = False
+
+
+class _PageCoverage:
+    """Coverage session for one page, bucketed by route."""
+
+    def __init__(self, page: Any):
+        self.page = page
+        self.cdp = None
+        self.route: str | None = None
+        self.first_route: str | None = None
+        self.seen_modules: set[tuple[str, str]] = set()
+        self.sheets: dict[str, tuple[str | None, int]] = {}
+        self.entries: dict[tuple[str, str], _Entry] = {}
+        self._pending: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        self.cdp = await self.page.context.new_cdp_session(self.page)
+        self.cdp.on("CSS.styleSheetAdded", self._on_style_sheet)
+        await self.cdp.send("Profiler.enable")
+        await self.cdp.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": True})
+        await self.cdp.send("DOM.enable")
+        await self.cdp.send("CSS.enable")
+        await self.cdp.send("CSS.startRuleUsageTracking")
+        self.page.on("framenavigated", self._on_navigated)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _on_navigated(self, frame: Any) -> None:
+        if frame is not self.page.main_frame:
+            return
+        route = route_for_url(frame.url)
+        if route != self.route:
+            # Close the previous route's bucket before the new one starts.
+            self._spawn(self.take(next_route=route))
+
+    def _on_style_sheet(self, params: dict) -> None:
+        self._spawn(self._resolve_sheet(params["header"]))
+
+    async def _resolve_sheet(self, header: dict) -> None:
+        module = module_for_url(header.get("sourceURL") or "")
+        if module is None and header.get("ownerNode"):
+            # Vite injects dev CSS as <style data-vite-dev-id="/abs/path.css">.
+            try:
+                node = await self.cdp.send("DOM.describeNode", {"backendNodeId": header["ownerNode"]})
+                attrs = node["node"].get("attributes", [])
+                dev_id = dict(zip(attrs[::2], attrs[1::2])).get("data-vite-dev-id")
+                if dev_id:
+                    index = dev_id.find("src/")
+                    module = dev_id[index:] if index != -1 else dev_id.lstrip("/")
+            except Exception:
+                pass
+        self.sheets[header["styleSheetId"]] = (module, int(header.get("length") or 0))
+
+    def _entry(self, route: str, module: str, kind: str, size: int) -> _Entry:
+        entry = self.entries.get((route, module))
+        if entry is None:
+            entry = self.entries[(route, module)] = _Entry(kind)
+        entry.size = max(entry.size, size)
+        if (kind, module) not in self.seen_modules:
+            self.seen_modules.add((kind, module))
+            entry.downloaded = True
+        return entry
+
+    async def take(self, next_route: str | None = None) -> None:
+        """Attribute coverage since the previous take to the current route."""
+        async with self._lock:
+            route = self.route
+            if route is not None:
+                try:
+                    js = await self.cdp.send("Profiler.takePreciseCoverage")
+                    css = await self.cdp.send("CSS.takeCoverageDelta")
+                except Exception:
+                    logger.debug("coverage take failed on %s", route, exc_info=True)
+                    js, css = {"result": []}, {"coverage": []}
+                self._record_js(route, js["result"])
+                self._record_css(route, css["coverage"])
+            if next_route is not None:
+                self.route = next_route
+                self.first_route = self.first_route or next_route
+
+    def _record_js(self, route: str, scripts: list[dict]) -> None:
+        for script in scripts:
+            module = module_for_url(script["url"])
+            if module is None or not script["functions"]:
+                continue
+            size = max(r["endOffset"] for f in script["functions"] for r in f["ranges"])
+            entry = self._entry(route, module, "js", size)
+            entry.used = merge_intervals(entry.used + used_intervals(script["functions"]))
+
+    def _record_css(self, route: str, rules: list[dict]) -> None:
+        used_by_sheet: dict[str, list[Interval]] = defaultdict(list)
+        for rule in rules:
+            if rule["used"]:
+                used_by_sheet[rule["styleSheetId"]].append((int(rule["startOffset"]), int(rule["endOffset"])))
+        for sheet_id, (module, size) in list(self.sheets.items()):
+            if module is None:
+                continue
+            entry = self._entry(route, module, "css", size)
+            entry.used = merge_intervals(entry.used + used_by_sheet.get(sheet_id, []))
+
+    async def stop(self) -> list[dict]:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.take()
+        try:
+            await self.cdp.detach()
+        except Exception:
+            pass
+        return [
+            {
+                "route": route,
+                "module": module,
+                "kind": entry.kind,
+                "size": entry.size,
+                "used": interval_bytes(entry.used),
+                "ranges": entry.used,
+                "downloaded": entry.downloaded,
+                "first_load": route == self.first_route,
+            }
+            for (route, module), entry in sorted(self.entries.items())
+        ]
+
+
+class CoverageCollector(Plugin):
+    """Runner plugin recording per-route JS/CSS usage for every test."""
+
+    def __init__(self, output_dir: Path = COVERAGE_DIR):
+        self.output_dir = output_dir
+        self.raw_dir = output_dir / "raw"
+        self._pages: list[_PageCoverage] = []
+        self._entries: list[dict] = []
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self._pages, self._entries = [], []
+
+    async def on_page(self, test: TestScript, page: Any) -> None:
+        if page.context.browser and page.context.browser.browser_type.name != "chromium":
+            return
+        tracker = _PageCoverage(page)
+        await tracker.start()
+        self._pages.append(tracker)
+
+    async def _flush(self) -> None:
+        pages, self._pages = self._pages, []
+        for tracker in pages:
+            self._entries.extend(await tracker.stop())
+
+    async def on_context_close(self, test: TestScript, context: Any) -> None:
+        await self._flush()
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        await self._flush()
+        if not self._entries:
+            return
+        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        path = self.raw_dir / f"{test.name}.json"
+        path.write_text(json.dumps({"test": test.name, "entries": self._entries}, indent=1), encoding="utf-8")
+        result.metrics["coverage"] = {
+            "downloaded_bytes": sum(e["size"] for e in self._entries if e["downloaded"]),
+            "used_bytes": sum(e["used"] for e in self._entries),
+        }
+
+    async def on_run_end(self, run: Run) -> None:
+        write_report(build_report(self.raw_dir), self.output_dir)
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def build_report(raw_dir: Path = COVERAGE_DIR / "raw") -> dict:
+    """Aggregate every raw per-test file into routes and lazy-load candidates."""
+    # (route, module) -> aggregate across tests
+    usage: dict[tuple[str, str], dict] = {}
+    tests_by_route: dict[str, set[str]] = defaultdict(set)
+    first_load_routes: set[str] = set()
+
+    for path in sorted(raw_dir.glob("*.json")):
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        for entry in raw["entries"]:
+            key = (entry["route"], entry["module"])
+            agg = usage.setdefault(key, {"kind": entry["kind"], "size": 0, "ranges": [], "downloaded": False})
+            agg["size"] = max(agg["size"], entry["size"])
+            # Raw files written before ranges were kept only have a byte count.
+            ranges = entry.get("ranges", [(0, entry["used"])])
+            agg["ranges"] = merge_intervals(agg["ranges"] + [tuple(r) for r in ranges])
+            agg["downloaded"] = agg["downloaded"] or entry["downloaded"]
+            tests_by_route[entry["route"]].add(raw["test"])
+            if entry["first_load"]:
+                first_load_routes.add(entry["route"])
+
+    for agg in usage.values():
+        agg["used"] = interval_bytes(agg["ranges"])
+
+    routes: dict[str, dict] = {}
+    for (route, module), agg in usage.items():
+        summary = routes.setdefault(route, {"tests": len(tests_by_route[route]), "downloaded_bytes": 0,
+                                            "used_bytes": 0, "modules": 0})
+        if agg["downloaded"]:
+            summary["downloaded_bytes"] += agg["size"]
+            summary["used_bytes"] += min(agg["used"], agg["size"])
+            summary["modules"] += 1
+
+    # Importing a module runs its top level, so nearly every fetched module
+    # executed. What deferring can save is the code that ran on no first-load
+    # route; one first load saves those bytes once, whichever route it is.
+    candidates: dict[str, dict] = {}
+    for (route, module), agg in usage.items():
+        if route not in first_load_routes or not agg["downloaded"]:
+            continue
+        if module_group(module) == "tooling":
+            continue
+        cand = candidates.setdefault(module, {"module": module, "group": module_group(module), "kind": agg["kind"],
+                                              "size": 0, "ranges": [], "routes": set()})
+        cand["size"] = max(cand["size"], agg["size"])
+        cand["ranges"] = merge_intervals(cand["ranges"] + agg["ranges"])
+        cand["routes"].add(route)
+
+    modules = []
+    for cand in candidates.values():
+        unused = cand["size"] - min(interval_bytes(cand["ranges"]), cand["size"])
+        if unused <= 0:
+            continue
+        used_on = sorted({r for (r, m), a in usage.items() if m == cand["module"] and a["used"] > 0})
+        modules.append({
+            "module": cand["module"],
+            "group": cand["group"],
+            "kind": cand["kind"],
+            "size": cand["size"],
+            "bytes_saved": unused,
+            "first_load_routes": sorted(cand["routes"]),
+            "used_on_routes": used_on,
+        })
+    modules.sort(key=lambda m: (-m["bytes_saved"], m["module"]))
+
+    groups: dict[str, dict] = {}
+    for module in modules:
+        group = groups.setdefault(module["group"], {"group": module["group"], "bytes_saved": 0, "modules": 0})
+        group["bytes_saved"] += module["bytes_saved"]
+        group["modules"] += 1
+
+    return {
+        "routes": dict(sorted(routes.items())),
+        "first_load_routes": sorted(first_load_routes),
+        "candidates": sorted(groups.values(), key=lambda g: (-g["bytes_saved"], g["group"])),
+        "modules": modules,
+    }
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:.1f} KB"
+
+
+def render_markdown(report: dict, limit: int = 25) -> str:
+    lines = ["# Route coverage", "", "## Routes", "",
+             "| Route | Tests | Modules | Downloaded | Used | Unused % |",
+             "|-------|-------|---------|------------|------|----------|"]
+    for route, s in report["routes"].items():
+        unused = 100 * (1 - s["used_bytes"] / s["downloaded_bytes"]) if s["downloaded_bytes"] else 0
+        lines.append(f"| `{route}` | {s['tests']} | {s['modules']} | {_kb(s['downloaded_bytes'])} "
+                     f"| {_kb(s['used_bytes'])} | {unused:.0f}% |")
+    lines += ["", "## Lazy-loading candidates by feature", "",
+              "| Group | Modules | Saved on first load |", "|-------|---------|---------------------|"]
+    for group in report["candidates"]:
+        lines.append(f"| `{group['group']}` | {group['modules']} | {_kb(group['bytes_saved'])} |")
+    lines += ["", f"## Top {limit} modules", "",
+              "| Module | Size | Saved on first load | First-load routes | Executed on |",
+              "|--------|------|---------------------|-------------------|-------------|"]
+    for module in report["modules"][:limit]:
+        lines.append(f"| `{module['module']}` | {_kb(module['size'])} | {_kb(module['bytes_saved'])} "
+                     f"| {', '.join(module['first_load_routes'])} | {', '.join(module['used_on_routes']) or '-'} |")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report: dict, output_dir: Path = COVERAGE_DIR) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    path = output_dir / "report.md"
+    path.write_text(render_markdown(report), encoding="utf-8")
+    return path
@@ -0,0 +1,345 @@
+"""Long-lived runner for the edit-and-rerun loop.
+
+``python -m harness run TC004`` starts an interpreter, the Playwright driver
+and a browser before the script's first step, and throws them away after its
+last. The daemon keeps them:
+
+- one ``SharedBrowser`` (driver and Chromium) for every run;
+- ``WARM_CONTEXTS`` contexts prepared in the background, each with a page
+  already open, handed to the scripts' ``new_context()``/``new_page()``;
+- with a Playwright storage state, those contexts start signed in. The state
+  is refreshed from contexts that are still signed in when a script closes
+  them, so token refreshes made by the app carry over to the next run;
+- one ``Runner`` whose plugins (results store, impact recorder) and watchdog
+  stay set up between runs.
+
+Scripts are re-read on every run; changes to the harness itself need a
+restart. If the browser disconnects it is relaunched before the next run.
+
+Clients talk to it over a Unix socket (``SOCKET_PATH``) with one JSON object
+per line. asyncio has no Unix sockets on Windows; there the daemon listens on
+a loopback port instead and writes the port number next to the socket path
+(``daemon.port``), where clients look it up. A request is ``{"command": "run", "tests": [...]}``, ``status`` or
+``stop``. A run answers with a ``result`` event per script, then ``done``.
+
+In watch mode the daemon polls ``web-app/src`` and, once the changes have
+settled, runs the scripts ``impact.select`` picks for them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Sequence
+
+from . import impact
+from .config import OUTPUT_DIR, SRC_DIR, WEB_APP_DIR
+from .loader import TestScript, discover
+from .runner import FAILED, PASSED, Plugin, Run, Runner, TestResult
+from .session import SharedBrowser, close_all
+from .store import ResultStore
+from .watchdog import Watchdog
+
+logger = logging.getLogger("harness.daemon")
+
+SOCKET_PATH = OUTPUT_DIR / "daemon.sock"
+UNIX_SOCKETS = hasattr(asyncio, "start_unix_server")
+LOOPBACK = "127.0.0.1"
+WARM_CONTEXTS = 2
+WATCH_INTERVAL_S = 0.5
+SETTLE_S = 0.3
+# Largest message a client reads (errors carry full tracebacks).
+LINE_LIMIT = 2**20
+
+
+def signed_in(state: dict) -> bool:
+    """True if a storage state holds a Supabase session."""
+    return any(
+        item["name"].endswith("-auth-token")
+        for origin in state.get("origins", [])
+        for item in origin.get("localStorage", [])
+    )
+
+
+def source_mtimes(src_dir: Path = SRC_DIR) -> dict[str, int]:
+    """web-app relative path -> mtime of every file under ``src_dir``."""
+    mtimes = {}
+    for path in src_dir.rglob("*"):
+        try:
+            if path.is_file():
+                mtimes[path.relative_to(WEB_APP_DIR).as_posix()] = path.stat().st_mtime_ns
+        except OSError:
+            continue  # deleted while scanning
+    return mtimes
+
+
+def render_event(event: dict) -> str:
+    if event["event"] == "result":
+        line = f"{event['status']} {event['name']} ({event['duration_ms']:.0f} ms)"
+        if event["status"] == FAILED and event["error"]:
+            line += "\n" + event["error"].rstrip()
+        return line
+    if event["event"] == "done":
+        return f"{event['run_id']}: {event['passed']} passed, {event['failed']} failed"
+    if event["event"] == "status":
+        return (f"pid {event['pid']}, {event['runs']} runs, {event['warm']} warm contexts,"
+                f" browser {'up' if event['browser'] else 'down'}, watch {'on' if event['watching'] else 'off'}")
+    return event.get("message", json.dumps(event))
+
+
+class _Relay(Plugin):
+    """Streams results to the requesting client and keeps the auth state fresh."""
+
+    def __init__(self, daemon: Daemon):
+        self.daemon = daemon
+
+    async def on_context_close(self, test: TestScript, context: Any) -> None:
+        if self.daemon.storage_state is None or context not in self.daemon.handed:
+            return
+        state = await context.storage_state()
+        if signed_in(state):
+            self.daemon.storage_state = state
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        await close_all(self.daemon.handed + self.daemon.opened)
+        self.daemon.handed.clear()
+        self.daemon.opened.clear()
+        await self.daemon.emit({
+            "event": "result",
+            "name": result.name,
+            "status": result.status,
+            "duration_ms": result.duration_ms,
+            "error": result.error,
+        })
+
+
+class Daemon:
+    def __init__(
+        self,
+        plugins: Sequence[Plugin] = (),
+        watchdog: Watchdog | None = None,
+        store: ResultStore | None = None,
+        storage_state: dict | None = None,
+        watch: Sequence[str] | None = None,
+        socket_path: Path = SOCKET_PATH,
+        warm: int = WARM_CONTEXTS,
+    ):
+        self.runner = Runner([*plugins, _Relay(self)], watchdog)
+        self.store = store
+        self.storage_state = storage_state
+        self.watch = watch  # test selectors considered by watch mode; None: no watching
+        self.socket_path = socket_path
+        self.shared = SharedBrowser()
+        self.pool: asyncio.Queue = asyncio.Queue(maxsize=warm)
+        self.handed: list[Any] = []
+        self.opened: list[Any] = []
+        self.runs = 0
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+        self._filler: asyncio.Task | None = None
+
+    # -- browser and warm contexts -------------------------------------------
+
+    async def _prepare(self) -> None:
+        while True:
+            try:
+                options = {"storage_state": self.storage_state} if self.storage_state else {}
+                context = await self.shared.new_context(**options)
+                page = await self.shared.new_page(context)
+            except Exception:
+                logger.debug("preparing a warm context failed", exc_info=True)
+                await asyncio.sleep(1)
+                continue
+            await self.pool.put((context, page))
+
+    async def _provide(self) -> Any:
+        context, page = await self.pool.get()
+        self.shared.warm_page(context, page)
+        self.handed.append(context)
+        return context
+
+    async def _start_browser(self) -> None:
+        await self.shared.start()
+        self._filler = asyncio.create_task(self._prepare(), name="daemon:warm")
+
+    async def _stop_browser(self) -> None:
+        if self._filler is not None:
+            self._filler.cancel()
+            await asyncio.gather(self._filler, return_exceptions=True)
+            self._filler = None
+        warm = []
+        while not self.pool.empty():
+            warm.append(self.pool.get_nowait()[0])
+        await close_all(warm)
+        try:
+            await self.shared.stop()
+        except Exception:
+            logger.debug("stopping the browser failed", exc_info=True)
+
+    # -- runs ------------------------------------------------------------------
+
+    async def emit(self, event: dict) -> None:
+        print(render_event(event), flush=True)
+        if self._writer is None:
+            return
+        try:
+            self._writer.write((json.dumps(event) + "\n").encode())
+            await self._writer.drain()
+        except ConnectionError:
+            self._writer = None  # client went away; keep running
+
+    async def run(self, scripts: Sequence[TestScript], writer: asyncio.StreamWriter | None = None) -> Run:
+        async with self._lock:
+            if not self.shared.connected:
+                logger.warning("browser disconnected; relaunching")
+                await self._stop_browser()
+                await self._start_browser()
+            self._writer = writer
+            try:
+                with self.shared.serving(self._provide) as opened:
+                    self.opened = opened
+                    run = await self.runner.run(scripts)
+                self.runs += 1
+                failed = sum(result.status == FAILED for result in run.results)
+                await self.emit({
+                    "event": "done",
+                    "run_id": run.run_id,
+                    "passed": sum(result.status == PASSED for result in run.results),
+                    "failed": failed,
+                })
+                return run
+            finally:
+                self._writer = None
+                self.opened = []
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(event: dict) -> None:
+            writer.write((json.dumps(event) + "\n").encode())
+            await writer.drain()
+
+        try:
+            line = await reader.readline()
+            if not line:
+                return  # a liveness probe
+            request = json.loads(line)
+            command = request.get("command")
+            if command == "run":
+                try:
+                    scripts = discover(request.get("tests") or ())
+                except FileNotFoundError as exc:
+                    await reply({"event": "error", "message": str(exc)})
+                    return
+                await self.run(scripts, writer)
+            elif command == "status":
+                await reply({
+                    "event": "status",
+                    "pid": os.getpid(),
+                    "runs": self.runs,
+                    "warm": self.pool.qsize(),
+                    "browser": self.shared.connected,
+                    "watching": self.watch is not None,
+                })
+            elif command == "stop":
+                await reply({"event": "stopping", "message": "daemon stopping"})
+                self._stopped.set()
+            else:
+                await reply({"event": "error", "message": f"unknown command {command!r}"})
+        except (ValueError, ConnectionError) as exc:
+            logger.debug("bad request: %s", exc)
+        finally:
+            writer.close()
+
+    # -- watch mode ------------------------------------------------------------
+
+    async def _watch(self) -> None:
+        before = source_mtimes()
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL_S)
+            after = source_mtimes()
+            if after == before:
+                continue
+            # Editors and formatters write in bursts; wait until the tree is quiet.
+            while True:
+                await asyncio.sleep(SETTLE_S)
+                latest = source_mtimes()
+                if latest == after:
+                    break
+                after = latest
+            changed = sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+            before = after
+            candidates = discover(self.watch or ())
+            selection = impact.select(candidates, changed, self.store.test_modules())
+            print(impact.render_selection(selection, len(candidates)), end="", flush=True)
+            if selection.scripts:
+                await self.run(selection.scripts)
+
+    async def serve(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        for path in (self.socket_path, port_path(self.socket_path)):
+            path.unlink(missing_ok=True)  # left behind by a daemon that did not shut down
+        await self._start_browser()
+        server, address = await start_server(self._handle, self.socket_path)
+        watcher = asyncio.create_task(self._watch(), name="daemon:watch") if self.watch is not None else None
+        print(f"harness daemon listening on {address}", flush=True)
+        try:
+            await self._stopped.wait()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+            server.close()
+            await server.wait_closed()
+            await self._stop_browser()
+            self.socket_path.unlink(missing_ok=True)
+            port_path(self.socket_path).unlink(missing_ok=True)
+
+
+def port_path(socket_path: Path) -> Path:
+    """Where a daemon without Unix sockets publishes its loopback port."""
+    return socket_path.with_suffix(".port")
+
+
+async def start_server(handle: Any, socket_path: Path) -> tuple[asyncio.AbstractServer, str]:
+    """Listen on ``socket_path``, or on a loopback port where Unix sockets are missing."""
+    if UNIX_SOCKETS:
+        return await asyncio.start_unix_server(handle, path=str(socket_path)), str(socket_path)
+    server = await asyncio.start_server(handle, LOOPBACK, 0)
+    port = server.sockets[0].getsockname()[1]
+    port_path(socket_path).write_text(str(port), encoding="utf-8")
+    return server, f"{LOOPBACK}:{port}"
+
+
+async def connect(socket_path: Path = SOCKET_PATH, **kwargs: Any) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open a connection to the daemon; ``OSError`` when none is listening."""
+    if UNIX_SOCKETS:
+        return await asyncio.open_unix_connection(str(socket_path), **kwargs)
+    try:
+        port = int(port_path(socket_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise ConnectionRefusedError(f"no daemon port in {port_path(socket_path)}") from exc
+    return await asyncio.open_connection(LOOPBACK, port, **kwargs)
+
+
+async def request(message: dict, socket_path: Path = SOCKET_PATH) -> AsyncIterator[dict]:
+    """Send one request to a running daemon and yield its events."""
+    reader, writer = await connect(socket_path, limit=LINE_LIMIT)
+    try:
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
+        async for line in reader:
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+
+async def running(socket_path: Path = SOCKET_PATH) -> bool:
+    try:
+        _, writer = await connect(socket_path)
+    except OSError:
+        return False
+    writer.close()
+    return True
@@ -0,0 +1,169 @@
+"""Flaky-test detection from run history, and the quarantine lane.
+
+For every script the last ``window`` results in the store give:
+
+- flip rate: status changes between consecutive runs / (runs - 1),
+- failure-mode entropy: Shannon entropy (bits) of how it fails, where the mode
+  is the exception type (``TimeoutError``, ``AssertionError``) or, for errors
+  without one, the number-generalised error headline,
+- duration coefficient of variation (stdev / mean).
+
+A script with enough history whose flip rate, failure-mode entropy or
+duration CV crosses its threshold is quarantined: ``run`` skips it in the
+default ``main`` lane and runs it only with ``--lane quarantine`` (or
+``all``). It is released once its window no longer looks flaky and its
+latest runs agree. Matrix results (``name[project]``) are tracked per
+project; a script quarantined under any project leaves the main lane.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import statistics
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .clusters import headline
+from .logs import normalize
+from .matrix import script_name
+from .runner import PASSED
+from .store import ResultStore
+
+WINDOW = 20
+MIN_RUNS = 5
+MAX_FLIP_RATE = 0.3
+MAX_MODE_ENTROPY = 1.0
+# Stdev as large as the mean: the script races its timeouts even when it passes.
+MAX_DURATION_CV = 1.0
+# Consecutive agreeing results required before a quarantined script is released.
+RELEASE_STREAK = 5
+
+LANES = ("main", "quarantine", "all")
+
+_EXCEPTION = re.compile(r"^(?:[\w.]+\.)?(\w+(?:Error|Exception|Timeout))\b")
+
+
+def failure_mode(error: str) -> str:
+    """Exception type of the error, else its headline with numbers generalised."""
+    for line in reversed(error.strip().splitlines()):
+        match = _EXCEPTION.match(line)
+        if match:
+            return match[1]
+    return re.sub(r"\d+", "N", normalize(headline(error)))
+
+
+def entropy(counts: Counter) -> float:
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    # One mode sums to -0.0.
+    return max(0.0, -sum(n / total * math.log2(n / total) for n in counts.values() if n))
+
+
+@dataclass
+class TestStats:
+    __test__ = False  # not a pytest test class
+
+    name: str
+    test_id: str
+    statuses: list[str]
+    modes: Counter = field(default_factory=Counter)
+    durations: list[float] = field(default_factory=list)
+
+    @property
+    def runs(self) -> int:
+        return len(self.statuses)
+
+    @property
+    def failures(self) -> int:
+        return sum(1 for status in self.statuses if status != PASSED)
+
+    @property
+    def flip_rate(self) -> float:
+        flips = sum(1 for a, b in zip(self.statuses, self.statuses[1:]) if a != b)
+        return flips / (self.runs - 1) if self.runs > 1 else 0.0
+
+    @property
+    def mode_entropy(self) -> float:
+        return entropy(self.modes)
+
+    @property
+    def duration_cv(self) -> float:
+        if len(self.durations) < 2 or not statistics.fmean(self.durations):
+            return 0.0
+        return statistics.stdev(self.durations) / statistics.fmean(self.durations)
+
+    @property
+    def reasons(self) -> list[str]:
+        if self.runs < MIN_RUNS:
+            return []
+        reasons = []
+        if self.flip_rate >= MAX_FLIP_RATE:
+            reasons.append(f"flip rate {self.flip_rate:.2f}")
+        if self.mode_entropy >= MAX_MODE_ENTROPY:
+            reasons.append(f"failure-mode entropy {self.mode_entropy:.2f} bits")
+        if self.duration_cv >= MAX_DURATION_CV:
+            reasons.append(f"duration CV {self.duration_cv:.2f}")
+        return reasons
+
+    @property
+    def flaky(self) -> bool:
+        return bool(self.reasons)
+
+    @property
+    def settled(self) -> bool:
+        """The latest ``RELEASE_STREAK`` results all agree."""
+        latest = self.statuses[-RELEASE_STREAK:]
+        return len(latest) == RELEASE_STREAK and len(set(latest)) == 1
+
+
+def analyze(store: ResultStore, window: int = WINDOW) -> list[TestStats]:
+    """Per-script history statistics, oldest result first within each script."""
+    stats: dict[str, TestStats] = {}
+    for row in reversed(store.recent_results(window)):
+        item = stats.setdefault(row["name"], TestStats(row["name"], row["test_id"], []))
+        item.statuses.append(row["status"])
+        if row["status"] != PASSED:
+            item.modes[failure_mode(row["error"])] += 1
+        if row["duration_ms"] is not None:
+            item.durations.append(row["duration_ms"])
+    return sorted(stats.values(), key=lambda s: s.name)
+
+
+def update_quarantine(store: ResultStore, stats: list[TestStats]) -> tuple[list[str], list[str]]:
+    """Quarantine newly flaky scripts and release settled ones; returns (added, released)."""
+    current = store.quarantined()
+    added, released = [], []
+    for item in stats:
+        if item.flaky and item.name not in current:
+            store.quarantine(item.name, "; ".join(item.reasons))
+            added.append(item.name)
+        elif item.name in current and not item.flaky and item.settled:
+            store.release(item.name)
+            released.append(item.name)
+    return added, released
+
+
+def select_lane(scripts: list, quarantined: set[str], lane: str) -> list:
+    quarantined = {script_name(name) for name in quarantined}
+    if lane == "main":
+        return [script for script in scripts if script.name not in quarantined]
+    if lane == "quarantine":
+        return [script for script in scripts if script.name in quarantined]
+    return list(scripts)
+
+
+def render_table(stats: list[TestStats], quarantined: set[str]) -> str:
+    lines = [
+        "| Test | Runs | Failures | Flip rate | Mode entropy | Duration CV | Modes | Lane |",
+        "|------|------|----------|-----------|--------------|-------------|-------|------|",
+    ]
+    for item in stats:
+        modes = ", ".join(f"{mode} ×{count}" for mode, count in item.modes.most_common(3))
+        lane = "quarantine" if item.name in quarantined else "main"
+        lines.append(
+            f"| {item.name} | {item.runs} | {item.failures} | {item.flip_rate:.2f} | {item.mode_entropy:.2f}"
+            f" | {item.duration_cv:.2f} | {modes.replace('|', '/')} | {lane} |"
+        )
+    return "\n".join(lines) + "\n"
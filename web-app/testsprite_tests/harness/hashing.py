@@ -0,0 +1,55 @@
+"""Content hashes shared by the results store and caches."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+from .config import WEB_APP_DIR
+
+# Inputs that define the app the suite runs against, relative to web-app/.
+APP_SOURCES = ("src", "public", "index.html", "package.json", "vite.config.ts",
+               "tailwind.config.cjs", "postcss.config.cjs")
+# The npm lockfile lives at the repository root, one level up.
+LOCKFILE = "package-lock.json"
+# Unit-test files live inside src/ but never reach the bundle.
+_TEST_DIRS = {"__tests__", "__mocks__"}
+_TEST_MARKERS = (".test.", ".spec.")
+
+
+def content_hash(data: str | bytes) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_app_file(path: Path) -> bool:
+    """False for unit-test sources and mocks kept next to app code."""
+    return not (_TEST_DIRS.intersection(path.parts) or any(m in path.name for m in _TEST_MARKERS))
+
+
+def tree_hash(paths: Iterable[Path], root: Path) -> str:
+    """Hash of the relative names and contents of the app files under ``paths``."""
+    digest = hashlib.sha256()
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(p for p in path.rglob("*") if p.is_file() and is_app_file(p))
+        elif path.is_file():
+            files.append(path)
+    for path in sorted(files):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def app_build_hash(web_app_dir: Path = WEB_APP_DIR) -> str:
+    """Hash of the app sources and lockfile.
+
+    The suite runs against the Vite dev server, which serves ``src/`` directly;
+    ``dist/`` is ignored because it is gitignored and usually stale, and a
+    stale build would keep the hash unchanged across source edits.
+    """
+    root = web_app_dir.parent
+    return tree_hash([web_app_dir / name for name in APP_SOURCES] + [root / LOCKFILE], root)
@@ -0,0 +1,154 @@
+"""Test-impact analysis: which TC scripts a source change can affect.
+
+``ImpactRecorder`` watches the requests every context makes. The Vite dev
+server serves each source module under its own URL, so the requests name the
+app files a script loaded (``src/...`` modules, ``public/`` assets such as
+locale files). The set is kept per script in the results store: replaced when
+the script passes, merged when it fails, since a failing run may have stopped
+early.
+
+``select`` maps changed files to scripts:
+
+- a changed TC script selects itself;
+- a changed ``src/`` or ``public/`` file selects the scripts that loaded it;
+- scripts with no recorded run are always selected, since their impact is unknown;
+- a change to a shared file (``SHARED_FILES``: app shell, router, build
+  config, dependencies, the harness itself but not its unit tests) selects
+  everything;
+- other files (docs, Jest tests, other packages) select nothing.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from .config import TEST_PATTERN, TESTS_DIR, WEB_APP_DIR
+from .hashing import is_app_file
+from .loader import TestScript
+from .runner import PASSED, Plugin, Run, TestResult
+from .store import ResultStore
+from .urls import module_for_url
+
+# Paths relative to web-app/. Changes here can affect every route.
+SHARED_FILES = frozenset({
+    "src/App.jsx",
+    "src/main.tsx",
+    "src/index.css",
+    "src/App.css",
+    "src/router/AppRouter.jsx",
+    "src/router/routeConfig.js",
+    "src/router/routeConfig.jsx",
+    "src/router/protectedRoutes.tsx",
+    "index.html",
+    "vite.config.ts",
+    "package.json",
+    "package-lock.json",
+    ".env",
+})
+SHARED_PREFIXES = ("testsprite_tests/harness/", "testsprite_tests/fixtures/")
+# Under SHARED_PREFIXES but never loaded by a script run.
+UNSHARED_PREFIXES = ("testsprite_tests/harness/tests/",)
+APP_DIRS = ("src", "public")
+
+_TESTS_PREFIX = TESTS_DIR.relative_to(WEB_APP_DIR).as_posix() + "/"
+
+
+def app_file(module: str, web_app_dir: Path = WEB_APP_DIR) -> str | None:
+    """web-app relative path of a served module, or ``None`` for non-files and deps."""
+    if module.startswith("src/"):
+        return module if (web_app_dir / module).is_file() else None
+    if (web_app_dir / "public" / module).is_file():
+        return f"public/{module}"
+    return None
+
+
+class ImpactRecorder(Plugin):
+    """Runner plugin recording the app files each script loads into the store."""
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        self.run_id = ""
+        self.urls: set[str] = set()
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self.urls = set()
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        context.on("request", lambda request: self.urls.add(request.url))
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        modules = {module_for_url(url) for url in self.urls} - {None}
+        files = {path for path in map(app_file, modules) if path}
+        if files:
+            self.store.record_modules(test.name, files, self.run_id, replace=result.status == PASSED)
+
+
+def changed_files(ref: str, web_app_dir: Path = WEB_APP_DIR) -> list[str]:
+    """web-app relative paths changed since ``ref``, uncommitted and untracked included."""
+    def git(*args: str) -> list[str]:
+        output = subprocess.run(
+            ["git", "-C", str(web_app_dir), *args], check=True, capture_output=True, text=True
+        ).stdout
+        return [line for line in output.splitlines() if line]
+
+    diff = git("diff", "--name-only", "--relative", ref)
+    untracked = git("ls-files", "--others", "--exclude-standard")
+    return sorted(set(diff) | set(untracked))
+
+
+@dataclass
+class Selection:
+    scripts: list[TestScript]
+    full: bool = False
+    reasons: dict[str, list[str]] = field(default_factory=dict)
+
+    def why(self, script: TestScript) -> list[str]:
+        return self.reasons.get(script.name, [])
+
+
+def select(scripts: Sequence[TestScript], changed: list[str], index: dict[str, set[str]]) -> Selection:
+    shared = [
+        path for path in changed
+        if path in SHARED_FILES or (
+            path.startswith(SHARED_PREFIXES) and not path.startswith(UNSHARED_PREFIXES) and not path.endswith(".md")
+        )
+    ]
+    if shared:
+        return Selection(list(scripts), full=True, reasons={s.name: shared for s in scripts})
+
+    changed_scripts = {
+        Path(path).stem for path in changed
+        if path.startswith(_TESTS_PREFIX) and Path(path).match(TEST_PATTERN)
+    }
+    changed_app = {
+        path for path in changed
+        if path.split("/", 1)[0] in APP_DIRS and is_app_file(Path(path))
+    }
+
+    reasons: dict[str, list[str]] = {}
+    for script in scripts:
+        if script.name in changed_scripts:
+            reasons[script.name] = [f"{_TESTS_PREFIX}{script.path.name}"]
+        elif script.name not in index:
+            reasons[script.name] = ["no recorded run"]
+        elif index[script.name] & changed_app:
+            reasons[script.name] = sorted(index[script.name] & changed_app)
+    return Selection([s for s in scripts if s.name in reasons], reasons=reasons)
+
+
+def render_selection(selection: Selection, total: int) -> str:
+    if selection.full:
+        shared = next(iter(selection.reasons.values()), [])
+        return f"shared files changed ({', '.join(shared)}): running all {total} scripts\n"
+    lines = [f"{len(selection.scripts)} of {total} scripts affected"]
+    for script in selection.scripts:
+        reasons = selection.why(script)
+        more = f" (+{len(reasons) - 3})" if len(reasons) > 3 else ""
+        lines.append(f"  {script.name}: {', '.join(reasons[:3])}{more}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,69 @@
+/**
+ * Evaluates a batch of DOM expectations against one synchronous view of the
+ * document and returns one outcome per expectation, in order.
+ *
+ * Text matching follows Playwright's text selectors: whitespace is collapsed,
+ * "exact" compares the whole text, otherwise a case-insensitive substring is
+ * enough. Of nested elements that match, only the innermost counts, so a
+ * wrapper div does not match on behalf of its label.
+ */
+(checks) => {
+  const normalize = (text) => (text || '').replace(/\s+/g, ' ').trim();
+  const isVisible = (el) => {
+    const rect = el.getBoundingClientRect();
+    if (!rect.width || !rect.height) return false;
+    if (el.checkVisibility) return el.checkVisibility({ visibilityProperty: true, opacityProperty: false });
+    return getComputedStyle(el).visibility !== 'hidden';
+  };
+
+  // Normalised text per element, computed once for every text expectation.
+  const texts = new Map();
+  const textOf = (el) => {
+    if (!texts.has(el)) texts.set(el, normalize(el.textContent));
+    return texts.get(el);
+  };
+  const matches = (el, check) => {
+    const text = textOf(el);
+    return check.exact ? text === check.text : text.toLowerCase().includes(check.text.toLowerCase());
+  };
+
+  const find = (check) => {
+    const scope = check.selector || '*';
+    const candidates = Array.from(document.querySelectorAll(scope));
+    if (check.text === undefined || check.text === null) return candidates;
+    const found = candidates.filter((el) => matches(el, check));
+    return found.filter((el) => !Array.from(el.children).some((child) => matches(child, check)));
+  };
+
+  return checks.map((check) => {
+    let found;
+    try {
+      found = find(check);
+    } catch (error) {
+      return { passed: false, actual: `invalid selector: ${error.message}` };
+    }
+    const visible = found.filter(isVisible);
+    switch (check.kind) {
+      case 'visible':
+        return {
+          passed: visible.length > 0,
+          actual: found.length ? `${found.length} matching, none visible` : 'no match',
+        };
+      case 'hidden':
+        return { passed: visible.length === 0, actual: `${visible.length} visible` };
+      case 'count': {
+        const passed = check.atLeast ? found.length >= check.count : found.length === check.count;
+        return { passed, actual: `${found.length} matching` };
+      }
+      case 'text': {
+        const actual = found.length ? textOf(found[0]) : null;
+        const expected = normalize(check.expected);
+        const passed = actual !== null
+          && (check.exact ? actual === expected : actual.toLowerCase().includes(expected.toLowerCase()));
+        return { passed, actual: actual === null ? 'no match' : JSON.stringify(actual.slice(0, 200)) };
+      }
+      default:
+        return { passed: false, actual: `unknown expectation ${check.kind}` };
+    }
+  });
+}
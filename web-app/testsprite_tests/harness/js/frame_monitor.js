@@ -0,0 +1,43 @@
+/**
+ * Frame-rate and long-task monitor, installed by the harness as an init script.
+ *
+ * Counts animation frames and collects longtask entries; the harness reads
+ * and resets the counters through window.__harnessFrameMonitor.drain().
+ */
+(() => {
+  if (window !== window.top || window.__harnessFrameMonitor) return;
+
+  let frames = 0;
+  let longTasks = 0;
+  let longTaskMs = 0;
+  let windowStart = performance.now();
+
+  const onFrame = () => {
+    frames += 1;
+    requestAnimationFrame(onFrame);
+  };
+  requestAnimationFrame(onFrame);
+
+  try {
+    new PerformanceObserver(list => {
+      list.getEntries().forEach(entry => {
+        longTasks += 1;
+        longTaskMs += entry.duration;
+      });
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (error) {
+    // Long task timing unsupported (non-Chromium engines).
+  }
+
+  window.__harnessFrameMonitor = {
+    drain() {
+      const now = performance.now();
+      const snapshot = { frames, long_tasks: longTasks, long_task_ms: longTaskMs, elapsed_ms: now - windowStart };
+      frames = 0;
+      longTasks = 0;
+      longTaskMs = 0;
+      windowStart = now;
+      return snapshot;
+    },
+  };
+})();
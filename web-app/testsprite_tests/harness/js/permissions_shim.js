@@ -0,0 +1,34 @@
+/**
+ * navigator.permissions shim, installed by the harness as an init script.
+ *
+ * Answers microphone and camera queries with "granted" and forwards every
+ * other query to the native implementation with the correct receiver, so
+ * callers never hit "Illegal invocation" from a detached query().
+ */
+(() => {
+  if (!window.Permissions || window.__harnessPermissionsShim) return;
+  window.__harnessPermissionsShim = true;
+
+  const GRANTED = new Set(window.__harnessGrantedPermissions || ['microphone', 'camera']);
+  const nativeQuery = Permissions.prototype.query;
+
+  const grantedStatus = name => {
+    const status = new EventTarget();
+    Object.defineProperties(status, {
+      name: { value: name, enumerable: true },
+      state: { value: 'granted', enumerable: true },
+    });
+    status.onchange = null;
+    return status;
+  };
+
+  function query(descriptor) {
+    if (descriptor && GRANTED.has(descriptor.name)) {
+      return Promise.resolve(grantedStatus(descriptor.name));
+    }
+    return nativeQuery.call(navigator.permissions, descriptor);
+  }
+
+  Permissions.prototype.query = query;
+  Object.defineProperty(navigator.permissions, 'query', { value: query, configurable: true, writable: true });
+})();
@@ -0,0 +1,98 @@
+/**
+ * React commit profiler, installed by the harness as a Playwright init script.
+ *
+ * Registers React's DevTools global hook before React loads (or wraps the
+ * existing one) and records every commit: its render duration and which
+ * components rendered. The harness reads and resets the buffer through
+ * window.__harnessReactProfiler.drain().
+ *
+ * Durations come from fiber.actualDuration, which React only fills in
+ * development and profiling builds - the dev server the suite runs against.
+ */
+(() => {
+  if (window !== window.top || window.__harnessReactProfiler) return;
+
+  const PERFORMED_WORK = 1;
+  // FunctionComponent, ClassComponent, ForwardRef, MemoComponent, SimpleMemoComponent
+  const COMPONENT_TAGS = new Set([0, 1, 11, 14, 15]);
+
+  let commits = 0;
+  let renders = 0;
+  let durations = [];
+  let components = {};
+
+  const nameOf = fiber => {
+    let type = fiber.type;
+    if (type && (fiber.tag === 11 || fiber.tag === 14)) {
+      type = type.render || type.type || type;
+    }
+    return (type && (type.displayName || type.name)) || 'Anonymous';
+  };
+
+  const recordCommit = root => {
+    const stack = [root.current];
+    while (stack.length) {
+      const fiber = stack.pop();
+      const alternate = fiber.alternate;
+      const flags = fiber.flags !== undefined ? fiber.flags : fiber.effectTag;
+      if (COMPONENT_TAGS.has(fiber.tag) && (alternate === null || flags & PERFORMED_WORK)) {
+        const name = nameOf(fiber);
+        components[name] = (components[name] || 0) + 1;
+        renders += 1;
+      }
+      // A subtree React bailed out of keeps the previous commit's child fibers.
+      if (fiber.child && (alternate === null || fiber.child !== alternate.child)) {
+        stack.push(fiber.child);
+      }
+      if (fiber.sibling) stack.push(fiber.sibling);
+    }
+    commits += 1;
+    durations.push(root.current.actualDuration || 0);
+  };
+
+  const onCommitFiberRoot = (rendererID, root) => {
+    try {
+      recordCommit(root);
+    } catch (error) {
+      // Profiling must never break the app under test.
+    }
+  };
+
+  const existing = window.__REACT_DEVTOOLS_GLOBAL_HOOK__;
+  if (existing) {
+    const original = existing.onCommitFiberRoot;
+    existing.onCommitFiberRoot = function (...args) {
+      onCommitFiberRoot(...args);
+      return original ? original.apply(this, args) : undefined;
+    };
+  } else {
+    const renderers = new Map();
+    let nextID = 0;
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+      renderers,
+      supportsFiber: true,
+      inject(renderer) {
+        nextID += 1;
+        renderers.set(nextID, renderer);
+        return nextID;
+      },
+      onScheduleFiberRoot() {},
+      onCommitFiberRoot,
+      onCommitFiberUnmount() {},
+      onPostCommitFiberRoot() {},
+      checkDCE() {},
+    };
+  }
+
+  window.__harnessReactProfiler = {
+    /** Return everything recorded since the previous drain and reset. */
+    drain() {
+      const snapshot = { commits, renders, durations, components };
+      commits = 0;
+      renders = 0;
+      durations = [];
+      components = {};
+      return snapshot;
+    },
+  };
+})();
@@ -0,0 +1,129 @@
+/**
+ * Speech recognition stand-in and response probe for voice assistant flows.
+ *
+ * Headless Chromium has no working speech service, so SpeechRecognition is
+ * replaced with an implementation that "hears" commands queued from the
+ * harness through window.__harnessVoice.say(text). The probe timestamps each
+ * delivered command and the app's first response to it - a speechSynthesis
+ * utterance or a toast from the voice assistant provider ("Voice command: ...")
+ * or the floating microphone ("Navigating to ...") - to measure
+ * command-to-response latency.
+ */
+(() => {
+  if (window !== window.top || window.__harnessVoice) return;
+
+  // Toast texts that answer a command; "Voice recognition started" does not.
+  const RESPONSES = ['Voice command', 'Navigating to', 'Ready to', 'Opening ', 'not recognized', 'Logging out', 'Dark mode'];
+  const queue = [];
+  const results = [];
+  const active = new Set();
+  let pending = null;
+
+  const respond = (via, text) => {
+    if (!pending) return;
+    results.push({
+      command: pending.command,
+      latency_ms: performance.now() - pending.at,
+      via,
+      response: String(text || '').slice(0, 200),
+    });
+    pending = null;
+  };
+
+  class HarnessSpeechRecognition extends EventTarget {
+    constructor() {
+      super();
+      this.lang = 'en-US';
+      this.continuous = false;
+      this.interimResults = false;
+      this.maxAlternatives = 1;
+      ['onstart', 'onresult', 'onerror', 'onend', 'onaudiostart', 'onspeechstart'].forEach(name => {
+        this[name] = null;
+      });
+    }
+
+    _fire(type, props = {}) {
+      const event = Object.assign(new Event(type), props);
+      const handler = this['on' + type];
+      if (typeof handler === 'function') handler.call(this, event);
+      this.dispatchEvent(event);
+    }
+
+    start() {
+      active.add(this);
+      setTimeout(() => {
+        this._fire('start');
+        deliver();
+      }, 0);
+    }
+
+    stop() {
+      if (!active.delete(this)) return;
+      setTimeout(() => this._fire('end'), 0);
+    }
+
+    abort() {
+      this.stop();
+    }
+
+    _hear(command) {
+      const alternative = { transcript: command, confidence: 0.95 };
+      const result = Object.assign([alternative], { isFinal: true });
+      pending = { command, at: performance.now() };
+      this._fire('result', { resultIndex: 0, results: [result] });
+      if (!this.continuous) this.stop();
+    }
+  }
+
+  const deliver = () => {
+    const recognition = active.values().next().value;
+    if (recognition && queue.length) recognition._hear(queue.shift());
+  };
+
+  window.SpeechRecognition = HarnessSpeechRecognition;
+  window.webkitSpeechRecognition = HarnessSpeechRecognition;
+
+  if (window.speechSynthesis) {
+    const speak = window.speechSynthesis.speak.bind(window.speechSynthesis);
+    window.speechSynthesis.speak = utterance => {
+      respond('speech', utterance && utterance.text);
+      return speak(utterance);
+    };
+  }
+
+  new MutationObserver(mutations => {
+    if (!pending) return;
+    for (const mutation of mutations) {
+      for (const node of mutation.addedNodes) {
+        const text = node.textContent || '';
+        if (RESPONSES.some(marker => text.includes(marker))) {
+          respond('toast', text);
+          return;
+        }
+      }
+    }
+  }).observe(document, { childList: true, subtree: true });
+
+  window.__harnessVoice = {
+    /** Queue a spoken command; delivered as soon as recognition is listening. */
+    say(command) {
+      queue.push(command);
+      deliver();
+    },
+    /** True while a delivered command has not been answered yet. */
+    isPending() {
+      return pending !== null || queue.length > 0;
+    },
+    isListening() {
+      return active.size > 0;
+    },
+    /** The most recently answered command, or null. */
+    last() {
+      return results.length ? results[results.length - 1] : null;
+    },
+    /** Answered commands since the previous drain. */
+    drain() {
+      return results.splice(0);
+    },
+  };
+})();
@@ -0,0 +1,61 @@
+/**
+ * WebSocket receive probe, installed by the harness as an init script.
+ *
+ * Wraps window.WebSocket so sockets whose URL contains
+ * window.__harnessWsProbeMatch (default "ws://localhost:8080") count the
+ * messages they receive and the delivery lag of each: receipt time minus the
+ * message's "timestamp" (epoch ms), which harness/ws_server.py sets to the
+ * scheduled send time. Only the timestamp is read, so the probe adds no
+ * parsing of its own to the app's handling.
+ *
+ * window.__harnessWsProbe.drain() returns and resets the counters.
+ */
+(() => {
+  if (window !== window.top || window.__harnessWsProbe) return;
+
+  const RealWebSocket = window.WebSocket;
+  const match = window.__harnessWsProbeMatch || 'ws://localhost:8080';
+  const MAX_LAG_SAMPLES = 20000;
+  const KEY = '"timestamp":';
+  const open = new Set();
+  let received = 0;
+  let lags = [];
+  let windowStart = performance.now();
+
+  const onMessage = event => {
+    received += 1;
+    if (lags.length >= MAX_LAG_SAMPLES || typeof event.data !== 'string') return;
+    const index = event.data.lastIndexOf(KEY);
+    const sentAt = index === -1 ? NaN : parseFloat(event.data.slice(index + KEY.length));
+    if (!Number.isNaN(sentAt)) lags.push(Date.now() - sentAt);
+  };
+
+  window.WebSocket = function WebSocket(url, protocols) {
+    const socket = new RealWebSocket(url, protocols);
+    if (String(url).includes(match)) {
+      socket.addEventListener('open', () => open.add(socket));
+      socket.addEventListener('close', () => open.delete(socket));
+      socket.addEventListener('message', onMessage);
+    }
+    return socket;
+  };
+  window.WebSocket.prototype = RealWebSocket.prototype;
+  Object.assign(window.WebSocket, { CONNECTING: 0, OPEN: 1, CLOSING: 2, CLOSED: 3 });
+
+  window.__harnessWsProbe = {
+    /** Messages received by open sockets and their lags since the previous drain. */
+    drain() {
+      const now = performance.now();
+      const snapshot = {
+        sockets: open.size,
+        received,
+        elapsed_ms: now - windowStart,
+        lags: lags.slice().sort((a, b) => a - b),
+      };
+      received = 0;
+      lags = [];
+      windowStart = now;
+      return snapshot;
+    },
+  };
+})();
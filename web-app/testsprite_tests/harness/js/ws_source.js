@@ -0,0 +1,170 @@
+/**
+ * Local WebSocket message source, installed by the harness as an init script.
+ *
+ * Used by the virtual clock flows, which need timers and sockets under the
+ * page's control; the real-time benchmark uses harness/ws_server.py instead.
+ *
+ * Replaces window.WebSocket for URLs containing window.__harnessWsSourceMatch
+ * (default "ws://localhost:8080") with an in-page socket that opens at once
+ * and emits websocketService messages at a configurable rate. Other URLs
+ * still get the real WebSocket.
+ *
+ * Messages are scheduled against wall-clock time, so when the main thread
+ * falls behind they arrive late and in bursts, as frames queued on a real
+ * socket would. The delivery lag of every message is recorded.
+ *
+ * Control: window.__harnessWsSource.setRate(msgPerSecond), .drain(),
+ * .setAccepting(bool), .drop(), .stats().
+ */
+(() => {
+  if (window !== window.top || window.__harnessWsSource) return;
+
+  const RealWebSocket = window.WebSocket;
+  const match = window.__harnessWsSourceMatch || 'ws://localhost:8080';
+  const MAX_LAG_SAMPLES = 20000;
+  const sockets = new Set();
+  const sent = {};
+  let connects = 0;
+  let accepting = true;
+
+  class SourceSocket extends EventTarget {
+    constructor(url, protocols) {
+      super();
+      this.url = String(url);
+      this.protocol = Array.isArray(protocols) ? protocols[0] || '' : protocols || '';
+      this.extensions = '';
+      this.binaryType = 'blob';
+      this.bufferedAmount = 0;
+      this.readyState = SourceSocket.CONNECTING;
+      this.onopen = null;
+      this.onmessage = null;
+      this.onclose = null;
+      this.onerror = null;
+      connects += 1;
+      setTimeout(() => {
+        if (this.readyState !== SourceSocket.CONNECTING) return;
+        if (!accepting) {
+          this._fire('error', new Event('error'));
+          this._abort();
+          return;
+        }
+        this.readyState = SourceSocket.OPEN;
+        sockets.add(this);
+        this._fire('open', new Event('open'));
+      }, 0);
+    }
+
+    _fire(type, event) {
+      const handler = this['on' + type];
+      if (typeof handler === 'function') handler.call(this, event);
+      this.dispatchEvent(event);
+    }
+
+    send(data) {
+      if (this.readyState !== SourceSocket.OPEN) return;
+      try {
+        const message = JSON.parse(data);
+        sent[message.type] = (sent[message.type] || 0) + 1;
+        if (message.type === 'HEARTBEAT') {
+          this.receive({ type: 'HEARTBEAT', timestamp: Date.now() });
+        }
+      } catch (error) {
+        // Non-JSON frames are accepted and dropped.
+      }
+    }
+
+    receive(message) {
+      this._fire('message', new MessageEvent('message', { data: JSON.stringify(message) }));
+    }
+
+    close(code = 1000, reason = '') {
+      if (this.readyState >= SourceSocket.CLOSING) return;
+      this.readyState = SourceSocket.CLOSED;
+      sockets.delete(this);
+      this._fire('close', new CloseEvent('close', { code, reason, wasClean: true }));
+    }
+
+    /** Close as if the connection was lost (code 1006, not clean). */
+    _abort() {
+      this.readyState = SourceSocket.CLOSED;
+      sockets.delete(this);
+      this._fire('close', new CloseEvent('close', { code: 1006, reason: '', wasClean: false }));
+    }
+  }
+  Object.assign(SourceSocket, { CONNECTING: 0, OPEN: 1, CLOSING: 2, CLOSED: 3 });
+  Object.assign(SourceSocket.prototype, { CONNECTING: 0, OPEN: 1, CLOSING: 2, CLOSED: 3 });
+
+  window.WebSocket = function WebSocket(url, protocols) {
+    if (String(url).includes(match)) return new SourceSocket(url, protocols);
+    return new RealWebSocket(url, protocols);
+  };
+  window.WebSocket.prototype = RealWebSocket.prototype;
+  Object.assign(window.WebSocket, { CONNECTING: 0, OPEN: 1, CLOSING: 2, CLOSED: 3 });
+
+  let rate = 0;
+  let startedAt = 0;
+  let scheduled = 0;
+  let delivered = 0;
+  let windowStart = performance.now();
+  let lags = [];
+  let timer = null;
+
+  const makeMessage = seq =>
+    seq % 2
+      ? { type: 'DASHBOARD_UPDATE', payload: { metric: 'revenue', value: seq, seq }, timestamp: Date.now() }
+      : { type: 'REAL_TIME_DATA', payload: { type: 'metrics', metrics: { activeUsers: seq % 500, seq } }, timestamp: Date.now() };
+
+  const tick = () => {
+    timer = null;
+    if (!rate) return;
+    const now = performance.now();
+    const due = Math.floor(((now - startedAt) * rate) / 1000);
+    for (; scheduled < due; scheduled += 1) {
+      // With no open socket the message is lost, not delivered.
+      if (!sockets.size) continue;
+      const message = makeMessage(scheduled);
+      sockets.forEach(socket => socket.receive(message));
+      delivered += 1;
+      if (lags.length < MAX_LAG_SAMPLES) {
+        lags.push(performance.now() - (startedAt + (scheduled * 1000) / rate));
+      }
+    }
+    timer = setTimeout(tick, 0);
+  };
+
+  window.__harnessWsSource = {
+    /** Emit msgPerSecond messages per second to every open source socket. */
+    setRate(msgPerSecond) {
+      rate = msgPerSecond;
+      startedAt = performance.now();
+      scheduled = 0;
+      if (rate && timer === null) timer = setTimeout(tick, 0);
+    },
+    /** Refuse (false) or accept (true) new connections. */
+    setAccepting(value) {
+      accepting = Boolean(value);
+    },
+    /** Drop every open connection uncleanly, as a network failure would. */
+    drop() {
+      Array.from(sockets).forEach(socket => socket._abort());
+    },
+    /** Connection attempts, open sockets and client messages sent by type. */
+    stats() {
+      return { connects, open: sockets.size, sent: { ...sent } };
+    },
+    /** Delivery statistics since the previous drain. */
+    drain() {
+      const now = performance.now();
+      const snapshot = {
+        sockets: sockets.size,
+        delivered,
+        elapsed_ms: now - windowStart,
+        lags: lags.slice().sort((a, b) => a - b),
+      };
+      delivered = 0;
+      lags = [];
+      windowStart = now;
+      return snapshot;
+    },
+  };
+})();
@@ -0,0 +1,101 @@
+"""Discovery and import of the generated TC scripts.
+
+Every script ends with a top-level ``asyncio.run(run_test())``, so importing it
+normally would execute the test. The loader compiles the script with that
+statement removed and hands back the ``run_test`` coroutine function instead.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable
+
+from .config import TEST_PATTERN, TESTS_DIR
+
+_TEST_ID_RE = re.compile(r"^(TC\d+)")
+
+
+@dataclass
+class TestScript:
+    """A generated test script on disk."""
+
+    __test__ = False  # keep pytest from collecting this class
+
+    path: Path
+
+    @property
+    def name(self) -> str:
+        """File stem, unique across the suite (e.g. ``TC004_Global_Mock_...``)."""
+        return self.path.stem
+
+    @property
+    def test_id(self) -> str:
+        """TestSprite case id (e.g. ``TC004``); several scripts may share one."""
+        match = _TEST_ID_RE.match(self.name)
+        return match.group(1) if match else self.name
+
+    @property
+    def title(self) -> str:
+        """Human readable title derived from the file name."""
+        return self.name[len(self.test_id):].strip("_").replace("_", " ")
+
+    def source(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+
+def discover(
+    selectors: Iterable[str] = (),
+    tests_dir: Path = TESTS_DIR,
+) -> list[TestScript]:
+    """Return the scripts in ``tests_dir`` sorted by name.
+
+    ``selectors`` may contain test ids (``TC004``), file stems or paths; when
+    empty, every script matching ``TEST_PATTERN`` is returned.
+    """
+    scripts = [TestScript(p) for p in sorted(tests_dir.glob(TEST_PATTERN))]
+    selectors = list(selectors)
+    if not selectors:
+        return scripts
+
+    selected = []
+    for selector in selectors:
+        stem = Path(selector).stem
+        matches = [s for s in scripts if s.name == stem or s.test_id == stem]
+        if not matches:
+            raise FileNotFoundError(f"No test script matches {selector!r}")
+        selected.extend(m for m in matches if m not in selected)
+    return selected
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    """True for a top-level ``asyncio.run(...)`` expression statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def parse_program(script: TestScript) -> ast.Module:
+    """The script's syntax tree without its entrypoint."""
+    tree = ast.parse(script.source(), filename=str(script.path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+    return tree
+
+
+def load_run_test(script: TestScript) -> Callable[[], Awaitable[None]]:
+    """Compile ``script`` without its entrypoint and return ``run_test``."""
+    tree = parse_program(script)
+    namespace = {"__name__": f"testsprite_{script.name}", "__file__": str(script.path)}
+    exec(compile(tree, str(script.path), "exec"), namespace)
+    try:
+        return namespace["run_test"]
+    except KeyError:
+        raise ValueError(f"{script.path.name} does not define run_test()") from None
@@ -0,0 +1,96 @@
+"""Browser console log normalisation and fingerprinting.
+
+TestSprite appends the page's console output to every ``testError``:
+
+    Browser Console Logs:
+    [WARNING] Multiple GoTrueClient instances detected ... (at http://localhost:3001/node_modules/.vite/deps/x.js?v=1e760f70:5142:14)
+    [ERROR] Could not check microphone permission: TypeError: ...
+        at http://localhost:3001/src/providers/VoiceAssistantProvider.jsx?t=1754018894162:311:56
+
+Most of those messages are identical across tests apart from volatile parts:
+Vite's ``?v=`` dependency hashes and ``?t=`` HMR timestamps, line and column
+numbers, the dev server origin and the ``@fs/<checkout path>/`` prefix.
+``normalize`` strips them so the same message always has the same
+``fingerprint``; the results store keeps each fingerprint once and results
+only reference it with a count.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+CONSOLE_HEADER = "Browser Console Logs:"
+
+_ENTRY_START = re.compile(r"^\[(?P<level>[A-Z]+)\] ")
+_VOLATILE = (
+    (re.compile(r"\?(?:v=[0-9a-f]+|t=\d+)"), ""),
+    (re.compile(r"https?://(?:localhost|127\.0\.0\.1|\[::1\]):\d+/(?:@fs/.*?/(?=node_modules/|src/))?"), "/"),
+    # Source positions only after a script file name, so times and ports in the text survive.
+    (re.compile(r"(\.(?:[cm]?js|jsx|tsx?))(?::\d+){1,2}\b"), r"\1"),
+)
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    level: str
+    text: str
+
+    @property
+    def message(self) -> str:
+        return normalize(self.text)
+
+    @property
+    def fingerprint(self) -> str:
+        return fingerprint(self.level, self.message)
+
+
+def normalize(text: str) -> str:
+    """Message with origins, version hashes, timestamps and positions removed."""
+    for pattern, replacement in _VOLATILE:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def fingerprint(level: str, message: str) -> str:
+    return hashlib.sha1(f"{level}\0{message}".encode("utf-8")).hexdigest()[:16]
+
+
+def parse(lines: Iterable[str]) -> list[LogEntry]:
+    """Entries of a TestSprite console dump; indented lines continue the previous entry."""
+    entries: list[tuple[str, list[str]]] = []
+    for line in lines:
+        match = _ENTRY_START.match(line)
+        if match:
+            entries.append((match["level"], [line[match.end():]]))
+        elif entries and line.strip():
+            entries[-1][1].append(line)
+    return [LogEntry(level, "\n".join(text)) for level, text in entries]
+
+
+def split_error(error: str) -> tuple[str, list[LogEntry]]:
+    """Split a TestSprite ``testError`` into its own text and the console entries."""
+    head, found, tail = error.partition(f"\n{CONSOLE_HEADER}\n")
+    if not found:
+        return error, []
+    return head, parse(tail.splitlines())
+
+
+def join_error(head: str, entries: Iterable[tuple[str, str]]) -> str:
+    """Inverse of ``split_error`` for ``(level, text)`` pairs."""
+    lines = [f"[{level}] {text}" for level, text in entries]
+    if not lines:
+        return head
+    return f"{head}\n{CONSOLE_HEADER}\n" + "\n".join(lines)
+
+
+def count(entries: Iterable[LogEntry]) -> dict[str, tuple[LogEntry, int]]:
+    """Fingerprint -> (first entry seen, occurrences), in first-seen order."""
+    counts: dict[str, tuple[LogEntry, int]] = {}
+    for entry in entries:
+        key = entry.fingerprint
+        first, seen = counts.get(key, (entry, 0))
+        counts[key] = (first, seen + 1)
+    return counts
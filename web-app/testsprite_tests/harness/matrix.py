@@ -0,0 +1,207 @@
+"""Browser and device matrix for the TC scripts.
+
+``web-app/playwright.config.js`` defines seven projects; the scripts only ever
+launch Chromium at 1280x720. ``run_matrix`` runs the same scripts under any
+of those projects (``PROJECTS``):
+
+- one shared browser per engine and channel, launched once on one driver.
+  Chromium and Pixel 5 share a Chromium, WebKit and iPhone 12 a WebKit;
+- one lane per project, each a ``Runner`` working through the scripts in
+  order. Lanes run concurrently, so contexts from every engine are open at
+  the same time and no engine waits for another;
+- the script's ``chromium.launch()`` resolves to the lane's browser, and its
+  ``new_context()`` to a context with the project's device descriptor
+  (viewport, user agent, touch, scale factor).
+
+Results are named ``<script>[<project>]`` (``TC004_...[mobile-safari]``), so
+each project has its own history for flakiness, durations and timeouts.
+``metrics["project"]`` holds the project. All lanes write into one run, which
+the lanes' plugins finish together once the last lane is done. A project
+whose browser cannot be
+launched, e.g. a branded channel that is not installed, is reported and
+skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from .loader import TestScript
+from .runner import PASSED, Plugin, Run, Runner, TestResult
+from .session import SharedBrowser, close_all, redirected
+from .watchdog import Watchdog
+
+logger = logging.getLogger("harness.matrix")
+
+
+@dataclass(frozen=True)
+class Project:
+    name: str  # as in playwright.config.js
+    engine: str
+    device: str  # Playwright device descriptor
+    channel: str | None = None
+
+    @property
+    def slug(self) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", self.name.lower()).strip("-")
+
+    @property
+    def browser_key(self) -> tuple[str, str | None]:
+        return self.engine, self.channel
+
+
+PROJECTS = (
+    Project("chromium", "chromium", "Desktop Chrome"),
+    Project("firefox", "firefox", "Desktop Firefox"),
+    Project("webkit", "webkit", "Desktop Safari"),
+    Project("Mobile Chrome", "chromium", "Pixel 5"),
+    Project("Mobile Safari", "webkit", "iPhone 12"),
+    Project("Microsoft Edge", "chromium", "Desktop Edge", "msedge"),
+    Project("Google Chrome", "chromium", "Desktop Chrome", "chrome"),
+)
+
+
+def get_projects(names: Sequence[str]) -> list[Project]:
+    """Projects by name or slug (``mobile-safari``), in the given order; ``all`` selects every one."""
+    if "all" in names:
+        return list(PROJECTS)
+    by_key = {key: project for project in PROJECTS for key in (project.name.lower(), project.slug)}
+    selected = []
+    for name in names:
+        project = by_key.get(name.lower())
+        if project is None:
+            raise ValueError(f"Unknown project {name!r}; choose from {', '.join(p.slug for p in PROJECTS)}, all")
+        if project not in selected:
+            selected.append(project)
+    return selected
+
+
+def tagged(name: str, project: Project) -> str:
+    return f"{name}[{project.slug}]"
+
+
+def script_name(name: str) -> str:
+    """The script a result name refers to, without its project tag."""
+    return name.split("[", 1)[0]
+
+
+def device_options(playwright: Any, project: Project) -> dict[str, Any]:
+    options = dict(playwright.devices[project.device])
+    options.pop("default_browser_type", None)
+    return options
+
+
+class ProjectPlugin(Plugin):
+    """Serves a lane's contexts with the project's device and tags its results.
+
+    Comes first in the lane's plugins so the results are recorded under the
+    tagged name.
+    """
+
+    def __init__(self, project: Project, shared: SharedBrowser):
+        self.project = project
+        self.shared = shared
+        self.options = device_options(shared.playwright, project)
+        self.contexts: list[Any] = []
+        self.opened: list[Any] = []
+
+    async def provide(self) -> Any:
+        context = await self.shared.new_context(**self.options)
+        self.contexts.append(context)
+        return context
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        await close_all(self.contexts + self.opened)
+        self.contexts.clear()
+        self.opened.clear()
+        result.name = tagged(result.name, self.project)
+        result.metrics["project"] = self.project.slug
+
+
+@dataclass
+class Matrix:
+    run: Run
+    projects: list[Project]
+    unavailable: dict[str, str] = field(default_factory=dict)  # project slug -> launch error
+
+
+async def run_matrix(
+    scripts: Sequence[TestScript],
+    projects: Sequence[Project],
+    lane_plugins: Callable[[Project], list[Plugin]] = lambda project: [],
+    watchdog: Watchdog | None = None,
+) -> Matrix:
+    """Run ``scripts`` once per project, all projects concurrently, into one run.
+
+    ``lane_plugins`` builds each lane's own plugins; plugins keep per-test
+    state, so lanes cannot share instances.
+    """
+    from playwright import async_api
+
+    matrix = Matrix(Run(), list(projects))
+    async with async_api.async_playwright() as playwright:
+        browsers: dict[tuple[str, str | None], SharedBrowser] = {}
+        for project in projects:
+            if project.browser_key in browsers:
+                continue
+            options = {"headless": True} | ({"channel": project.channel} if project.channel else {})
+            shared = SharedBrowser(options, project.engine)
+            try:
+                await shared.start(playwright)
+            except async_api.Error as exc:
+                logger.warning("%s: %s", project.slug, str(exc).splitlines()[0])
+                continue
+            browsers[project.browser_key] = shared
+        for project in projects:
+            if project.browser_key not in browsers:
+                matrix.unavailable[project.slug] = f"could not launch {project.channel or project.engine}"
+        lanes = [project for project in projects if project.browser_key in browsers]
+        runners: list[Runner] = []
+
+        async def lane(project: Project) -> None:
+            tagger = ProjectPlugin(project, browsers[project.browser_key])
+            runner = Runner([tagger, *lane_plugins(project)], watchdog)
+            runners.append(runner)
+            await runner.start(matrix.run)
+            with tagger.shared.serving(tagger.provide) as opened:
+                tagger.opened = opened
+                for script in scripts:
+                    matrix.run.results.append(await runner.run_one(script))
+
+        try:
+            # Installed before any lane instruments a test, so runner patches wrap these.
+            with redirected():
+                await asyncio.gather(*(lane(project) for project in lanes))
+        finally:
+            # The lanes share one run: it ends only when the last lane is done.
+            for runner in runners:
+                await runner.finish(matrix.run)
+            for shared in browsers.values():
+                await shared.stop()
+    return matrix
+
+
+def render_table(matrix: Matrix) -> str:
+    """Status and duration per script (rows) and project (columns)."""
+    slugs = [project.slug for project in matrix.projects]
+    cells: dict[str, dict[str, str]] = {}
+    for result in matrix.run.results:
+        project = result.metrics.get("project")
+        mark = "ok" if result.status == PASSED else "FAIL"
+        cells.setdefault(script_name(result.name), {})[project] = f"{mark} {result.duration_ms / 1000:.1f}s"
+    width = max([len(name) for name in cells] + [6])
+    columns = {slug: max(len(slug), 11) for slug in slugs}
+    lines = ["script".ljust(width) + "  " + "  ".join(slug.ljust(columns[slug]) for slug in slugs)]
+    for name in sorted(cells):
+        row = [
+            cells[name].get(slug, "skipped" if slug in matrix.unavailable else "-").ljust(columns[slug])
+            for slug in slugs
+        ]
+        lines.append(name.ljust(width) + "  " + "  ".join(row))
+    for slug, reason in matrix.unavailable.items():
+        lines.append(f"{slug}: {reason}")
+    return "\n".join(line.rstrip() for line in lines) + "\n"
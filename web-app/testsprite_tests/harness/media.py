@@ -0,0 +1,102 @@
+"""Fake microphone input and voice command helpers.
+
+Chromium's fake capture device plays a WAV file as microphone input. Recorded
+fixtures go in ``fixtures/audio/`` next to the TC scripts; when none is given
+a short tone is generated so ``getUserMedia`` always has a device to open.
+
+Speech recognition itself is replaced in the page by ``js/voice_probe.js``;
+``say`` feeds it a command and returns the command-to-response latency.
+``fixtures/audio/commands.json`` lists the commands spoken per test id, which
+``run_commands`` delivers through the app's floating microphone button.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+import wave
+from pathlib import Path
+from typing import Any
+
+from .config import OUTPUT_DIR, TESTS_DIR
+
+FIXTURES_DIR = TESTS_DIR / "fixtures" / "audio"
+TONE_FIXTURE = OUTPUT_DIR / "media" / "tone.wav"
+COMMANDS_FIXTURE = FIXTURES_DIR / "commands.json"
+# FloatingMicrophone's button while it is not listening.
+MIC_BUTTON = 'button[title^="Start Voice Command"]'
+
+# Launch flags for Chromium's fake media stream; the WAV path is appended.
+FAKE_MEDIA_ARGS = [
+    "--use-fake-ui-for-media-stream",
+    "--use-fake-device-for-media-stream",
+]
+
+
+def write_tone(path: Path, seconds: float = 1.0, frequency: float = 440.0, rate: int = 16000) -> Path:
+    """Write a mono 16-bit sine tone to ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frames = b"".join(
+        struct.pack("<h", int(12000 * math.sin(2 * math.pi * frequency * i / rate)))
+        for i in range(int(seconds * rate))
+    )
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(frames)
+    return path
+
+
+def resolve_fixture(name: str | None = None) -> Path:
+    """Path of a WAV fixture by file name, generating the default tone if needed."""
+    if name:
+        path = Path(name) if Path(name).is_absolute() else FIXTURES_DIR / name
+        if not path.exists():
+            raise FileNotFoundError(f"Audio fixture not found: {path}")
+        return path
+    if not TONE_FIXTURE.exists():
+        write_tone(TONE_FIXTURE)
+    return TONE_FIXTURE
+
+
+def fake_media_args(fixture: str | None = None) -> list[str]:
+    wav = resolve_fixture(fixture)
+    return FAKE_MEDIA_ARGS + [f"--use-file-for-fake-audio-capture={wav}"]
+
+
+def load_commands(path: Path = COMMANDS_FIXTURE) -> dict[str, list[str]]:
+    """Voice commands by test id; empty when the fixture is missing."""
+    if not path.exists():
+        return {}
+    return {test_id: list(commands) for test_id, commands in json.loads(path.read_text(encoding="utf-8")).items()}
+
+
+async def say(page: Any, command: str, timeout_ms: float = 10_000, trigger: str | None = None) -> float:
+    """Speak ``command`` to the voice assistant and wait for its response.
+
+    The command is delivered when the app starts recognition; ``trigger`` is a
+    selector clicked to start it. Returns the latency in milliseconds from
+    delivery to the first spoken or toast response.
+    """
+    await page.evaluate("command => window.__harnessVoice.say(command)", command)
+    if trigger:
+        await page.click(trigger, timeout=timeout_ms)
+    await page.wait_for_function("() => !window.__harnessVoice.isPending()", timeout=timeout_ms)
+    result = await page.evaluate("() => window.__harnessVoice.last()")
+    return result["latency_ms"]
+
+
+async def run_commands(page: Any, commands: list[str], trigger: str = MIC_BUTTON,
+                       timeout_ms: float = 10_000) -> list[float]:
+    """Say each command in turn through ``trigger``; latencies in milliseconds."""
+    return [await say(page, command, timeout_ms, trigger) for command in commands]
+
+
+async def drain_latencies(page: Any) -> list[dict]:
+    """Answered commands recorded on ``page`` since the previous drain."""
+    try:
+        return await page.evaluate("() => window.__harnessVoice ? window.__harnessVoice.drain() : []")
+    except Exception:
+        return []
@@ -0,0 +1,119 @@
+"""React commit profiling for E2E flows.
+
+``ReactProfiler`` injects ``js/react_profiler.js`` into every context, which
+hooks React's DevTools global hook and counts commits, commit time and the
+components rendered. The buffer is drained at the start of every step, so each
+step is charged with the commits it caused up to the next action.
+
+Commits still buffered when a click triggers a full document navigation are
+lost with the old document; SPA route changes are unaffected.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from .config import JS_DIR, OUTPUT_DIR
+from .loader import TestScript
+from .runner import Plugin, Step, TestResult
+
+logger = logging.getLogger("harness.profiler")
+
+PROFILER_SCRIPT = JS_DIR / "react_profiler.js"
+PROFILE_DIR = OUTPUT_DIR / "react"
+
+_DRAIN = "() => window.__harnessReactProfiler ? window.__harnessReactProfiler.drain() : null"
+
+
+async def install(context: Any) -> None:
+    """Inject the commit recorder into every page of ``context``."""
+    await context.add_init_script(path=str(PROFILER_SCRIPT))
+
+
+async def drain(page: Any) -> dict | None:
+    """Commits recorded on ``page`` since the previous drain, or ``None``."""
+    try:
+        return await page.evaluate(_DRAIN)
+    except Exception:
+        # Page closed or navigating; whatever it buffered is gone.
+        logger.debug("drain failed on %s", getattr(page, "url", page), exc_info=True)
+        return None
+
+
+class StepProfile:
+    """Commits accumulated for one step."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.commits = 0
+        self.renders = 0
+        self.durations: list[float] = []
+        self.components: Counter[str] = Counter()
+
+    def add(self, snapshot: dict | None) -> None:
+        if not snapshot:
+            return
+        self.commits += snapshot["commits"]
+        self.renders += snapshot["renders"]
+        self.durations.extend(snapshot["durations"])
+        self.components.update(snapshot["components"])
+
+    def as_dict(self, top: int = 5) -> dict:
+        return {
+            "step": self.key,
+            "commits": self.commits,
+            "renders": self.renders,
+            "commit_ms": round(sum(self.durations), 2),
+            "max_commit_ms": round(max(self.durations, default=0.0), 2),
+            "top_components": self.components.most_common(top),
+        }
+
+
+class ReactProfiler(Plugin):
+    """Runner plugin attaching a render count and commit time to every step."""
+
+    def __init__(self, output_dir: Path = PROFILE_DIR):
+        self.output_dir = output_dir
+        self._contexts: list[Any] = []
+        self._profiles: list[StepProfile] = []
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self._contexts, self._profiles = [], []
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        await install(context)
+        self._contexts.append(context)
+
+    async def _collect(self) -> None:
+        if not self._profiles:
+            return
+        for context in self._contexts:
+            for page in context.pages:
+                self._profiles[-1].add(await drain(page))
+
+    async def on_step_start(self, test: TestScript, step: Step) -> None:
+        await self._collect()
+        self._profiles.append(StepProfile(step.key))
+
+    async def on_context_close(self, test: TestScript, context: Any) -> None:
+        await self._collect()
+        if context in self._contexts:
+            self._contexts.remove(context)
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        await self._collect()
+        steps = [profile.as_dict() for profile in self._profiles]
+        result.metrics["react"] = {
+            "commits": sum(s["commits"] for s in steps),
+            "renders": sum(s["renders"] for s in steps),
+            "commit_ms": round(sum(s["commit_ms"] for s in steps), 2),
+            "steps": steps,
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / f"{test.name}.json").write_text(
+            json.dumps(result.metrics["react"], indent=2), encoding="utf-8"
+        )
@@ -0,0 +1,115 @@
+"""Browser launch profiles applied to the TC scripts by the runner.
+
+A profile bundles Chromium flags, context options and init scripts. The
+scripts hardcode their own launch arguments; ``ProfilePlugin`` rewrites them
+at launch time so a profile applies without editing the scripts. A profile may
+also carry voice commands to speak at the end of a script, by test id.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from . import media
+from .config import JS_DIR, LAUNCH_ARGS
+from .loader import TestScript
+from .runner import Plugin, TestResult
+
+logger = logging.getLogger("harness.profiles")
+
+
+@dataclass
+class LaunchProfile:
+    name: str
+    description: str = ""
+    args: list[str] = field(default_factory=lambda: list(LAUNCH_ARGS))
+    launch_options: dict[str, Any] = field(default_factory=dict)
+    context_options: dict[str, Any] = field(default_factory=dict)
+    init_scripts: list[Path] = field(default_factory=list)
+    voice_commands: dict[str, list[str]] = field(default_factory=dict)
+
+
+def default_profile() -> LaunchProfile:
+    return LaunchProfile("default", "arguments hardcoded in the generated scripts")
+
+
+def fake_media_profile(fixture: str | None = None) -> LaunchProfile:
+    """Fake microphone fed by a WAV fixture, mic permission granted up front."""
+    return LaunchProfile(
+        "fake-media",
+        "Chromium fake media device, granted microphone, permissions shim, speech stand-in",
+        args=LAUNCH_ARGS + media.fake_media_args(fixture),
+        context_options={"permissions": ["microphone"]},
+        init_scripts=[JS_DIR / "permissions_shim.js", JS_DIR / "voice_probe.js"],
+        voice_commands=media.load_commands(),
+    )
+
+
+PROFILES: dict[str, Callable[[], LaunchProfile]] = {
+    "default": default_profile,
+    "fake-media": fake_media_profile,
+}
+
+
+def get_profile(name: str) -> LaunchProfile:
+    try:
+        return PROFILES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown launch profile {name!r}; choose from {', '.join(PROFILES)}") from None
+
+
+def _merge_args(script_args: list[str], profile_args: list[str]) -> list[str]:
+    """Profile flags win over script flags with the same switch name."""
+    switches = {arg.split("=", 1)[0] for arg in profile_args}
+    kept = [arg for arg in script_args if arg.split("=", 1)[0] not in switches]
+    return kept + [arg for arg in profile_args if arg not in kept]
+
+
+class ProfilePlugin(Plugin):
+    """Runner plugin applying a ``LaunchProfile`` to every script."""
+
+    def __init__(self, profile: LaunchProfile):
+        self.profile = profile
+        self._voice: list[dict] = []
+
+    def configure_launch(self, test: TestScript, options: dict[str, Any]) -> None:
+        options["args"] = _merge_args(list(options.get("args") or []), self.profile.args)
+        options.update(self.profile.launch_options)
+
+    def configure_context(self, test: TestScript, options: dict[str, Any]) -> None:
+        for key, value in self.profile.context_options.items():
+            if key == "permissions":
+                options[key] = sorted(set(options.get(key) or []) | set(value))
+            else:
+                options.setdefault(key, value)
+
+    async def on_test_start(self, test: TestScript) -> None:
+        self._voice = []
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        for script in self.profile.init_scripts:
+            await context.add_init_script(path=str(script))
+
+    async def on_context_close(self, test: TestScript, context: Any) -> None:
+        commands = self.profile.voice_commands.get(test.test_id)
+        if commands and context.pages:
+            try:
+                await media.run_commands(context.pages[-1], commands)
+            except Exception:
+                logger.debug("voice commands for %s failed", test.name, exc_info=True)
+        if JS_DIR / "voice_probe.js" in self.profile.init_scripts:
+            for page in context.pages:
+                self._voice.extend(await media.drain_latencies(page))
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        result.metrics["profile"] = self.profile.name
+        if self._voice:
+            latencies = sorted(c["latency_ms"] for c in self._voice)
+            result.metrics["voice"] = {
+                "commands": self._voice,
+                "median_latency_ms": round(latencies[len(latencies) // 2], 1),
+                "max_latency_ms": round(latencies[-1], 1),
+            }
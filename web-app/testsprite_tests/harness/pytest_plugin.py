@@ -0,0 +1,132 @@
+"""pytest plugin collecting the TC scripts as tests.
+
+``TC*.py`` files are collected by the plugin rather than imported: each file
+yields one ``run_test`` item whose ``run_test`` coroutine comes from
+``load_run_test``, so the script's ``asyncio.run`` entrypoint never executes.
+Items can then be selected (``-k TC004``), re-run (``--lf``) and distributed
+over ``pytest-xdist`` workers like any other test.
+
+The scripts start their own driver and browser and open one context. While
+an item runs, those calls are served from fixtures instead:
+
+- ``harness_session`` (session scope) owns an event loop, the Playwright
+  driver and a Chromium browser launched with the scripts' ``LAUNCH_ARGS``.
+  The script's ``start()``, ``launch()`` and their ``stop()``/``close()`` are
+  redirected to it (``harness.session``), so the browser starts once per
+  process. Under xdist each worker is a process with its own session.
+- ``harness_context`` (function scope) is a fresh ``BrowserContext``. It is
+  what the script's first ``new_context()`` returns; any further contexts it
+  opens are closed after the test.
+
+Both fixtures can be used by hand-written tests as well; run Playwright calls
+on the session's loop with ``harness_session.run(...)``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+import pytest
+
+from .config import TEST_PATTERN
+from .loader import TestScript, load_run_test
+from .session import SharedBrowser, close_all
+
+T = TypeVar("T")
+
+
+class BrowserSession:
+    """Event loop and shared browser of one pytest process."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.shared = SharedBrowser()
+
+    @property
+    def browser(self) -> Any:
+        return self.shared.browser
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        return self.loop.run_until_complete(awaitable)
+
+    def close(self) -> None:
+        try:
+            self.run(self.shared.stop())
+        finally:
+            self.loop.close()
+
+
+def _test_function(script: TestScript) -> Callable[..., None]:
+    def run_test(harness_session: BrowserSession, harness_context: Any) -> None:
+        coroutine_function = load_run_test(script)
+        handed_out = False
+
+        async def provide() -> Any:
+            nonlocal handed_out
+            if handed_out:
+                return None
+            handed_out = True
+            return harness_context
+
+        with harness_session.shared.serving(provide) as opened:
+            try:
+                harness_session.run(coroutine_function())
+            finally:
+                harness_session.run(close_all(opened))
+
+    return run_test
+
+
+class ScriptItem(pytest.Function):
+    """The ``run_test`` coroutine of one TC script."""
+
+    script: TestScript
+
+    def reportinfo(self) -> tuple[Path, int, str]:
+        return self.path, 0, f"{self.script.name}::run_test"
+
+
+class ScriptFile(pytest.File):
+    def collect(self) -> Iterator[ScriptItem]:
+        script = TestScript(self.path)
+        item = ScriptItem.from_parent(self, name="run_test", callobj=_test_function(script))
+        item.script = script
+        item.add_marker(pytest.mark.testsprite(script.test_id))
+        yield item
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "testsprite(test_id): a TestSprite-generated TC script")
+
+
+def pytest_collect_file(file_path: Path, parent: pytest.Collector) -> ScriptFile | None:
+    if file_path.suffix == ".py" and fnmatch(file_path.name, TEST_PATTERN):
+        return ScriptFile.from_parent(parent, path=file_path)
+    return None
+
+
+@pytest.fixture(scope="session")
+def harness_session() -> Iterator[BrowserSession]:
+    session = BrowserSession()
+    try:
+        session.run(session.shared.start())
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def harness_browser(harness_session: BrowserSession) -> Any:
+    return harness_session.browser
+
+
+@pytest.fixture
+def harness_context(harness_session: BrowserSession) -> Iterator[Any]:
+    context = harness_session.run(harness_session.browser.new_context())
+    try:
+        yield context
+    finally:
+        harness_session.run(context.close())
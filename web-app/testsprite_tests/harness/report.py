@@ -0,0 +1,501 @@
+"""Deterministic test report built from the results store.
+
+Produces the same layout as the TestSprite report (document metadata,
+requirement validation summary with one section per test, coverage and
+matching metrics, critical issues) without sending ``tmp/report_prompt.json``
+through an LLM. Same store contents in, byte-identical report out.
+
+Tests are grouped under the features listed in ``tmp/code_summary.json`` by
+keyword overlap with their title and description. Known failure patterns in
+the error text and console messages (``ISSUES``) supply severity, findings
+and recommendations; failures are also clustered by signature
+(``harness.clusters``) without any hand-written pattern.
+``ReportPlugin`` re-renders after every test so the report can be watched
+while a run is in progress.
+"""
+
+from __future__ import annotations
+
+import datetime
+import html
+import json
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import clusters
+from .config import OUTPUT_DIR, TESTS_DIR, TMP_DIR, WEB_APP_DIR
+from .loader import TestScript
+from .runner import CACHED, PASSED, Plugin, Run, TestResult
+from .store import ResultStore
+
+REPORT_DIR = OUTPUT_DIR / "report"
+REPORT_NAME = "testsprite-mcp-test-report"
+CODE_SUMMARY = TMP_DIR / "code_summary.json"
+OTHER_REQUIREMENT = "Other"
+
+SEVERITY_ORDER = ("Critical", "High", "Medium", "Low")
+
+
+@dataclass(frozen=True)
+class Issue:
+    key: str
+    title: str
+    severity: str
+    pattern: re.Pattern
+    finding: str
+    recommendation: str
+
+
+ISSUES = (
+    Issue(
+        "websocket", "WebSocket Service Failures", "Critical",
+        re.compile(r"WebSocket (?:connection to .* failed|error)"),
+        "Real-time connection to the WebSocket server failed.",
+        "Start the WebSocket server or run with the in-page socket source (`--fake-clock`).",
+    ),
+    Issue(
+        "microphone", "Microphone Permission Issues", "Critical",
+        re.compile(r"Illegal invocation|Microphone permission denied|wake word detection"),
+        "Microphone permission check or capture device failed; voice features did not initialise.",
+        "Run voice flows with `--profile fake-media`; guard `navigator.permissions.query` in the app.",
+    ),
+    Issue(
+        "gotrue", "Authentication Service Conflicts", "High",
+        re.compile(r"Multiple GoTrueClient instances"),
+        "More than one Supabase auth client shares the same storage key.",
+        "Create the Supabase client once and import it everywhere.",
+    ),
+    Issue(
+        "environment", "Environment Instability", "High",
+        re.compile(r"Timeout \d+ms exceeded|TimeoutError|net::ERR_CONNECTION_REFUSED|Failed to go to the start URL"),
+        "Navigation or an action timed out; the dev server was slow or unreachable.",
+        "Check the dev server is up on the configured endpoint before the run.",
+    ),
+    Issue(
+        "assertion", "Assertion Failures", "High",
+        re.compile(r"AssertionError"),
+        "A test assertion did not hold.",
+        "Inspect the failing step and the app behaviour it checks.",
+    ),
+)
+
+_STOP_WORDS = {
+    "and", "for", "the", "with", "test", "tests", "testing", "system", "management", "validate",
+    "validation", "verify", "check", "ensure", "functionality", "integration", "support", "using",
+    "under", "into", "from", "that", "this", "are", "all", "its",
+}
+
+
+def _words(text: str) -> set[str]:
+    return {w for w in re.findall(r"[a-z][a-z0-9]+", text.lower()) if len(w) > 2 and w not in _STOP_WORDS}
+
+
+def load_features(path: Path = CODE_SUMMARY) -> list[dict]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8")).get("features", [])
+
+
+def match_requirement(features: list[dict], title: str, description: str = "") -> str:
+    """Feature whose name and description best overlap the test text; first wins ties."""
+    words = _words(f"{title} {description}")
+    best, best_score = OTHER_REQUIREMENT, 0
+    for feature in features:
+        score = 3 * len(words & _words(feature["name"])) + len(words & _words(feature.get("description", "")))
+        if score > best_score:
+            best, best_score = feature["name"], score
+    return best
+
+
+def _status(row: sqlite3.Row, console: list[tuple[str, str, int]], issues: list[Issue]) -> str:
+    """A passing test is partial when a known issue shows in its error or an error-level message.
+
+    Warnings alone (the GoTrueClient one is in every run) keep it passed.
+    """
+    if row["status"] == CACHED:
+        return "cached"
+    if row["status"] != PASSED:
+        return "failed"
+    errors = "\n".join([row["error"]] + [message for level, message, _ in console if level == "ERROR"])
+    return "partial" if any(issue.pattern.search(errors) for issue in issues) else "passed"
+
+
+_STATUS_LABELS = {"passed": "✅ Passed", "partial": "⚠️ Partial", "failed": "❌ Failed", "cached": "♻️ Cached"}
+# Statuses counted as passing in the coverage metrics.
+_PASSING = ("passed", "cached")
+
+
+def _error_summary(error: str) -> str:
+    """Last meaningful line of a traceback or TestSprite error."""
+    lines = [line.strip() for line in error.splitlines() if line.strip()]
+    return lines[-1][:300] if lines else ""
+
+
+@dataclass
+class TestEntry:
+    test_id: str
+    name: str
+    title: str
+    status: str
+    severity: str
+    error: str
+    visualization: str
+    findings: str
+    issues: list[str]
+    console: list[tuple[str, str, int]]
+    resources: dict = field(default_factory=dict)
+
+
+@dataclass
+class Requirement:
+    name: str
+    description: str
+    tests: list[TestEntry] = field(default_factory=list)
+
+    def count(self, status: str) -> int:
+        return sum(1 for test in self.tests if test.status == status)
+
+
+@dataclass
+class Report:
+    project: str
+    version: str
+    date: str
+    run_id: str
+    in_progress: bool
+    requirements: list[Requirement]
+    issues: list[tuple[Issue, list[str]]]
+    clusters: list[clusters.Cluster]
+
+    @property
+    def tests(self) -> list[TestEntry]:
+        return [test for requirement in self.requirements for test in requirement.tests]
+
+
+def _package() -> tuple[str, str]:
+    path = WEB_APP_DIR / "package.json"
+    if not path.exists():
+        return WEB_APP_DIR.name, ""
+    package = json.loads(path.read_text(encoding="utf-8"))
+    return package.get("name", WEB_APP_DIR.name), package.get("version", "")
+
+
+def build_report(store: ResultStore, run_id: str | None = None, features: list[dict] | None = None) -> Report:
+    run_id = run_id or store.latest_run_id()
+    run = store.db.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+    if run is None:
+        raise LookupError(f"no run {run_id!r} in {store.path}")
+    features = load_features() if features is None else features
+
+    requirements = {
+        feature["name"]: Requirement(feature["name"], feature.get("description", "")) for feature in features
+    }
+    affected: dict[str, list[str]] = {issue.key: [] for issue in ISSUES}
+    for row in store.results(run_id):
+        console = [(log["level"], log["message"], log["count"]) for log in store.logs(row["id"])]
+        text = "\n".join([row["error"]] + [message for _, message, _ in console])
+        matched = [issue for issue in ISSUES if issue.pattern.search(text)]
+        status = _status(row, console, matched)
+        metrics = json.loads(row["metrics"])
+        if status == "passed":
+            severity, findings = "Low", "Passed."
+        elif status == "cached":
+            severity = "Low"
+            findings = f"Passed in run {metrics.get('cached_from', '?')}; not re-run, its inputs are unchanged."
+        else:
+            severity = min((i.severity for i in matched), key=SEVERITY_ORDER.index, default="High")
+            summary = _error_summary(row["error"])
+            findings = " ".join(filter(None, [summary] + [i.finding for i in matched])) or "Failed without error output."
+        for issue in matched:
+            if row["test_id"] not in affected[issue.key]:
+                affected[issue.key].append(row["test_id"])
+
+        extra = json.loads(row["extra"])
+        name = match_requirement(features, row["title"], row["description"])
+        requirement = requirements.setdefault(name, Requirement(name, ""))
+        requirement.tests.append(TestEntry(
+            test_id=row["test_id"],
+            name=row["name"],
+            title=row["title"] or row["name"],
+            status=status,
+            severity=severity,
+            error=row["error"],
+            visualization=extra.get("testVisualization", ""),
+            findings=findings,
+            issues=[issue.title for issue in matched],
+            console=console,
+            resources=metrics.get("resources", {}),
+        ))
+
+    project, version = _package()
+    return Report(
+        project=project,
+        version=version,
+        date=datetime.date.fromtimestamp(run["started_at"]).isoformat(),
+        run_id=run_id,
+        in_progress=run["finished_at"] is None,
+        requirements=list(requirements.values()),
+        issues=[(issue, affected[issue.key]) for issue in ISSUES if affected[issue.key]],
+        clusters=clusters.cluster_run(store, run_id),
+    )
+
+
+def _percent(part: int, whole: int) -> str:
+    return f"{round(100 * part / whole)}%" if whole else "n/a"
+
+
+def _code_link(name: str, out_dir: Path) -> str:
+    # Matrix results are named <script>[<project>].
+    return Path(os.path.relpath(TESTS_DIR / f"{name.split('[', 1)[0]}.py", out_dir)).as_posix()
+
+
+def _error_block(error: str) -> str:
+    """First lines of the error, indented under its bullet; the full text is in the store."""
+    lines = error.strip().splitlines()
+    shown = lines[:12] + ([f"... {len(lines) - 12} more lines"] if len(lines) > 12 else [])
+    return "\n".join("  " + line for line in shown)
+
+
+_RESOURCE_LABELS = {"browser": "browser", "driver": "Playwright driver", "vite": "Vite"}
+
+
+def _resources_summary(resources: dict) -> str:
+    """``browser 612.0 MB peak, 14.2 CPU-s; ...`` from ``metrics["resources"]``."""
+    return "; ".join(
+        f"{label} {resources[group]['peak_rss_mb']:.1f} MB peak, {resources[group]['cpu_s']:.1f} CPU-s"
+        for group, label in _RESOURCE_LABELS.items() if group in resources
+    )
+
+
+def _console_summary(console: list[tuple[str, str, int]]) -> tuple[str, list[str]]:
+    """Headline and one line per distinct console message (first line, shortened)."""
+    total = sum(count for _, _, count in console)
+    headline = f"{total} messages, {len(console)} distinct"
+    return headline, [
+        f"{count}× [{level}] {message.splitlines()[0][:160]}" for level, message, count in console
+    ]
+
+
+def render_markdown(report: Report, out_dir: Path = REPORT_DIR) -> str:
+    tests = report.tests
+    passed = sum(1 for t in tests if t.status in _PASSING)
+    tested = [r for r in report.requirements if r.tests]
+
+    lines = ["# TestSprite AI Testing Report(MCP)", "", "---", "", "## 1️⃣ Document Metadata"]
+    lines += [
+        f"- **Project Name:** {report.project}",
+        f"- **Version:** {report.version}",
+        f"- **Date:** {report.date}",
+        f"- **Run:** {report.run_id}" + (f" (in progress, {len(tests)} results so far)" if report.in_progress else ""),
+        "- **Prepared by:** TC script harness",
+        "", "---", "", "## 2️⃣ Requirement Validation Summary", "",
+    ]
+    for requirement in report.requirements:
+        lines.append(f"### Requirement: {requirement.name}")
+        if requirement.description:
+            lines.append(f"- **Description:** {requirement.description}")
+        lines.append("")
+        if not requirement.tests:
+            lines += ["- **Test:** N/A", "- **Status:** ❌ Not Tested", "", "---", ""]
+            continue
+        for number, test in enumerate(requirement.tests, 1):
+            lines += [
+                f"#### Test {number}",
+                f"- **Test ID:** {test.test_id}",
+                f"- **Test Name:** {test.title}",
+                f"- **Test Code:** [{test.name}.py]({_code_link(test.name, out_dir)})",
+            ]
+            if test.error.strip():
+                lines += ["- **Test Error:**", "", "  ```", _error_block(test.error), "  ```", ""]
+            else:
+                lines.append("- **Test Error:** ")
+            if test.console:
+                headline, entries = _console_summary(test.console)
+                lines.append(f"- **Console:** {headline}")
+                lines += [f"  - `` {entry} ``" for entry in entries]
+            if test.resources:
+                lines.append(f"- **Resources:** {_resources_summary(test.resources)}")
+            lines += [
+                f"- **Test Visualization and Result:** {test.visualization}",
+                f"- **Status:** {_STATUS_LABELS[test.status]}",
+                f"- **Severity:** {test.severity}",
+                f"- **Analysis / Findings:** {test.findings}",
+                "", "---", "",
+            ]
+
+    lines += [
+        "## 3️⃣ Coverage & Matching Metrics", "",
+        f"- {_percent(len(tested), len(report.requirements))} of product requirements tested",
+        f"- {_percent(passed, len(tests))} of tests passed",
+        "", "| Requirement | Total Tests | ✅ Passed | ⚠️ Partial | ❌ Failed | ♻️ Cached |",
+        "|-------------|-------------|-----------|------------|-----------|-----------|",
+    ]
+    for requirement in report.requirements:
+        lines.append(
+            f"| {requirement.name} | {len(requirement.tests)} | {requirement.count('passed')}"
+            f" | {requirement.count('partial')} | {requirement.count('failed')} | {requirement.count('cached')} |"
+        )
+
+    lines += ["", "---", "", "## 4️⃣ Critical Issues", ""]
+    if not report.issues:
+        lines.append("No known failure patterns matched.")
+    for number, (issue, test_ids) in enumerate(report.issues, 1):
+        lines += [
+            f"### {number}. {issue.title} ({issue.severity})",
+            f"**Affected Tests**: {', '.join(test_ids)}",
+            "",
+            f"**Finding**: {issue.finding}",
+            "",
+            f"**Recommendation**: {issue.recommendation}",
+            "",
+        ]
+
+    lines += ["---", "", "## 5️⃣ Failure Clusters", ""]
+    lines.append(clusters.render_markdown(report.clusters) if report.clusters else "No failures.")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+_HTML_STYLE = """
+    body { font-family: sans-serif; padding: 40px; line-height: 1.6; background: #fdfdfd; color: #333; }
+    pre { background: #f4f4f4; padding: 10px; border-radius: 5px; overflow-x: auto; }
+    code { font-family: monospace; background: #eee; padding: 2px 4px; }
+    table { border-collapse: collapse; width: 100%; margin-top: 20px; }
+    th, td { border: 1px solid #ccc; padding: 8px 12px; text-align: left; }
+    th { background-color: #f2f2f2; font-weight: bold; }
+"""
+
+
+def _console_html(console: list[tuple[str, str, int]]) -> str:
+    if not console:
+        return ""
+    headline, entries = _console_summary(console)
+    items = "".join(f"<li><code>{html.escape(entry)}</code></li>" for entry in entries)
+    return f"<li><strong>Console:</strong> {headline}<ul>{items}</ul></li>"
+
+
+def render_html(report: Report, out_dir: Path = REPORT_DIR) -> str:
+    e = html.escape
+    tests = report.tests
+    passed = sum(1 for t in tests if t.status in _PASSING)
+    tested = [r for r in report.requirements if r.tests]
+    progress = f" (in progress, {len(tests)} results so far)" if report.in_progress else ""
+
+    parts = [
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8" />',
+        f"<title>{e(report.project)} test report</title>\n<style>{_HTML_STYLE}</style>\n</head>\n<body>",
+        "<h1>TestSprite AI Testing Report (MCP)</h1>\n<hr>\n<h2>1️⃣ Document Metadata</h2>\n<ul>",
+        f"<li><strong>Project Name:</strong> {e(report.project)}</li>",
+        f"<li><strong>Version:</strong> {e(report.version)}</li>",
+        f"<li><strong>Date:</strong> {e(report.date)}</li>",
+        f"<li><strong>Run:</strong> {e(report.run_id)}{progress}</li>",
+        "<li><strong>Prepared by:</strong> TC script harness</li>\n</ul>\n<hr>",
+        "<h2>2️⃣ Requirement Validation Summary</h2>",
+    ]
+    for requirement in report.requirements:
+        parts.append(f"<h3>Requirement: {e(requirement.name)}</h3>")
+        if requirement.description:
+            parts.append(f"<p><strong>Description:</strong> {e(requirement.description)}</p>")
+        if not requirement.tests:
+            parts.append("<p><strong>Status:</strong> ❌ Not Tested</p>\n<hr>")
+            continue
+        for number, test in enumerate(requirement.tests, 1):
+            error = f"<pre>{e(test.error.strip())}</pre>" if test.error.strip() else ""
+            visualization = (
+                f'<a href="{e(test.visualization)}">{e(test.visualization)}</a>' if test.visualization else ""
+            )
+            parts += [
+                f"<h4>Test {number}</h4>\n<ul>",
+                f"<li><strong>Test ID:</strong> {e(test.test_id)}</li>",
+                f"<li><strong>Test Name:</strong> {e(test.title)}</li>",
+                f'<li><strong>Test Code:</strong> <a href="{e(_code_link(test.name, out_dir))}">'
+                f"{e(test.name)}.py</a></li>",
+                f"<li><strong>Test Error:</strong> {error}</li>",
+                _console_html(test.console),
+                f"<li><strong>Resources:</strong> {e(_resources_summary(test.resources))}</li>" if test.resources else "",
+                f"<li><strong>Test Visualization and Result:</strong> {visualization}</li>",
+                f"<li><strong>Status:</strong> {_STATUS_LABELS[test.status]}</li>",
+                f"<li><strong>Severity:</strong> {e(test.severity)}</li>",
+                f"<li><strong>Analysis / Findings:</strong> {e(test.findings)}</li>",
+                "</ul>\n<hr>",
+            ]
+
+    parts += [
+        "<h2>3️⃣ Coverage &amp; Matching Metrics</h2>\n<ul>",
+        f"<li>{_percent(len(tested), len(report.requirements))} of product requirements tested</li>",
+        f"<li>{_percent(passed, len(tests))} of tests passed</li>\n</ul>",
+        "<table>\n<tr><th>Requirement</th><th>Total Tests</th><th>✅ Passed</th>"
+        "<th>⚠️ Partial</th><th>❌ Failed</th><th>♻️ Cached</th></tr>",
+    ]
+    for requirement in report.requirements:
+        parts.append(
+            f"<tr><td>{e(requirement.name)}</td><td>{len(requirement.tests)}</td>"
+            f"<td>{requirement.count('passed')}</td><td>{requirement.count('partial')}</td>"
+            f"<td>{requirement.count('failed')}</td><td>{requirement.count('cached')}</td></tr>"
+        )
+    parts.append("</table>\n<hr>\n<h2>4️⃣ Critical Issues</h2>")
+    if not report.issues:
+        parts.append("<p>No known failure patterns matched.</p>")
+    for number, (issue, test_ids) in enumerate(report.issues, 1):
+        parts += [
+            f"<h3>{number}. {e(issue.title)} ({e(issue.severity)})</h3>",
+            f"<p><strong>Affected Tests</strong>: {e(', '.join(test_ids))}</p>",
+            f"<p><strong>Finding</strong>: {e(issue.finding)}</p>",
+            f"<p><strong>Recommendation</strong>: {e(issue.recommendation)}</p>",
+        ]
+    parts.append("<hr>\n<h2>5️⃣ Failure Clusters</h2>")
+    if not report.clusters:
+        parts.append("<p>No failures.</p>")
+    else:
+        parts.append("<table>\n<tr><th>#</th><th>Failures</th><th>Tests</th><th>Signature</th></tr>")
+        for number, item in enumerate(report.clusters, 1):
+            parts.append(
+                f"<tr><td>{number}</td><td>{len(item.members)}</td><td>{e(', '.join(item.test_ids))}</td>"
+                f"<td><code>{e(item.label)}</code></td></tr>"
+            )
+        parts.append("</table>")
+    parts.append("</body>\n</html>")
+    return "\n".join(parts) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Readers watching the file never see a half-written report."""
+    partial = path.with_name(path.name + ".partial")
+    partial.write_text(text, encoding="utf-8")
+    os.replace(partial, path)
+
+
+def write_report(report: Report, out_dir: Path = REPORT_DIR) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _write_atomic(out_dir / f"{REPORT_NAME}.md", render_markdown(report, out_dir))
+    _write_atomic(out_dir / f"{REPORT_NAME}.html", render_html(report, out_dir))
+    return out_dir / f"{REPORT_NAME}.md"
+
+
+class ReportPlugin(Plugin):
+    """Runner plugin re-rendering the report from the store after every test.
+
+    Must come after ``StorePlugin`` in the plugin list so the result it renders
+    has already been recorded.
+    """
+
+    def __init__(self, store: ResultStore, out_dir: Path = REPORT_DIR):
+        self.store = store
+        self.out_dir = out_dir
+        self.features = load_features()
+        self.run_id: str | None = None
+
+    def _render(self, run_id: str) -> None:
+        write_report(build_report(self.store, run_id, self.features), self.out_dir)
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+        self._render(run.run_id)
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        self._render(self.run_id)
+
+    async def on_run_end(self, run: Run) -> None:
+        self._render(run.run_id)
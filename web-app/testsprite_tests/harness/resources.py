@@ -0,0 +1,210 @@
+"""CPU, memory and file-descriptor usage of the processes a run depends on.
+
+``ResourceMonitor`` samples ``/proc`` from a background thread every
+``INTERVAL_S`` and sums three process groups:
+
+- ``driver``: the Playwright driver (the node child of this Python process),
+- ``browser``: everything the driver spawned (Chromium's browser, renderer,
+  GPU and utility processes, or Firefox/WebKit),
+- ``vite``: the dev server (a process whose command line runs Vite) and its
+  children, such as esbuild.
+
+Each sample is attributed to the test running at the time. The result gets
+``metrics["resources"]`` with peak RSS, peak open fds and CPU seconds per
+group, and the report shows the peaks. CPU seconds are per-process deltas
+between samples; a process that starts and exits between two samples is
+not counted. Linux only; elsewhere the monitor logs a warning and does
+nothing.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .loader import TestScript
+from .runner import Plugin, Run, TestResult
+
+logger = logging.getLogger("harness.resources")
+
+INTERVAL_S = 0.2
+GROUPS = ("browser", "driver", "vite")
+
+_PROC = Path("/proc")
+
+
+@dataclass
+class ProcSample:
+    pid: int
+    ppid: int
+    cpu_s: float
+    rss: int
+    fds: int
+
+
+def read_proc(pid: int) -> ProcSample | None:
+    """One process from ``/proc``, or ``None`` if it exited or is not readable."""
+    try:
+        stat = (_PROC / str(pid) / "stat").read_text()
+        # The command name is in parentheses and may contain spaces.
+        fields = stat[stat.rfind(")") + 2:].split()
+        try:
+            fds = len(os.listdir(_PROC / str(pid) / "fd"))
+        except PermissionError:
+            fds = 0
+        return ProcSample(
+            pid=pid,
+            ppid=int(fields[1]),
+            cpu_s=(int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK"),
+            rss=int(fields[21]) * os.sysconf("SC_PAGE_SIZE"),
+            fds=fds,
+        )
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pids() -> list[int]:
+    """Every process visible in ``/proc``; empty where there is no ``/proc``."""
+    if not _PROC.is_dir():
+        return []
+    return [int(entry.name) for entry in _PROC.iterdir() if entry.name.isdigit()]
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        return (_PROC / str(pid) / "cmdline").read_bytes().replace(b"\0", b" ").decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+
+def _descendants(roots: set[int], children: dict[int, list[int]]) -> set[int]:
+    found, stack = set(), list(roots)
+    while stack:
+        pid = stack.pop()
+        if pid in found:
+            continue
+        found.add(pid)
+        stack.extend(children.get(pid, ()))
+    return found
+
+
+def classify(samples: dict[int, ProcSample], own_pid: int, vite_pids: set[int]) -> dict[str, set[int]]:
+    """Process group -> pids, from the process tree."""
+    children: dict[int, list[int]] = {}
+    for sample in samples.values():
+        children.setdefault(sample.ppid, []).append(sample.pid)
+    drivers = set(children.get(own_pid, ()))
+    browser = _descendants(drivers, children) - drivers
+    return {
+        "driver": drivers,
+        "browser": browser,
+        "vite": _descendants(vite_pids & samples.keys(), children),
+    }
+
+
+def find_vite() -> set[int]:
+    """Processes running the Vite CLI (``node .../vite.js``, ``sh -c vite``)."""
+    found = set()
+    for pid in pids():
+        args = _cmdline(pid).split()
+        if any(Path(arg).name in ("vite", "vite.js") for arg in args[:3]):
+            found.add(pid)
+    return found
+
+
+@dataclass
+class Usage:
+    samples: int = 0
+    peak_rss: dict[str, int] = field(default_factory=dict)
+    peak_fds: dict[str, int] = field(default_factory=dict)
+    cpu_s: dict[str, float] = field(default_factory=dict)
+
+    def to_metrics(self) -> dict:
+        return {
+            group: {
+                "peak_rss_mb": round(self.peak_rss.get(group, 0) / 2**20, 1),
+                "cpu_s": round(self.cpu_s.get(group, 0.0), 2),
+                "peak_fds": self.peak_fds.get(group, 0),
+            }
+            for group in GROUPS if group in self.peak_rss
+        } | {"samples": self.samples}
+
+
+class ResourceMonitor(Plugin):
+    """Runner plugin sampling driver, browser and dev-server processes per test."""
+
+    def __init__(self, interval_s: float = INTERVAL_S):
+        self.interval_s = interval_s
+        self.own_pid = os.getpid()
+        self.vite: set[int] = set()
+        self.active: Usage | None = None
+        self._cpu: dict[int, float] = {}
+        self._primed = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample(self) -> None:
+        samples = {sample.pid: sample for sample in map(read_proc, pids()) if sample}
+        groups = classify(samples, self.own_pid, self.vite)
+        with self._lock:
+            usage = self.active
+            if usage is not None:
+                usage.samples += 1
+            for group, members in groups.items():
+                cpu = 0.0
+                for pid in members:
+                    # Processes first seen now started after the previous sample, except
+                    # on the first sample, where the baseline is their current usage.
+                    previous = self._cpu.get(pid, samples[pid].cpu_s if not self._primed else 0.0)
+                    cpu += max(samples[pid].cpu_s - previous, 0.0)
+                    self._cpu[pid] = samples[pid].cpu_s
+                if usage is None or not members:
+                    continue
+                rss = sum(samples[pid].rss for pid in members)
+                fds = sum(samples[pid].fds for pid in members)
+                usage.peak_rss[group] = max(usage.peak_rss.get(group, 0), rss)
+                usage.peak_fds[group] = max(usage.peak_fds.get(group, 0), fds)
+                usage.cpu_s[group] = usage.cpu_s.get(group, 0.0) + cpu
+            for pid in set(self._cpu) - samples.keys():
+                del self._cpu[pid]
+            self._primed = True
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.sample()
+            except Exception:
+                logger.debug("resource sample failed", exc_info=True)
+
+    async def on_run_start(self, run: Run) -> None:
+        if not _PROC.is_dir():
+            logger.warning("no /proc on this system; resource monitoring disabled")
+            return
+        self.vite = find_vite()
+        if not self.vite:
+            logger.info("no Vite dev server process found")
+        self.sample()
+        self._thread = threading.Thread(target=self._loop, name="harness-resources", daemon=True)
+        self._thread.start()
+
+    async def on_test_start(self, test: TestScript) -> None:
+        with self._lock:
+            self.active = Usage()
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        if self._thread is None:
+            return
+        self.sample()
+        with self._lock:
+            usage, self.active = self.active, None
+        if usage is not None:
+            result.metrics["resources"] = usage.to_metrics()
+
+    async def on_run_end(self, run: Run) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,380 @@
+"""Runner that executes the generated TC scripts with harness instrumentation.
+
+The scripts create their own Playwright objects, so the runner cannot hand
+them a pre-configured context. Instead, while a test runs, it patches
+``Browser.new_context`` and ``BrowserContext.new_page`` so that every plugin
+sees each context and page the script opens before the script first uses it,
+and wraps the page actions in ``STEP_ACTIONS`` so plugins can observe each
+step of the flow. The patches find the running test through a context
+variable, so several ``Runner`` instances can run tests concurrently (see
+``harness.matrix``); plugins hold per-test state and need one instance per
+runner.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
+import time
+import traceback
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Sequence
+
+from .loader import TestScript, load_run_test
+from .watchdog import Watchdog
+
+logger = logging.getLogger("harness")
+
+PASSED = "PASSED"
+FAILED = "FAILED"
+# A pass reused from an earlier run by the result cache; nothing was executed.
+CACHED = "CACHED"
+
+
+@dataclass
+class Step:
+    """One page action performed by a test script."""
+
+    index: int
+    action: str
+    target: str
+    started_at: float
+    duration_ms: float = 0.0
+    error: str = ""
+    page: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def key(self) -> str:
+        """Identifies the step across runs of the same script."""
+        return f"{self.index}:{self.action}:{self.target}"
+
+
+@dataclass
+class TestResult:
+    """Outcome of a single script execution."""
+
+    __test__ = False
+
+    test_id: str
+    name: str
+    title: str
+    status: str
+    duration_ms: float
+    started_at: float
+    error: str = ""
+    steps: list[Step] = field(default_factory=list)
+    # Free-form measurements contributed by plugins, keyed by plugin.
+    metrics: dict[str, Any] = field(default_factory=dict)
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free run identifier (``20250801T161242-3fa9c1``)."""
+    return time.strftime("%Y%m%dT%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+@dataclass
+class Run:
+    """A batch of test executions."""
+
+    run_id: str = field(default_factory=new_run_id)
+    started_at: float = field(default_factory=time.time)
+    results: list[TestResult] = field(default_factory=list)
+
+
+class Plugin:
+    """Base class for runner plugins. Every hook is optional."""
+
+    def configure_launch(self, test: TestScript, options: dict[str, Any]) -> None:
+        """Adjust ``BrowserType.launch`` keyword arguments in place."""
+
+    def configure_context(self, test: TestScript, options: dict[str, Any]) -> None:
+        """Adjust ``Browser.new_context`` keyword arguments in place."""
+
+    def configure_step(self, test: TestScript, step: Step, options: dict[str, Any]) -> None:
+        """Adjust the keyword arguments of a step's Playwright call in place."""
+
+    async def on_run_start(self, run: Run) -> None:
+        pass
+
+    async def on_test_start(self, test: TestScript) -> None:
+        pass
+
+    async def on_context(self, test: TestScript, context: Any) -> None:
+        """Called for each ``BrowserContext`` right after it is created."""
+
+    async def on_page(self, test: TestScript, page: Any) -> None:
+        """Called for each ``Page`` before ``new_page()`` returns to the script."""
+
+    async def on_context_close(self, test: TestScript, context: Any) -> None:
+        """Called before a context is closed, while its pages are still alive."""
+
+    async def on_step_start(self, test: TestScript, step: Step) -> None:
+        """Called before a page action (navigation, click, fill...) runs."""
+
+    async def on_step_end(self, test: TestScript, step: Step) -> None:
+        """Called after a page action finished; ``step.error`` is set on failure."""
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        pass
+
+    async def on_run_end(self, run: Run) -> None:
+        pass
+
+
+class _Dispatcher:
+    """Fans hook calls out to plugins, isolating the test from plugin errors.
+
+    Each test gets its own dispatcher, closed when the test ends. A task the
+    watchdog abandoned keeps its dispatcher through the copied context, so
+    its late Playwright calls reach a closed one and are not recorded.
+    """
+
+    def __init__(self, plugins: Sequence[Plugin], test: TestScript | None = None):
+        self.plugins = list(plugins)
+        self.test = test
+        self.steps: list[Step] = []
+        self.step: Step | None = None
+        self.contexts: list[Any] = []
+        self.closed = False
+
+    def begin_step(self, action: str, target: str, page: Any) -> Step:
+        self.step = Step(len(self.steps), action, target, time.time(), page=page)
+        self.steps.append(self.step)
+        return self.step
+
+    async def call(self, hook: str, *args: Any) -> None:
+        for plugin in self.plugins:
+            try:
+                await getattr(plugin, hook)(*args)
+            except Exception:
+                logger.exception("%s.%s failed", type(plugin).__name__, hook)
+
+    def configure(self, hook: str, options: dict[str, Any], *args: Any) -> dict[str, Any]:
+        options = dict(options)
+        for plugin in self.plugins:
+            try:
+                getattr(plugin, hook)(self.test, *args, options)
+            except Exception:
+                logger.exception("%s.%s failed", type(plugin).__name__, hook)
+        return options
+
+
+# Playwright methods reported as test steps, per generated API class.
+STEP_ACTIONS = {
+    "Page": ("goto", "reload", "go_back", "go_forward", "wait_for_load_state", "click", "fill"),
+    "Locator": ("click", "dblclick", "fill", "press", "type", "check", "uncheck", "select_option", "hover"),
+}
+
+
+def _describe_target(obj: Any, action: str, args: tuple, kwargs: dict) -> str:
+    if action == "goto":
+        return str(args[0] if args else kwargs.get("url", ""))
+    if action == "wait_for_load_state":
+        return str(args[0] if args else kwargs.get("state", "load"))
+    impl = getattr(obj, "_impl_obj", None)
+    selector = getattr(impl, "_selector", None)
+    if selector is None and args and isinstance(args[0], str):
+        selector = args[0]
+    return selector or ""
+
+
+def _page_of(obj: Any) -> Any:
+    return obj if hasattr(obj, "main_frame") else getattr(obj, "page", None)
+
+
+# Dispatcher of the test running in the current task; unset outside tests.
+_active: contextvars.ContextVar[_Dispatcher | None] = contextvars.ContextVar("harness_dispatcher", default=None)
+_installs = 0
+_patches: list[tuple[type, str, Any]] = []
+
+
+def _current() -> _Dispatcher | None:
+    """The active dispatcher, or ``None`` once its test has ended."""
+    dispatcher = _active.get()
+    return None if dispatcher is None or dispatcher.closed else dispatcher
+
+
+def _install() -> None:
+    """Patch Playwright so lifecycles and actions go through the active dispatcher."""
+    from playwright import async_api
+
+    def patch(cls: type, name: str, make: Any) -> None:
+        original = getattr(cls, name)
+        _patches.append((cls, name, original))
+        setattr(cls, name, functools.wraps(original)(make(original)))
+
+    def launch(original):
+        async def wrapper(browser_type, *args, **kwargs):
+            dispatcher = _current()
+            if dispatcher is not None:
+                kwargs = dispatcher.configure("configure_launch", kwargs)
+            return await original(browser_type, *args, **kwargs)
+        return wrapper
+
+    def new_context(original):
+        async def wrapper(browser, *args, **kwargs):
+            dispatcher = _current()
+            if dispatcher is None:
+                return await original(browser, *args, **kwargs)
+            kwargs = dispatcher.configure("configure_context", kwargs)
+            context = await original(browser, *args, **kwargs)
+            dispatcher.contexts.append(context)
+            await dispatcher.call("on_context", dispatcher.test, context)
+            return context
+        return wrapper
+
+    def new_page(original):
+        async def wrapper(context, *args, **kwargs):
+            page = await original(context, *args, **kwargs)
+            dispatcher = _current()
+            if dispatcher is not None:
+                await dispatcher.call("on_page", dispatcher.test, page)
+            return page
+        return wrapper
+
+    def close(original):
+        async def wrapper(context, *args, **kwargs):
+            dispatcher = _current()
+            if dispatcher is not None:
+                await dispatcher.call("on_context_close", dispatcher.test, context)
+            return await original(context, *args, **kwargs)
+        return wrapper
+
+    def step(action):
+        def make(original):
+            async def wrapper(obj, *args, **kwargs):
+                dispatcher = _current()
+                if dispatcher is None or dispatcher.step is not None:
+                    # Actions issued by plugins while a step runs are not steps.
+                    return await original(obj, *args, **kwargs)
+                current = dispatcher.begin_step(action, _describe_target(obj, action, args, kwargs), _page_of(obj))
+                await dispatcher.call("on_step_start", dispatcher.test, current)
+                kwargs = dispatcher.configure("configure_step", kwargs, current)
+                start = time.perf_counter()
+                try:
+                    return await original(obj, *args, **kwargs)
+                except Exception as exc:
+                    current.error = f"{type(exc).__name__}: {exc}"
+                    raise
+                finally:
+                    current.duration_ms = (time.perf_counter() - start) * 1000
+                    await dispatcher.call("on_step_end", dispatcher.test, current)
+                    dispatcher.step = None
+            return wrapper
+        return make
+
+    patch(async_api.BrowserType, "launch", launch)
+    patch(async_api.Browser, "new_context", new_context)
+    patch(async_api.BrowserContext, "new_page", new_page)
+    patch(async_api.BrowserContext, "close", close)
+    for class_name, actions in STEP_ACTIONS.items():
+        for action in actions:
+            patch(getattr(async_api, class_name), action, step(action))
+
+
+@contextlib.contextmanager
+def _instrumented(dispatcher: _Dispatcher) -> Iterator[None]:
+    """Route Playwright calls made in this task (and tasks it starts) through ``dispatcher``.
+
+    The patches are class-level and installed once for all concurrently
+    running tests; each test's calls find its dispatcher through ``_active``.
+    """
+    global _installs
+    if _installs == 0:
+        _install()
+    _installs += 1
+    token = _active.set(dispatcher)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+        _installs -= 1
+        if _installs == 0:
+            while _patches:
+                cls, name, original = _patches.pop()
+                setattr(cls, name, original)
+
+
+class Runner:
+    """Executes scripts one after another and collects their results.
+
+    With a ``watchdog``, a script that outruns its test or step budget is
+    failed and its contexts closed so the next script can start.
+    """
+
+    def __init__(self, plugins: Iterable[Plugin] = (), watchdog: Watchdog | None = None):
+        self.plugins = list(plugins)
+        # Run-level hooks; every test gets a fresh dispatcher in ``run_one``.
+        self.dispatcher = _Dispatcher(self.plugins)
+        self.watchdog = watchdog
+
+    async def run(self, scripts: Sequence[TestScript], run: Run | None = None) -> Run:
+        """Run ``scripts`` in order; results are appended to ``run``, a new one by default."""
+        run = run or Run()
+        await self.start(run)
+        for script in scripts:
+            run.results.append(await self.run_one(script))
+        await self.finish(run)
+        return run
+
+    async def start(self, run: Run) -> None:
+        await self.dispatcher.call("on_run_start", run)
+
+    async def finish(self, run: Run) -> None:
+        """End ``run`` for this runner's plugins; several runners sharing a run finish it together."""
+        await self.dispatcher.call("on_run_end", run)
+
+    async def run_one(self, script: TestScript) -> TestResult:
+        dispatcher = _Dispatcher(self.plugins, script)
+        await dispatcher.call("on_test_start", script)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        status, error, breach, task = PASSED, "", None, None
+        try:
+            run_test = load_run_test(script)
+            with _instrumented(dispatcher):
+                task = asyncio.ensure_future(run_test())
+                task.set_name(f"test:{script.name}")
+                if self.watchdog is not None:
+                    breach = await self.watchdog.guard(task, dispatcher, dispatcher.contexts)
+                if breach is None or task.done():
+                    await task
+        except asyncio.CancelledError:
+            if breach is None:
+                if task is not None:
+                    task.cancel()
+                raise
+        except Exception as exc:
+            status = FAILED
+            error = "".join(traceback.format_exception(exc))
+        finally:
+            dispatcher.closed = True
+        if breach is not None:
+            status = FAILED
+            error = breach.describe() + (f"\n\n{error}" if error else "")
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        result = TestResult(
+            test_id=script.test_id,
+            name=script.name,
+            title=script.title,
+            status=status,
+            duration_ms=duration_ms,
+            started_at=started_at,
+            error=error,
+            steps=dispatcher.steps,
+        )
+        if breach is not None:
+            result.metrics["watchdog"] = {
+                "reason": breach.reason,
+                "step": breach.step,
+                "last_completed": breach.last_completed,
+            }
+        await dispatcher.call("on_test_end", script, result)
+        logger.info("%s %s (%.0f ms)", result.status, script.name, duration_ms)
+        return result
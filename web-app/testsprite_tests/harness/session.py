@@ -0,0 +1,225 @@
+"""One Playwright driver and browser shared by every script run in a process.
+
+Each TC script starts the driver, launches Chromium and opens a context of
+its own, which costs a few seconds before its first step. ``SharedBrowser``
+keeps one driver and browser running. While ``serving`` is active it
+redirects the scripts' calls:
+
+- ``async_playwright().start()`` returns the shared driver and
+  ``chromium.launch()`` the shared browser, whatever its engine; their
+  ``stop()`` and ``close()`` do nothing;
+- a plain ``new_context()`` is answered by the ``provide`` callback, which
+  can hand out a prepared context. ``new_context()`` with options, or when
+  ``provide`` returns ``None``, opens a fresh context;
+- ``new_page()`` on a context registered with ``warm_page`` returns that
+  page the first time.
+
+The pytest plugin, the runner daemon and the browser matrix use it. Which
+browser a call is served from is tracked per asyncio task, so tasks can be
+served from different browsers at once. Runner instrumentation applied
+inside ``serving`` still sees every launch, context and page.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterator
+
+from .config import LAUNCH_ARGS
+
+logger = logging.getLogger("harness.session")
+
+ENGINES = ("chromium", "firefox", "webkit")
+
+
+class SharedBrowser:
+    def __init__(self, launch_options: dict[str, Any] | None = None, engine: str = "chromium"):
+        self.launch_options = launch_options or {"headless": True, "args": list(LAUNCH_ARGS)}
+        self.engine = engine
+        self.playwright: Any = None
+        self.browser: Any = None
+        self._owns_driver = False
+        self._warm: dict[int, Any] = {}
+        self._raw: dict[str, Callable[..., Any]] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    async def start(self, playwright: Any = None) -> None:
+        """Launch the browser, on ``playwright`` if given (several engines can share a driver)."""
+        from playwright import async_api
+
+        # Unpatched methods, for contexts prepared while scripts are being served.
+        self._raw = {
+            "new_context": async_api.Browser.new_context,
+            "new_page": async_api.BrowserContext.new_page,
+        }
+        self._owns_driver = playwright is None
+        self.playwright = playwright or await async_api.async_playwright().start()
+        self.browser = await getattr(self.playwright, self.engine).launch(**self.launch_options)
+
+    async def stop(self) -> None:
+        self._warm.clear()
+        try:
+            if self.browser is not None:
+                await self.browser.close()
+        finally:
+            self.browser = None
+            if self.playwright is not None and self._owns_driver:
+                await self.playwright.stop()
+            self.playwright = None
+
+    async def new_context(self, **options: Any) -> Any:
+        """A context on the shared browser, bypassing any patches in place."""
+        return await self._raw["new_context"](self.browser, **options)
+
+    async def new_page(self, context: Any) -> Any:
+        return await self._raw["new_page"](context)
+
+    def warm_page(self, context: Any, page: Any) -> None:
+        """Hand ``page`` out as the result of the next ``context.new_page()``."""
+        self._warm[id(context)] = page
+
+    @contextlib.contextmanager
+    def serving(self, provide: Callable[[], Awaitable[Any | None]]) -> Iterator[list[Any]]:
+        """Redirect scripts run from this task to the shared browser.
+
+        Yields the fresh contexts they opened. Other tasks can serve a
+        different ``SharedBrowser`` at the same time.
+        """
+        serving = _Serving(self, provide)
+        with redirected():
+            token = _serving.set(serving)
+            try:
+                yield serving.opened
+            finally:
+                _serving.reset(token)
+
+
+@dataclass
+class _Serving:
+    shared: SharedBrowser
+    provide: Callable[[], Awaitable[Any | None]]
+    opened: list[Any] = field(default_factory=list)
+
+
+class _SharedDriver:
+    """Stands in for ``async_playwright()``: ``start()`` returns the shared driver."""
+
+    def __init__(self, playwright: Any):
+        self.playwright = playwright
+
+    async def start(self) -> Any:
+        return self.playwright
+
+
+# What the current task is served from; unset outside ``serving``.
+_serving: contextvars.ContextVar[_Serving | None] = contextvars.ContextVar("harness_serving", default=None)
+_installs = 0
+_patches: list[tuple[Any, str, Any]] = []
+
+
+def _install() -> None:
+    from playwright import async_api
+
+    def patch(owner: Any, name: str, make: Callable[[Any], Any]) -> None:
+        original = getattr(owner, name)
+        _patches.append((owner, name, original))
+        setattr(owner, name, functools.wraps(original)(make(original)))
+
+    def async_playwright(original):
+        def wrapper(*args, **kwargs):
+            serving = _serving.get()
+            if serving is None:
+                return original(*args, **kwargs)
+            return _SharedDriver(serving.shared.playwright)
+        return wrapper
+
+    def stop(original):
+        async def wrapper(playwright, *args, **kwargs):
+            serving = _serving.get()
+            if serving is None or playwright is not serving.shared.playwright:
+                return await original(playwright, *args, **kwargs)
+        return wrapper
+
+    def launch(original):
+        async def wrapper(browser_type, *args, **kwargs):
+            serving = _serving.get()
+            # Scripts always launch Chromium; any engine of the shared driver gets the shared browser.
+            if serving is not None and any(
+                browser_type is getattr(serving.shared.playwright, engine) for engine in ENGINES
+            ):
+                return serving.shared.browser
+            return await original(browser_type, *args, **kwargs)
+        return wrapper
+
+    def close(original):
+        async def wrapper(browser, *args, **kwargs):
+            serving = _serving.get()
+            if serving is None or browser is not serving.shared.browser:
+                return await original(browser, *args, **kwargs)
+        return wrapper
+
+    def new_context(original):
+        async def wrapper(browser, *args, **kwargs):
+            serving = _serving.get()
+            if serving is None or browser is not serving.shared.browser:
+                return await original(browser, *args, **kwargs)
+            if not args and not kwargs:
+                context = await serving.provide()
+                if context is not None:
+                    return context
+            context = await original(browser, *args, **kwargs)
+            serving.opened.append(context)
+            return context
+        return wrapper
+
+    def new_page(original):
+        async def wrapper(context, *args, **kwargs):
+            serving = _serving.get()
+            page = None if serving is None or args or kwargs else serving.shared._warm.pop(id(context), None)
+            if page is not None and not page.is_closed():
+                return page
+            return await original(context, *args, **kwargs)
+        return wrapper
+
+    patch(async_api, "async_playwright", async_playwright)
+    patch(async_api.Playwright, "stop", stop)
+    patch(async_api.BrowserType, "launch", launch)
+    patch(async_api.Browser, "close", close)
+    patch(async_api.Browser, "new_context", new_context)
+    patch(async_api.BrowserContext, "new_page", new_page)
+
+
+@contextlib.contextmanager
+def redirected() -> Iterator[None]:
+    """Keep the redirecting patches installed; nested and concurrent uses share them.
+
+    Enter this before any ``Runner`` instruments a test so the runner's
+    patches wrap these and not the other way round.
+    """
+    global _installs
+    if _installs == 0:
+        _install()
+    _installs += 1
+    try:
+        yield
+    finally:
+        _installs -= 1
+        if _installs == 0:
+            while _patches:
+                owner, name, original = _patches.pop()
+                setattr(owner, name, original)
+
+
+async def close_all(contexts: list[Any]) -> None:
+    for context in contexts:
+        try:
+            await context.close()
+        except Exception:
+            logger.debug("closing %s failed", context, exc_info=True)
@@ -0,0 +1,150 @@
+"""Splitting a run across machines, and merging the shard results back.
+
+``assign`` balances scripts over ``count`` shards with the longest-processing-
+time-first rule: scripts sorted by expected duration, longest first, each
+placed on the shard with the least work so far. Expected duration is the
+median of a script's recent results in the store; scripts without history
+count as the median of all known scripts. LPT keeps the slowest shard within
+4/3 of the optimum, and with sorting by (duration, name) every shard process
+computes the same assignment from the same store, so no coordinator is needed.
+
+Each shard runs with its own database (``--db``). ``merge`` copies the latest
+run of every shard database into one new run of the target store, console
+messages, step timings and impact index included, so ``report``,
+``clusters`` and ``--adaptive-timeouts`` work on the whole suite again.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from .loader import TestScript
+from .logs import LogEntry
+from .runner import new_run_id
+from .store import ResultStore
+
+WINDOW = 10
+# Expected duration when the store has no history at all.
+DEFAULT_DURATION_MS = 30_000.0
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int  # 1-based
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> Shard:
+        """``"2/4"`` -> the second of four shards."""
+        index, _, count = value.partition("/")
+        try:
+            shard = cls(int(index), int(count))
+        except ValueError:
+            raise ValueError(f"shard must look like i/N, got {value!r}") from None
+        if not 1 <= shard.index <= shard.count:
+            raise ValueError(f"shard index must be between 1 and {shard.count}, got {shard.index}")
+        return shard
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def expected_durations(store: ResultStore, window: int = WINDOW) -> dict[str, float]:
+    """Script name -> median duration (ms) of its last ``window`` results."""
+    samples: dict[str, list[float]] = {}
+    for row in store.recent_results(window):
+        if row["duration_ms"] is not None:
+            samples.setdefault(row["name"], []).append(row["duration_ms"])
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def _expected(scripts: Sequence[TestScript], durations: dict[str, float]) -> dict[str, float]:
+    default = statistics.median(durations.values()) if durations else DEFAULT_DURATION_MS
+    return {script.name: durations.get(script.name, default) for script in scripts}
+
+
+def assign(scripts: Sequence[TestScript], durations: dict[str, float], count: int) -> list[list[TestScript]]:
+    """LPT partition of ``scripts`` into ``count`` shards, each in name order."""
+    expected = _expected(scripts, durations)
+    order = sorted(scripts, key=lambda s: (-expected[s.name], s.name))
+    loads = [(0.0, index) for index in range(count)]
+    shards: list[list[TestScript]] = [[] for _ in range(count)]
+    for script in order:
+        load, index = heapq.heappop(loads)
+        shards[index].append(script)
+        heapq.heappush(loads, (load + expected[script.name], index))
+    return [sorted(shard, key=lambda s: s.name) for shard in shards]
+
+
+def select(scripts: Sequence[TestScript], durations: dict[str, float], shard: Shard) -> tuple[list[TestScript], float]:
+    """This shard's scripts and their expected total duration (ms)."""
+    mine = assign(scripts, durations, shard.count)[shard.index - 1]
+    return mine, sum(_expected(mine, durations).values())
+
+
+def _latest_run(store: ResultStore):
+    run_id = store.latest_run_id()
+    return store.db.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone() if run_id else None
+
+
+def merge(target: ResultStore, shard_dbs: Sequence[Path], run_id: str | None = None) -> tuple[str, int]:
+    """Copy the latest run of each shard database into one run; returns (run id, results)."""
+    for path in shard_dbs:
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"no shard database at {path}")
+    run_id = run_id or new_run_id()
+    sources = [ResultStore(path) for path in shard_dbs]
+    try:
+        runs = [(source, _latest_run(source)) for source in sources]
+        missing = [str(source.path) for source, row in runs if row is None]
+        if missing:
+            raise LookupError(f"no run in {', '.join(missing)}")
+        builds = {row["build_hash"] for _, row in runs}
+        target.begin_run(
+            run_id,
+            min(row["started_at"] for _, row in runs),
+            builds.pop() if len(builds) == 1 else None,
+            source="merged",
+        )
+        count = 0
+        for source, row in runs:
+            names = set()
+            for result in source.results(row["run_id"]).fetchall():
+                names.add(result["name"])
+                logs = [
+                    LogEntry(log["level"], log["sample"])
+                    for log in source.logs(result["id"]) for _ in range(log["count"])
+                ]
+                target.add_result(
+                    run_id,
+                    test_id=result["test_id"],
+                    name=result["name"],
+                    status=result["status"],
+                    title=result["title"],
+                    description=result["description"],
+                    duration_ms=result["duration_ms"],
+                    started_at=result["started_at"],
+                    code=source.code(result["code_hash"]) if result["code_hash"] else None,
+                    error=result["error"],
+                    metrics={"shard_run": row["run_id"], **json.loads(result["metrics"])},
+                    extra=json.loads(result["extra"]),
+                    logs=logs,
+                    steps=source.steps(result["id"]),
+                )
+                count += 1
+            for name, modules in source.test_modules().items():
+                if name in names:
+                    target.record_modules(name, modules, run_id, replace=True)
+        target.finish_run(run_id, max(row["finished_at"] or time.time() for _, row in runs))
+        return run_id, count
+    finally:
+        for source in sources:
+            source.close()
+
+
@@ -0,0 +1,518 @@
+"""Append-only SQLite store for test results across runs.
+
+Replaces rewriting ``tmp/test_results.json`` wholesale on every run. Each run
+appends one ``runs`` row and one ``results`` row per test; script sources are
+stored once in ``code`` keyed by content hash, and browser console messages
+once in ``log_messages`` keyed by fingerprint (see ``harness.logs``) with
+results holding only references and counts. Step timings of harness runs go
+to ``steps``. Results are indexed by test id, run id, status and build hash
+so history queries stay cheap.
+
+``export_json`` streams any run back out in the TestSprite JSON shape, and
+``import_testsprite_json`` loads existing TestSprite result files.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from .config import OUTPUT_DIR, TMP_DIR
+from .hashing import app_build_hash, content_hash
+from .logs import LogEntry, count as count_logs, join_error, split_error
+from .loader import TestScript
+from .runner import CACHED, Plugin, Run, Step, TestResult
+
+DEFAULT_DB = OUTPUT_DIR / "results.db"
+LEGACY_RESULTS = TMP_DIR / "test_results.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    build_hash  TEXT,
+    source      TEXT NOT NULL DEFAULT 'harness'
+);
+CREATE TABLE IF NOT EXISTS code (
+    code_hash TEXT PRIMARY KEY,
+    code      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY,
+    run_id      TEXT NOT NULL REFERENCES runs (run_id),
+    test_id     TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    title       TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    status      TEXT NOT NULL,
+    duration_ms REAL,
+    started_at  REAL,
+    code_hash   TEXT REFERENCES code (code_hash),
+    error       TEXT NOT NULL DEFAULT '',
+    metrics     TEXT NOT NULL DEFAULT '{}',
+    extra       TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS steps (
+    result_id   INTEGER NOT NULL REFERENCES results (id),
+    position    INTEGER NOT NULL,
+    step_key    TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    error       TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (result_id, position)
+);
+CREATE TABLE IF NOT EXISTS log_messages (
+    fingerprint TEXT PRIMARY KEY,
+    level       TEXT NOT NULL,
+    message     TEXT NOT NULL,
+    sample      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS result_logs (
+    result_id   INTEGER NOT NULL REFERENCES results (id),
+    fingerprint TEXT NOT NULL REFERENCES log_messages (fingerprint),
+    position    INTEGER NOT NULL,
+    count       INTEGER NOT NULL,
+    PRIMARY KEY (result_id, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_result_logs_fingerprint ON result_logs (fingerprint);
+CREATE TABLE IF NOT EXISTS quarantine (
+    name   TEXT PRIMARY KEY,
+    since  REAL NOT NULL,
+    reason TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_modules (
+    name   TEXT NOT NULL,
+    module TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    PRIMARY KEY (name, module)
+);
+CREATE INDEX IF NOT EXISTS idx_test_modules_module ON test_modules (module);
+CREATE TABLE IF NOT EXISTS result_cache (
+    cache_key TEXT PRIMARY KEY,
+    name      TEXT NOT NULL,
+    run_id    TEXT NOT NULL REFERENCES runs (run_id)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_build ON runs (build_hash);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results (test_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id, test_id);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results (status, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_name ON results (name, started_at);
+"""
+
+
+def _iso(timestamp: float | None) -> str:
+    if timestamp is None:
+        return ""
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _timestamp(iso: str | None) -> float | None:
+    if not iso:
+        return None
+    return datetime.datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp()
+
+
+class ResultStore:
+    """Thin wrapper over the SQLite database; safe to open from several processes."""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path or DEFAULT_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- writes ------------------------------------------------------------
+
+    def begin_run(self, run_id: str, started_at: float, build_hash: str | None, source: str = "harness") -> bool:
+        """Record a run; returns False if ``run_id`` already exists."""
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO runs (run_id, started_at, build_hash, source) VALUES (?, ?, ?, ?)",
+                (run_id, started_at, build_hash, source),
+            )
+        return cursor.rowcount == 1
+
+    def finish_run(self, run_id: str, finished_at: float) -> None:
+        """Mark a run finished; later calls for the same run are ignored."""
+        with self.db:
+            self.db.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ? AND finished_at IS NULL", (finished_at, run_id)
+            )
+
+    def delete_run(self, run_id: str) -> None:
+        """Remove a run with its results; shared code and log messages stay."""
+        with self.db:
+            for table in ("steps", "result_logs"):
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE result_id IN (SELECT id FROM results WHERE run_id = ?)", (run_id,)
+                )
+            for table in ("result_cache", "results", "runs"):
+                self.db.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    def put_code(self, code: str) -> str:
+        code_hash = content_hash(code)
+        self.db.execute("INSERT OR IGNORE INTO code (code_hash, code) VALUES (?, ?)", (code_hash, code))
+        return code_hash
+
+    def add_result(
+        self,
+        run_id: str,
+        *,
+        test_id: str,
+        name: str,
+        status: str,
+        title: str = "",
+        description: str = "",
+        duration_ms: float | None = None,
+        started_at: float | None = None,
+        code: str | None = None,
+        error: str = "",
+        metrics: dict | None = None,
+        extra: dict | None = None,
+        logs: list[LogEntry] = (),
+        steps: list[Step] = (),
+    ) -> int:
+        with self.db:
+            code_hash = self.put_code(code) if code is not None else None
+            cursor = self.db.execute(
+                "INSERT INTO results (run_id, test_id, name, title, description, status, duration_ms,"
+                " started_at, code_hash, error, metrics, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, test_id, name, title, description, status, duration_ms, started_at, code_hash,
+                 error, json.dumps(metrics or {}), json.dumps(extra or {})),
+            )
+            self._add_logs(cursor.lastrowid, logs)
+            self.db.executemany(
+                "INSERT INTO steps (result_id, position, step_key, duration_ms, error) VALUES (?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, step.index, step.key, step.duration_ms, step.error) for step in steps],
+            )
+        return cursor.lastrowid
+
+    def _add_logs(self, result_id: int, logs: list[LogEntry]) -> None:
+        for position, (key, (entry, seen)) in enumerate(count_logs(logs).items()):
+            self.db.execute(
+                "INSERT OR IGNORE INTO log_messages (fingerprint, level, message, sample) VALUES (?, ?, ?, ?)",
+                (key, entry.level, entry.message, entry.text),
+            )
+            self.db.execute(
+                "INSERT INTO result_logs (result_id, fingerprint, position, count) VALUES (?, ?, ?, ?)",
+                (result_id, key, position, seen),
+            )
+
+    def quarantine(self, name: str, reason: str) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO quarantine (name, since, reason) VALUES (?, ?, ?)",
+                (name, time.time(), reason),
+            )
+
+    def release(self, name: str) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM quarantine WHERE name = ?", (name,))
+
+    def record_modules(self, name: str, modules: set[str], run_id: str, replace: bool) -> None:
+        """Store the app files a script loaded; ``replace`` drops what earlier runs recorded."""
+        with self.db:
+            if replace:
+                self.db.execute("DELETE FROM test_modules WHERE name = ?", (name,))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO test_modules (name, module, run_id) VALUES (?, ?, ?)",
+                [(name, module, run_id) for module in sorted(modules)],
+            )
+
+    def cache_result(self, cache_key: str, name: str, run_id: str) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO result_cache (cache_key, name, run_id) VALUES (?, ?, ?)",
+                (cache_key, name, run_id),
+            )
+
+    def evict(self, cache_key: str) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM result_cache WHERE cache_key = ?", (cache_key,))
+
+    # -- reads -------------------------------------------------------------
+
+    def latest_run_id(self) -> str | None:
+        row = self.db.execute("SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1").fetchone()
+        return row["run_id"] if row else None
+
+    def runs(self, limit: int = 20) -> list[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT r.*, COUNT(x.id) AS total, SUM(x.status = 'PASSED') AS passed"
+            " FROM runs r LEFT JOIN results x ON x.run_id = r.run_id"
+            " GROUP BY r.run_id ORDER BY r.started_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def results(self, run_id: str) -> Iterator[sqlite3.Row]:
+        """Rows of one run in test order, fetched lazily."""
+        return self.db.execute(
+            "SELECT * FROM results WHERE run_id = ? ORDER BY test_id, name, id", (run_id,)
+        )
+
+    def history(self, test_id: str, limit: int = 50) -> list[sqlite3.Row]:
+        """Most recent results for one test across runs, newest first."""
+        return self.db.execute(
+            "SELECT x.*, r.build_hash FROM results x JOIN runs r ON r.run_id = x.run_id"
+            " WHERE x.test_id = ? ORDER BY x.started_at DESC LIMIT ?",
+            (test_id, limit),
+        ).fetchall()
+
+    def recent_results(self, window: int = 20) -> list[sqlite3.Row]:
+        """The last ``window`` executed results of every script, grouped by name, newest first.
+
+        ``CACHED`` results repeat an earlier pass rather than observe a new one,
+        so they are left out of the history.
+        """
+        return self.db.execute(
+            "SELECT * FROM (SELECT x.*, ROW_NUMBER() OVER"
+            " (PARTITION BY x.name ORDER BY x.started_at DESC, x.id DESC) AS age"
+            " FROM results x WHERE x.status != 'CACHED')"
+            " WHERE age <= ? ORDER BY name, age",
+            (window,),
+        ).fetchall()
+
+    def quarantined(self) -> dict[str, sqlite3.Row]:
+        return {row["name"]: row for row in self.db.execute("SELECT * FROM quarantine ORDER BY name")}
+
+    def test_modules(self) -> dict[str, set[str]]:
+        """Script name -> app files it loaded, for every script with a recorded run."""
+        index: dict[str, set[str]] = {}
+        for row in self.db.execute("SELECT name, module FROM test_modules"):
+            index.setdefault(row["name"], set()).add(row["module"])
+        return index
+
+    def cached_results(self, cache_keys: list[str]) -> dict[str, sqlite3.Row]:
+        """Cache key -> the passing result recorded under it, for the keys that have one."""
+        found = {}
+        for key in cache_keys:
+            row = self.db.execute(
+                "SELECT x.*, c.cache_key FROM result_cache c"
+                " JOIN results x ON x.run_id = c.run_id AND x.name = c.name"
+                " WHERE c.cache_key = ? AND x.status = 'PASSED' ORDER BY x.id DESC LIMIT 1",
+                (key,),
+            ).fetchone()
+            if row:
+                found[key] = row
+        return found
+
+    def step_durations(self, name: str, window: int = 20) -> dict[str, list[float]]:
+        """Step key -> durations (ms) of its successful runs in the script's last ``window`` results."""
+        durations: dict[str, list[float]] = {}
+        for row in self.db.execute(
+            "SELECT s.step_key, s.duration_ms FROM steps s JOIN"
+            " (SELECT id FROM results WHERE name = ? AND status != 'CACHED'"
+            " ORDER BY started_at DESC, id DESC LIMIT ?) x"
+            " ON x.id = s.result_id WHERE s.error = ''",
+            (name, window),
+        ):
+            durations.setdefault(row["step_key"], []).append(row["duration_ms"])
+        return durations
+
+    def step_timeouts(self, name: str, window: int = 20) -> dict[str, list[float]]:
+        """Step key -> durations (ms) of its timed-out runs in the script's last ``window`` results."""
+        durations: dict[str, list[float]] = {}
+        for row in self.db.execute(
+            "SELECT s.step_key, s.duration_ms FROM steps s JOIN"
+            " (SELECT id FROM results WHERE name = ? AND status != 'CACHED'"
+            " ORDER BY started_at DESC, id DESC LIMIT ?) x"
+            " ON x.id = s.result_id WHERE s.error LIKE 'TimeoutError%'",
+            (name, window),
+        ):
+            durations.setdefault(row["step_key"], []).append(row["duration_ms"])
+        return durations
+
+    def logs(self, result_id: int) -> list[sqlite3.Row]:
+        """Console messages of one result in first-seen order, with counts."""
+        return self.db.execute(
+            "SELECT m.*, l.count FROM result_logs l JOIN log_messages m ON m.fingerprint = l.fingerprint"
+            " WHERE l.result_id = ? ORDER BY l.position",
+            (result_id,),
+        ).fetchall()
+
+    def steps(self, result_id: int) -> list[Step]:
+        """Recorded steps of one result in order, rebuilt from their keys."""
+        steps = []
+        for row in self.db.execute(
+            "SELECT * FROM steps WHERE result_id = ? ORDER BY position", (result_id,)
+        ):
+            _, action, target = row["step_key"].split(":", 2)
+            steps.append(Step(row["position"], action, target, 0.0, row["duration_ms"], row["error"]))
+        return steps
+
+    def log_groups(self, run_id: str) -> list[sqlite3.Row]:
+        """Console messages of a run grouped by fingerprint, most widespread first."""
+        return self.db.execute(
+            "SELECT m.fingerprint, m.level, m.message, COUNT(DISTINCT x.test_id) AS tests,"
+            " SUM(l.count) AS occurrences, GROUP_CONCAT(DISTINCT x.test_id) AS test_ids"
+            " FROM result_logs l JOIN results x ON x.id = l.result_id"
+            " JOIN log_messages m ON m.fingerprint = l.fingerprint"
+            " WHERE x.run_id = ? GROUP BY m.fingerprint ORDER BY tests DESC, occurrences DESC, m.fingerprint",
+            (run_id,),
+        ).fetchall()
+
+    def code(self, code_hash: str | None) -> str:
+        if code_hash is None:
+            return ""
+        row = self.db.execute("SELECT code FROM code WHERE code_hash = ?", (code_hash,)).fetchone()
+        return row["code"] if row else ""
+
+
+# ---------------------------------------------------------------------------
+# TestSprite JSON interchange
+# ---------------------------------------------------------------------------
+
+# TestSprite fields kept verbatim in ``results.extra``.
+_EXTRA_FIELDS = ("projectId", "testId", "userId", "testType", "createFrom", "testVisualization")
+
+
+def to_testsprite(store: ResultStore, row: sqlite3.Row) -> dict:
+    """One result row in the shape of a ``tmp/test_results.json`` element.
+
+    Console messages are written back from their first-seen sample, grouped
+    by message in first-seen order.
+    """
+    extra = json.loads(row["extra"])
+    logs = [(log["level"], log["sample"]) for log in store.logs(row["id"]) for _ in range(log["count"])]
+    finished = row["started_at"] + row["duration_ms"] / 1000 if row["started_at"] and row["duration_ms"] else None
+    return {
+        "projectId": extra.get("projectId", ""),
+        "testId": extra.get("testId", f"{row['run_id']}:{row['name']}"),
+        "userId": extra.get("userId", ""),
+        "title": f"{row['test_id']}-{row['title']}" if row["title"] else row["test_id"],
+        "description": row["description"],
+        "code": store.code(row["code_hash"]),
+        "testStatus": row["status"],
+        "testError": join_error(row["error"], logs),
+        "testType": extra.get("testType", "FRONTEND"),
+        "createFrom": extra.get("createFrom", "harness"),
+        "testVisualization": extra.get("testVisualization", ""),
+        "created": extra.get("created") or _iso(row["started_at"]),
+        "modified": extra.get("modified") or _iso(finished),
+    }
+
+
+def export_json(store: ResultStore, out: IO[str], run_id: str | None = None) -> int:
+    """Stream a run as a TestSprite results array; returns the result count."""
+    run_id = run_id or store.latest_run_id()
+    count = 0
+    out.write("[")
+    for row in store.results(run_id) if run_id else ():
+        out.write(",\n  " if count else "\n  ")
+        out.write(json.dumps(to_testsprite(store, row), ensure_ascii=False))
+        count += 1
+    out.write("\n]\n" if count else "]\n")
+    return count
+
+
+def script_name(title: str) -> str:
+    """Script stem TestSprite saves a test under: ``TC006-Jest-DOM x`` -> ``TC006_Jest_DOM_x``."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", title).strip("_")
+
+
+def import_testsprite_json(store: ResultStore, path: Path = LEGACY_RESULTS) -> str | None:
+    """Load a TestSprite results file as one run.
+
+    The run id is derived from the file content, so importing the same file
+    twice is a no-op (returns ``None``). If an item cannot be imported the
+    partial run is removed, so a retry starts over.
+    """
+    raw = path.read_bytes()
+    items = json.loads(raw)
+    run_id = "testsprite-" + content_hash(raw)[:12]
+    created = [t for t in (_timestamp(item.get("created")) for item in items) if t is not None]
+    if not store.begin_run(run_id, min(created, default=0.0), None, source="testsprite"):
+        return None
+
+    try:
+        for item in items:
+            test_id, _, title = item["title"].partition("-")
+            started = _timestamp(item.get("created"))
+            modified = _timestamp(item.get("modified"))
+            extra = {key: item[key] for key in _EXTRA_FIELDS if key in item}
+            extra.update(created=item.get("created", ""), modified=item.get("modified", ""))
+            error, logs = split_error(item.get("testError", ""))
+            store.add_result(
+                run_id,
+                test_id=test_id,
+                name=script_name(item["title"]),
+                title=title,
+                description=item.get("description", ""),
+                status=item["testStatus"],
+                duration_ms=(modified - started) * 1000 if started and modified else None,
+                started_at=started,
+                code=item.get("code", ""),
+                error=error,
+                extra=extra,
+                logs=logs,
+            )
+    except BaseException:
+        store.delete_run(run_id)
+        raise
+    store.finish_run(run_id, max((_timestamp(i.get("modified")) or 0.0 for i in items), default=0.0))
+    return run_id
+
+
+class StorePlugin(Plugin):
+    """Runner plugin appending every result to a ``ResultStore`` as it finishes.
+
+    ``CACHED`` results seeded into the run before it starts are stored at the
+    start, without code or steps since nothing was executed.
+    """
+
+    def __init__(self, store: ResultStore, build_hash: str | None = None):
+        self.store = store
+        self.build_hash = build_hash
+        self.run_id: str | None = None
+
+    async def on_run_start(self, run: Run) -> None:
+        self.run_id = run.run_id
+        self.store.begin_run(run.run_id, run.started_at, self.build_hash or app_build_hash())
+        for result in run.results:
+            if result.status != CACHED:
+                continue
+            self.store.add_result(
+                run.run_id,
+                test_id=result.test_id,
+                name=result.name,
+                title=result.title,
+                status=result.status,
+                duration_ms=result.duration_ms,
+                started_at=result.started_at,
+                metrics=result.metrics,
+            )
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        self.store.add_result(
+            self.run_id,
+            test_id=result.test_id,
+            name=result.name,
+            title=result.title,
+            status=result.status,
+            duration_ms=result.duration_ms,
+            started_at=result.started_at,
+            code=test.source(),
+            error=result.error,
+            metrics=result.metrics,
+            steps=result.steps,
+        )
+
+    async def on_run_end(self, run: Run) -> None:
+        self.store.finish_run(run.run_id, time.time())
@@ -0,0 +1 @@
+"""Unit tests for the harness's pure logic; none of them start a browser."""
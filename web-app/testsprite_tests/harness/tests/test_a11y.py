@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+from harness.a11y import A11ySnapshots, Node, diff_runs, expect, parse_aria, tree_for
+from harness.loader import TestScript
+from harness.runner import Step
+
+SNAPSHOT = """\
+- banner:
+  - link "Nexa Manager":
+    - /url: /
+  - navigation:
+    - link "Dashboard" [current]:
+      - /url: /dashboard
+    - link "Invoices 12"
+- main:
+  - heading "Welcome back" [level=1]
+  - text: "Signed in as: ada@example.com"
+  - checkbox "Remember me" [checked]
+  - button "Sign \\"out\\""
+  - paragraph: Last login today
+"""
+
+
+def test_parse_aria_builds_the_tree():
+    tree = parse_aria(SNAPSHOT)
+    banner, main = tree.children
+    assert (banner.role, main.role) == ("banner", "main")
+    assert banner.children[0].attrs == {"url": "/"}
+    current = tree.find("link", "Dashboard")[0]
+    assert current.attrs == {"current": "true", "url": "/dashboard"}
+    assert tree.find("heading")[0].attrs == {"level": "1"}
+    assert tree.find("checkbox")[0].attrs == {"checked": "true"}
+    assert tree.find("button")[0].name == 'Sign "out"'
+    assert [child.name for child in main.children if child.role == "text"] == ["Signed in as: ada@example.com"]
+    assert tree.find("paragraph")[0].children == [Node("text", "Last login today")]
+
+
+def test_round_trip_through_dict():
+    tree = parse_aria(SNAPSHOT)
+    assert Node.from_dict(json.loads(json.dumps(tree.to_dict()))) == tree
+
+
+def test_outline_generalises_numbers():
+    assert '    link "Invoices N"' in parse_aria(SNAPSHOT).outline()
+
+
+def test_expectations_collect_every_failure():
+    tree = parse_aria(SNAPSHOT)
+    assert len(expect(tree).present("heading", "welcome", exact=False).count("link", 3).check()) == 2
+    with pytest.raises(AssertionError) as failure:
+        expect(tree).present("button", "Sign in").absent("checkbox").check()
+    assert "Sign in" in str(failure.value) and "checkbox" in str(failure.value)
+
+
+def _write(root, run, test, route, snapshot):
+    path = root / run / test / f"{route.strip('/') or 'root'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"route": route, "tree": parse_aria(snapshot).to_dict()}))
+
+
+def test_diff_runs_reports_structural_changes(tmp_path):
+    _write(tmp_path, "run1", "TC001_Login", "/", "- button \"Sign in\"\n")
+    _write(tmp_path, "run2", "TC001_Login", "/", "- button \"Sign in\"\n- link \"Forgot password\"\n")
+    _write(tmp_path, "run2", "TC001_Login", "/dashboard", "- heading \"Dashboard\"\n")
+    diffs = diff_runs("run1", "run2", tmp_path)
+    assert [(d.route, d.status, d.lines) for d in diffs] == [
+        ("/", "changed", ['+link "Forgot password"']),
+        ("/dashboard", "added", []),
+    ]
+
+
+class FakeLocator:
+    def __init__(self, page):
+        self.page = page
+
+    async def aria_snapshot(self, timeout=None):
+        self.page.snapshots += 1
+        return self.page.aria
+
+
+class FakePage:
+    url = "http://localhost:3001/dashboard"
+
+    def __init__(self, aria):
+        self.aria = aria
+        self.snapshots = 0
+
+    def locator(self, selector):
+        return FakeLocator(self)
+
+
+def test_failed_step_drops_the_stale_snapshot(tmp_path):
+    plugin = A11ySnapshots(tmp_path)
+    test = TestScript(tmp_path / "TC001_Login.py")
+    page = FakePage("- button \"Sign in\"\n")
+
+    async def run():
+        await plugin.on_test_start(test)
+        await plugin.on_step_end(test, Step(0, "click", "button", 0.0, page=page))
+        assert (await tree_for(page)).find("button", "Sign in")
+        page.aria = "- heading \"Dashboard\"\n"
+        await plugin.on_step_end(test, Step(1, "click", "a", 0.0, error="Timeout 5000ms exceeded", page=page))
+        return await tree_for(page)
+
+    tree = asyncio.run(run())
+    assert tree.find("heading", "Dashboard") and not tree.find("button")
+    assert page.snapshots == 2
+
+
+def test_lanes_keep_each_others_snapshots(tmp_path):
+    first, second = A11ySnapshots(tmp_path), A11ySnapshots(tmp_path)
+    test = TestScript(tmp_path / "TC001_Login.py")
+    page = FakePage("- button \"Sign in\"\n")
+
+    async def run():
+        await first.on_test_start(test)
+        await first.on_step_end(test, Step(0, "click", "button", 0.0, page=page))
+        # Another lane starts its next test while the first is mid-test.
+        await second.on_test_start(test)
+        return await tree_for(page)
+
+    asyncio.run(run())
+    assert page.snapshots == 1
@@ -0,0 +1,39 @@
+import pytest
+
+from harness.artifacts import ArtifactStore
+
+
+def _store(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    store.add("run1", "TC001_Login", "failure.jpeg", b"frame")
+    store.add("run1", "TC002_Logout", "failure.jpeg", b"frame")
+    store.flush("run1")
+    return store
+
+
+def test_identical_artifacts_share_one_blob(tmp_path):
+    stats = _store(tmp_path).stats()
+    assert (stats.artifacts, stats.blobs, stats.deduplicated_bytes) == (2, 1, 5)
+
+
+def test_checkout_copies_so_edits_do_not_reach_the_store(tmp_path):
+    store = _store(tmp_path)
+    out = tmp_path / "out"
+    assert store.checkout("run1", out) == 2
+    (out / "TC001_Login" / "failure.jpeg").write_bytes(b"edited")
+    assert (out / "TC002_Logout" / "failure.jpeg").read_bytes() == b"frame"
+
+
+def test_linked_checkout_is_read_only(tmp_path):
+    store = _store(tmp_path)
+    out = tmp_path / "out"
+    store.checkout("run1", out, test="TC001_Login", link=True)
+    target = out / "TC001_Login" / "failure.jpeg"
+    assert not target.stat().st_mode & 0o222
+
+
+def test_checkout_of_an_unknown_run_raises(tmp_path):
+    store = _store(tmp_path)
+    with pytest.raises(LookupError):
+        store.checkout("missing", tmp_path / "out")
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from harness.assertions import Expectations
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run js/batch_assert.js")
+
+# Just enough DOM for batch_assert.js: one visible heading per text.
+_DOM = """
+const elements = %s.map(text => ({
+  textContent: text,
+  children: [],
+  getBoundingClientRect: () => ({ width: 100, height: 20 }),
+  checkVisibility: () => true,
+}));
+globalThis.document = { querySelectorAll: () => elements };
+globalThis.getComputedStyle = () => ({ visibility: 'visible' });
+"""
+
+
+class NodePage:
+    """Evaluates page scripts in node against headings with the given texts."""
+
+    def __init__(self, *texts):
+        self.texts = list(texts)
+
+    async def evaluate(self, script, arg):
+        program = _DOM % json.dumps(self.texts) + f"console.log(JSON.stringify(({script})({json.dumps(arg)})));"
+        output = subprocess.run(["node", "-e", program], check=True, capture_output=True, text=True).stdout
+        return json.loads(output)
+
+
+def _passed(page, build):
+    outcomes = asyncio.run(build(Expectations(page)).evaluate())
+    return [outcome.passed for outcome in outcomes]
+
+
+def test_text_substring_match_ignores_case():
+    page = NodePage("Welcome back, Ada")
+    assert _passed(page, lambda e: e.text("h1", "welcome BACK").text("h1", "Goodbye")) == [True, False]
+
+
+def test_exact_text_match_keeps_case():
+    page = NodePage("Welcome  back")
+    assert _passed(page, lambda e: e.text("h1", "Welcome back", exact=True)
+                   .text("h1", "welcome back", exact=True)) == [True, False]
+
+
+def test_visible_substring_match_ignores_case():
+    page = NodePage("Dashboard")
+    assert _passed(page, lambda e: e.visible("dashBOARD", exact=False).visible("dashboard")) == [True, False]
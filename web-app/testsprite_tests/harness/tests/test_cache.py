@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import shutil
+import sys
+
+from harness import flaky
+from harness.cache import fixtures_hash, partition
+from harness.clusters import failures
+from harness.config import TESTS_DIR
+from harness.hashing import app_build_hash
+from harness.loader import TestScript
+from harness.report import build_report, render_markdown
+from harness.runner import CACHED, Run
+from harness.store import ResultStore, StorePlugin
+
+
+def _tree(tmp_path):
+    (tmp_path / "fixtures" / "audio").mkdir(parents=True)
+    (tmp_path / "fixtures" / "audio" / "voice.wav").write_bytes(b"RIFF")
+    shutil.copytree(TESTS_DIR / "harness", tmp_path / "harness",
+                    ignore=shutil.ignore_patterns("__pycache__", "tests"))
+    return tmp_path
+
+
+def test_key_is_stable_after_importing_the_harness(tmp_path, monkeypatch):
+    tree = _tree(tmp_path)
+    before = fixtures_hash(tree)
+
+    # Import the copy so the interpreter writes bytecode next to it.
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    monkeypatch.syspath_prepend(str(tree))
+    saved = {name: module for name, module in sys.modules.items() if name.split(".")[0] == "harness"}
+    for name in saved:
+        del sys.modules[name]
+    try:
+        importlib.import_module("harness.assertions")
+        importlib.import_module("harness.console")
+    finally:
+        for name in [name for name in sys.modules if name.split(".")[0] == "harness"]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+    assert list(tree.glob("harness/__pycache__/*.pyc"))
+
+    assert fixtures_hash(tree) == before
+
+
+def test_key_changes_with_harness_sources_and_fixtures(tmp_path):
+    tree = _tree(tmp_path)
+    before = fixtures_hash(tree)
+    (tree / "harness" / "js" / "extra.js").write_text("window.x = 1;\n")
+    after_js = fixtures_hash(tree)
+    (tree / "fixtures" / "audio" / "voice.wav").write_bytes(b"RIFF2")
+    assert len({before, after_js, fixtures_hash(tree)}) == 3
+
+
+def test_key_ignores_harness_unit_tests(tmp_path):
+    tree = _tree(tmp_path)
+    before = fixtures_hash(tree)
+    (tree / "harness" / "tests").mkdir()
+    (tree / "harness" / "tests" / "test_new.py").write_text("def test(): pass\n")
+    assert fixtures_hash(tree) == before
+
+
+def test_app_hash_follows_sources_when_a_stale_dist_exists(tmp_path):
+    web_app = tmp_path / "web-app"
+    (web_app / "src").mkdir(parents=True)
+    (web_app / "dist" / "assets").mkdir(parents=True)
+    (web_app / "src" / "App.jsx").write_text("export default () => 'v1';")
+    (web_app / "dist" / "assets" / "index.js").write_text("old build")
+    (tmp_path / "package-lock.json").write_text("{}")
+    before = app_build_hash(web_app)
+
+    (web_app / "src" / "App.jsx").write_text("export default () => 'v2';")
+    edited = app_build_hash(web_app)
+    assert edited != before
+
+    (web_app / "dist" / "assets" / "index.js").write_text("rebuilt")
+    (web_app / "src" / "App.test.jsx").write_text("test('x', () => {});")
+    assert app_build_hash(web_app) == edited
+
+    (tmp_path / "package-lock.json").write_text('{"lockfileVersion": 3}')
+    assert app_build_hash(web_app) != edited
+
+
+def test_cached_results_are_stored_and_reported_but_not_history(tmp_path):
+    script = TestScript(tmp_path / "TC001_Login.py")
+    with ResultStore(tmp_path / "results.db") as store:
+        store.begin_run("first", 1.0, None)
+        store.add_result("first", test_id="TC001", name=script.name, title="Login", status="PASSED",
+                         duration_ms=2500.0, started_at=1.0)
+        store.finish_run("first", 2.0)
+        store.cache_result("key", script.name, "first")
+
+        to_run, cached = partition([script], store, {script.name: "key"})
+        assert to_run == []
+        run = Run(run_id="second", started_at=10.0, results=cached)
+        plugin = StorePlugin(store, "build")
+        asyncio.run(plugin.on_run_start(run))
+        asyncio.run(plugin.on_run_end(run))
+
+        [row] = store.results("second")
+        assert row["status"] == CACHED
+        report = build_report(store, "second", features=[])
+        [test] = report.tests
+        assert test.status == "cached"
+        assert "Passed in run first" in test.findings
+        assert "♻️ Cached" in render_markdown(report, tmp_path)
+        assert failures(store, "second") == []
+        [stats] = flaky.analyze(store)
+        assert stats.statuses == ["PASSED"]
@@ -0,0 +1,38 @@
+from harness.clusters import BANDS, NUM_PERM, ROWS, Failure, cluster, minhash, signature, similarity
+
+
+def _failure(index, sketch, error="AssertionError"):
+    return Failure(index, f"TC{index:03d}", f"TC{index:03d}_Test", error, {}, tuple(sketch))
+
+
+def test_minhash_similarity_estimates_jaccard():
+    shared = {f"token{i}" for i in range(100)}
+    assert similarity(minhash(shared), minhash(shared)) == 1.0
+    assert similarity(minhash(shared), minhash({f"other{i}" for i in range(100)})) < 0.2
+
+
+def test_signature_generalises_numbers():
+    assert signature("Timeout 60000ms exceeded.", []) == signature("Timeout 30000ms exceeded.", [])
+
+
+def test_pairs_behind_an_unrelated_first_member_are_compared():
+    # All three share band 0 only. The first is unrelated; the other two
+    # agree on 3 of 4 rows in every other band (similarity 49/64).
+    unrelated = [0] * ROWS + [1_000 + i for i in range(NUM_PERM - ROWS)]
+    left = [0] * ROWS + [2_000 + i for i in range(NUM_PERM - ROWS)]
+    right = list(left)
+    for band in range(1, BANDS):
+        right[band * ROWS] += 10_000
+    assert similarity(tuple(left), tuple(right)) >= 0.5
+
+    clusters = cluster([_failure(1, unrelated), _failure(2, left), _failure(3, right)])
+
+    assert [c.test_ids for c in clusters] == [["TC002", "TC003"], ["TC001"]]
+
+
+def test_identical_failures_cluster_together():
+    error = "AssertionError: Test plan execution failed: generic failure assertion."
+    sketch = minhash(signature(error, []))
+    other = minhash(signature("TimeoutError: Timeout 5000ms exceeded waiting for locator", []))
+    clusters = cluster([_failure(1, sketch, error), _failure(2, other), _failure(3, sketch, error)])
+    assert [c.test_ids for c in clusters] == [["TC001", "TC003"], ["TC002"]]
@@ -0,0 +1,80 @@
+import json
+
+from harness.coverage import build_report, interval_bytes, merge_intervals, used_intervals
+
+
+def _function(*ranges):
+    return {"ranges": [{"startOffset": s, "endOffset": e, "count": c} for s, e, c in ranges]}
+
+
+def test_used_intervals_inner_range_overrides_parent():
+    # Module top level ran; a function inside it never did.
+    functions = [_function((0, 100, 1)), _function((20, 40, 0))]
+    assert used_intervals(functions) == [(0, 20), (40, 100)]
+
+
+def test_used_intervals_inner_executed_block_in_unexecuted_function():
+    functions = [_function((0, 100, 0), (10, 30, 2))]
+    assert used_intervals(functions) == [(10, 30)]
+
+
+def test_merge_intervals_and_bytes():
+    merged = merge_intervals([(5, 10), (0, 6), (20, 25)])
+    assert merged == [(0, 10), (20, 25)]
+    assert interval_bytes(merged) == 15
+
+
+def _write_raw(raw_dir, test, entries):
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    (raw_dir / f"{test}.json").write_text(json.dumps({"test": test, "entries": entries}))
+
+
+def _entry(route, module, size, ranges, first_load=True):
+    return {"route": route, "module": module, "kind": "js", "size": size, "used": interval_bytes(ranges),
+            "ranges": ranges, "downloaded": True, "first_load": first_load}
+
+
+def test_build_report_ranks_executed_modules_by_unexecuted_bytes(tmp_path):
+    raw = tmp_path / "raw"
+    _write_raw(raw, "TC001", [
+        _entry("/", "src/features/email/EmailComposer.jsx", 10_000, [[0, 1_000]]),
+        _entry("/", "src/features/calendar/Calendar.jsx", 4_000, [[0, 3_000]]),
+        _entry("/", "src/lib/fully-used.js", 2_000, [[0, 2_000]]),
+    ])
+    _write_raw(raw, "TC002", [
+        # Overlaps the range that ran on "/" by 500 bytes.
+        _entry("/login", "src/features/email/EmailComposer.jsx", 10_000, [[500, 2_500]]),
+    ])
+
+    report = build_report(raw)
+
+    modules = {m["module"]: m for m in report["modules"]}
+    assert list(modules) == ["src/features/email/EmailComposer.jsx", "src/features/calendar/Calendar.jsx"]
+    email = modules["src/features/email/EmailComposer.jsx"]
+    # Per load, not per route: what ran on no first-load route (the union
+    # [0, 2500) of both routes' ranges ran).
+    assert email["bytes_saved"] == 7_500
+    assert email["size"] == 10_000
+    assert email["first_load_routes"] == ["/", "/login"]
+    assert modules["src/features/calendar/Calendar.jsx"]["bytes_saved"] == 1_000
+
+
+def test_build_report_ignores_routes_after_first_load(tmp_path):
+    raw = tmp_path / "raw"
+    _write_raw(raw, "TC001", [
+        _entry("/", "src/App.jsx", 1_000, [[0, 1_000]]),
+        _entry("/dashboard", "src/features/dashboard/Chart.jsx", 5_000, [], first_load=False),
+    ])
+
+    assert build_report(raw)["modules"] == []
+
+
+def test_build_report_unions_ranges_across_tests_of_a_route(tmp_path):
+    raw = tmp_path / "raw"
+    _write_raw(raw, "TC001", [_entry("/", "src/features/email/Inbox.jsx", 1_000, [[0, 300]])])
+    _write_raw(raw, "TC002", [_entry("/", "src/features/email/Inbox.jsx", 1_000, [[600, 900]])])
+
+    report = build_report(raw)
+
+    assert report["routes"]["/"]["used_bytes"] == 600
+    assert report["modules"][0]["bytes_saved"] == 400
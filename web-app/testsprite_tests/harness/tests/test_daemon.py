@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+import pytest
+
+from harness import daemon
+
+
+async def _echo(reader, writer):
+    line = await reader.readline()
+    writer.write(json.dumps({"event": "done", "echo": json.loads(line)}).encode() + b"\n")
+    await writer.drain()
+    writer.close()
+
+
+async def _roundtrip(socket_path):
+    assert not await daemon.running(socket_path)
+    server, address = await daemon.start_server(_echo, socket_path)
+    try:
+        assert await daemon.running(socket_path)
+        events = [event async for event in daemon.request({"command": "status"}, socket_path)]
+    finally:
+        server.close()
+        await server.wait_closed()
+    return address, events
+
+
+def test_loopback_fallback_without_unix_sockets(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "UNIX_SOCKETS", False)
+    socket_path = tmp_path / "daemon.sock"
+    address, events = asyncio.run(_roundtrip(socket_path))
+    port = daemon.port_path(socket_path).read_text()
+    assert address == f"127.0.0.1:{port}"
+    assert events == [{"event": "done", "echo": {"command": "status"}}]
+
+
+@pytest.mark.skipif(not daemon.UNIX_SOCKETS, reason="needs Unix sockets")
+def test_unix_socket(tmp_path):
+    address, events = asyncio.run(_roundtrip(tmp_path / "daemon.sock"))
+    assert address == str(tmp_path / "daemon.sock")
+    assert events[0]["echo"] == {"command": "status"}
@@ -0,0 +1,43 @@
+import math
+from collections import Counter
+from pathlib import Path
+
+from harness.flaky import MIN_RUNS, TestStats, entropy, failure_mode, select_lane
+from harness.loader import TestScript
+
+
+def test_entropy_of_a_single_mode_is_positive_zero():
+    value = entropy(Counter({"TimeoutError": 4}))
+    assert value == 0.0 and math.copysign(1.0, value) == 1.0
+
+
+def test_entropy_of_two_even_modes_is_one_bit():
+    assert entropy(Counter({"TimeoutError": 2, "AssertionError": 2})) == 1.0
+    assert entropy(Counter()) == 0.0
+
+
+def test_failure_mode_prefers_the_exception_type():
+    error = "Traceback (most recent call last):\n  File \"x.py\", line 1\nplaywright._impl._errors.TimeoutError: Timeout"
+    assert failure_mode(error) == "TimeoutError"
+
+
+def test_flip_rate():
+    stats = TestStats("TC001_Login", "TC001", ["PASSED", "FAILED", "PASSED", "PASSED", "PASSED"])
+    assert stats.flip_rate == 0.5
+
+
+def test_duration_variance_alone_quarantines():
+    stats = TestStats("TC001_Login", "TC001", ["PASSED"] * MIN_RUNS, durations=[1_000, 1_000, 1_000, 1_000, 30_000])
+    assert stats.flip_rate == 0.0 and stats.mode_entropy == 0.0
+    assert [reason.split(" ")[0] for reason in stats.reasons] == ["duration"]
+
+    steady = TestStats("TC001_Login", "TC001", ["PASSED"] * MIN_RUNS, durations=[1_000, 1_100, 900, 1_050, 950])
+    assert steady.reasons == []
+
+
+def test_select_lane_matches_matrix_names():
+    scripts = [TestScript(Path("TC001_Login.py")), TestScript(Path("TC002_Logout.py"))]
+    quarantined = {"TC001_Login[webkit]"}
+    assert [s.name for s in select_lane(scripts, quarantined, "main")] == ["TC002_Logout"]
+    assert [s.name for s in select_lane(scripts, quarantined, "quarantine")] == ["TC001_Login"]
+    assert len(select_lane(scripts, quarantined, "all")) == 2
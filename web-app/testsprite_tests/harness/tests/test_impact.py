@@ -0,0 +1,43 @@
+from harness.config import TESTS_DIR
+from harness.impact import select
+from harness.loader import TestScript
+
+SCRIPTS = [TestScript(TESTS_DIR / f"{name}.py") for name in ("TC001_Login", "TC002_Dashboard", "TC003_New")]
+INDEX = {
+    "TC001_Login": {"src/pages/Login.jsx", "src/lib/supabaseClient.js"},
+    "TC002_Dashboard": {"src/pages/Dashboard.jsx", "src/lib/supabaseClient.js"},
+}
+
+
+def _selected(changed):
+    return [script.name for script in select(SCRIPTS, changed, INDEX).scripts]
+
+
+def test_changed_module_selects_the_scripts_that_loaded_it():
+    selection = select(SCRIPTS, ["src/pages/Dashboard.jsx"], INDEX)
+    assert [s.name for s in selection.scripts] == ["TC002_Dashboard", "TC003_New"]
+    assert selection.why(SCRIPTS[1]) == ["src/pages/Dashboard.jsx"]
+    assert selection.why(SCRIPTS[2]) == ["no recorded run"]
+    assert _selected(["src/lib/supabaseClient.js"]) == ["TC001_Login", "TC002_Dashboard", "TC003_New"]
+
+
+def test_changed_script_selects_itself():
+    assert _selected(["testsprite_tests/TC001_Login.py"]) == ["TC001_Login", "TC003_New"]
+
+
+def test_shared_file_selects_everything():
+    selection = select(SCRIPTS, ["src/App.jsx", "README.md"], INDEX)
+    assert selection.full and len(selection.scripts) == 3
+    assert select(SCRIPTS, ["testsprite_tests/harness/runner.py"], INDEX).full
+
+
+def test_unrelated_files_select_only_unknown_scripts():
+    changed = [
+        "src/pages/__tests__/Login.test.jsx",
+        "docs/guide.md",
+        "testsprite_tests/harness/README.md",
+        "testsprite_tests/harness/tests/test_impact.py",
+    ]
+    selection = select(SCRIPTS, changed, INDEX)
+    assert not selection.full
+    assert [s.name for s in selection.scripts] == ["TC003_New"]
@@ -0,0 +1,20 @@
+from harness.logs import LogEntry, normalize
+
+
+def test_normalize_strips_origins_versions_and_source_positions():
+    text = ("Error at http://localhost:3001/src/services/websocketService.js?t=1712:55:0 "
+            "(http://localhost:3001/node_modules/.vite/deps/chunk-ABC.js?v=9f3e2a1b:1234:12)")
+    assert normalize(text) == "Error at /src/services/websocketService.js (/node_modules/.vite/deps/chunk-ABC.js)"
+    assert normalize("warn @ /src/utils/Logger.ts:25:14") == "warn @ /src/utils/Logger.ts"
+
+
+def test_normalize_keeps_times_and_ports_in_the_message():
+    assert normalize("Reconnect scheduled at 12:30:45") == "Reconnect scheduled at 12:30:45"
+    assert normalize("Connecting to port:8080") == "Connecting to port:8080"
+    assert normalize("ws://localhost:8080/ws closed at 09:15") == "ws://localhost:8080/ws closed at 09:15"
+
+
+def test_distinct_times_keep_distinct_fingerprints():
+    first = LogEntry("ERROR", "Sync failed at 12:30:45")
+    second = LogEntry("ERROR", "Sync failed at 12:31:02")
+    assert first.fingerprint != second.fingerprint
@@ -0,0 +1,88 @@
+import asyncio
+
+from harness import media
+from harness.config import JS_DIR
+from harness.loader import TestScript
+from harness.profiles import LaunchProfile, ProfilePlugin
+from harness.runner import TestResult
+
+
+class FakeVoicePage:
+    """Plays the part of js/voice_probe.js and the app's floating microphone."""
+
+    def __init__(self, answers=True):
+        self.answers = answers
+        self.queue = []
+        self.results = []
+        self.clicks = []
+
+    async def evaluate(self, expression, arg=None):
+        if "say(command)" in expression:
+            self.queue.append(arg)
+        elif "last()" in expression:
+            return self.results[-1] if self.results else None
+        elif "drain()" in expression:
+            drained, self.results = self.results, []
+            return drained
+
+    async def click(self, selector, timeout=None):
+        self.clicks.append(selector)
+        if self.answers and self.queue:
+            command = self.queue.pop(0)
+            self.results.append({"command": command, "latency_ms": 10.0 * len(command), "via": "toast",
+                                 "response": "Navigating to " + command})
+
+    async def wait_for_function(self, expression, timeout=None):
+        if self.queue:
+            raise TimeoutError(expression)
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.pages = [page]
+
+
+def test_committed_fixture_covers_the_voice_flows():
+    commands = media.load_commands()
+    assert commands["TC014"] and commands["TC017"]
+
+
+def test_load_commands_without_fixture(tmp_path):
+    assert media.load_commands(tmp_path / "missing.json") == {}
+
+
+def test_fixture_commands_populate_voice_metrics():
+    profile = LaunchProfile("fake-media", init_scripts=[JS_DIR / "voice_probe.js"],
+                            voice_commands={"TC017": ["go to dashboard", "open clients"]})
+    plugin = ProfilePlugin(profile)
+    test = TestScript(JS_DIR.parent.parent / "TC017_Voice_Assistant_Command_Handling_and_Provider_Integration.py")
+    page = FakeVoicePage()
+    result = TestResult(test.test_id, test.name, test.title, "FAILED", 0.0, 0.0)
+
+    async def run():
+        await plugin.on_test_start(test)
+        await plugin.on_context_close(test, FakeContext(page))
+        await plugin.on_test_end(test, result)
+
+    asyncio.run(run())
+    assert page.clicks == [media.MIC_BUTTON, media.MIC_BUTTON]
+    voice = result.metrics["voice"]
+    assert [c["command"] for c in voice["commands"]] == ["go to dashboard", "open clients"]
+    assert voice["max_latency_ms"] == 150.0
+
+
+def test_unanswered_command_leaves_metrics_empty():
+    profile = LaunchProfile("fake-media", init_scripts=[JS_DIR / "voice_probe.js"],
+                            voice_commands={"TC014": ["go to dashboard"]})
+    plugin = ProfilePlugin(profile)
+    test = TestScript(JS_DIR.parent.parent / "TC014_Verify_Voice_Assistant_Mocks_and_UI_Overlays.py")
+    result = TestResult(test.test_id, test.name, test.title, "FAILED", 0.0, 0.0)
+
+    async def run():
+        await plugin.on_test_start(test)
+        await plugin.on_context_close(test, FakeContext(FakeVoicePage(answers=False)))
+        await plugin.on_test_end(test, result)
+
+    asyncio.run(run())
+    assert "voice" not in result.metrics
+    assert result.metrics["profile"] == "fake-media"
@@ -0,0 +1,25 @@
+from harness.logs import LogEntry
+from harness.report import build_report
+from harness.store import ResultStore
+
+GOTRUE = "Multiple GoTrueClient instances detected in the same browser context."
+WEBSOCKET = "WebSocket connection to 'ws://localhost:8080/' failed"
+
+
+def _report(tmp_path, logs):
+    with ResultStore(tmp_path / "results.db") as store:
+        store.begin_run("run", 0.0, None)
+        store.add_result("run", test_id="TC001", name="TC001_Login", title="Login", status="PASSED", logs=logs)
+        return build_report(store, "run", features=[])
+
+
+def test_warning_level_issue_keeps_a_passing_test_passed(tmp_path):
+    report = _report(tmp_path, [LogEntry("WARNING", GOTRUE)])
+    assert [test.status for test in report.tests] == ["passed"]
+    # Still listed among the run's issues.
+    assert [issue.key for issue, _ in report.issues] == ["gotrue"]
+
+
+def test_error_level_issue_makes_a_passing_test_partial(tmp_path):
+    report = _report(tmp_path, [LogEntry("WARNING", GOTRUE), LogEntry("ERROR", WEBSOCKET)])
+    assert [test.status for test in report.tests] == ["partial"]
@@ -0,0 +1,41 @@
+import asyncio
+
+from harness.runner import Plugin, _active, _current, _Dispatcher
+
+
+class Broken(Plugin):
+    def configure_launch(self, test, options):
+        raise RuntimeError("plugin bug")
+
+
+class Headful(Plugin):
+    def configure_launch(self, test, options):
+        options["headless"] = False
+
+
+def test_configure_hooks_are_isolated_from_plugin_errors():
+    dispatcher = _Dispatcher([Broken(), Headful()])
+    assert dispatcher.configure("configure_launch", {"headless": True}) == {"headless": False}
+
+
+def test_abandoned_task_loses_its_dispatcher_when_the_test_ends():
+    dispatcher = _Dispatcher([])
+    seen = []
+
+    async def abandoned(release):
+        seen.append(_current())
+        await release.wait()
+        seen.append(_current())
+
+    async def run():
+        release = asyncio.Event()
+        token = _active.set(dispatcher)
+        task = asyncio.ensure_future(abandoned(release))  # copies the context, as run_one's task does
+        _active.reset(token)
+        await asyncio.sleep(0)
+        dispatcher.closed = True
+        release.set()
+        await task
+
+    asyncio.run(run())
+    assert seen == [dispatcher, None]
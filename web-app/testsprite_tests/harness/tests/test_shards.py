@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from harness.loader import TestScript
+from harness.runner import Step
+from harness.shards import DEFAULT_DURATION_MS, Shard, assign, merge, select
+from harness.store import ResultStore
+
+
+def _scripts(*names):
+    return [TestScript(Path(f"{name}.py")) for name in names]
+
+
+def _names(shard):
+    return [script.name for script in shard]
+
+
+def test_parse_shard():
+    assert str(Shard.parse("2/4")) == "2/4"
+    for value in ("0/4", "5/4", "x/4", "2"):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+def test_assign_places_longest_first_on_the_least_loaded_shard():
+    durations = {"TC001_A": 8, "TC002_B": 7, "TC003_C": 6, "TC004_D": 5, "TC005_E": 4}
+    shards = assign(_scripts(*durations), durations, 2)
+    # 8 -> 1, 7 -> 2, 6 -> 2 (13), 5 -> 1 (13), 4 -> 1 on the tie.
+    assert [_names(shard) for shard in shards] == [["TC001_A", "TC004_D", "TC005_E"], ["TC002_B", "TC003_C"]]
+
+
+def test_assign_is_independent_of_input_order():
+    durations = {"TC001_A": 3, "TC002_B": 3, "TC003_C": 3}
+    scripts = _scripts(*durations)
+    assert assign(scripts, durations, 2) == assign(list(reversed(scripts)), durations, 2)
+
+
+def test_scripts_without_history_count_as_the_median():
+    scripts, total = select(_scripts("TC001_A", "TC002_B", "TC003_New"), {"TC001_A": 10, "TC002_B": 30}, Shard(1, 1))
+    assert _names(scripts) == ["TC001_A", "TC002_B", "TC003_New"]
+    assert total == 10 + 30 + 20
+    assert select(_scripts("TC001_A"), {}, Shard(1, 1))[1] == DEFAULT_DURATION_MS
+
+
+def test_merge_copies_the_latest_run_of_every_shard(tmp_path):
+    for index, status in ((1, "PASSED"), (2, "FAILED")):
+        with ResultStore(tmp_path / f"shard{index}.db") as shard:
+            shard.begin_run(f"run{index}", float(index), "build")
+            shard.add_result(f"run{index}", test_id=f"TC00{index}", name=f"TC00{index}_X", status=status)
+            shard.finish_run(f"run{index}", 10.0 + index)
+    with ResultStore(tmp_path / "merged.db") as target:
+        run_id, count = merge(target, [tmp_path / "shard1.db", tmp_path / "shard2.db"], "merged")
+        assert (run_id, count) == ("merged", 2)
+        assert [(row["name"], row["status"]) for row in target.results("merged")] == [
+            ("TC001_X", "PASSED"), ("TC002_X", "FAILED")
+        ]
+        with pytest.raises(FileNotFoundError):
+            merge(target, [tmp_path / "missing.db"])
+
+
+def test_merge_copies_step_timings(tmp_path):
+    steps = [Step(0, "goto", "http://localhost:3001", 0.0, 850.0),
+             Step(1, "click", "xpath=html/body/div:nth-child(2)", 0.0, 5000.0, "Timeout 5000ms exceeded")]
+    with ResultStore(tmp_path / "shard.db") as shard:
+        shard.begin_run("run", 1.0, "build")
+        shard.add_result("run", test_id="TC001", name="TC001_X", status="FAILED", steps=steps)
+        shard.finish_run("run", 2.0)
+    with ResultStore(tmp_path / "merged.db") as target:
+        merge(target, [tmp_path / "shard.db"], "merged")
+        [row] = target.results("merged").fetchall()
+        assert [(s.key, s.duration_ms, s.error) for s in target.steps(row["id"])] == [
+            (s.key, s.duration_ms, s.error) for s in steps
+        ]
+        assert target.step_durations("TC001_X") == {"0:goto:http://localhost:3001": [850.0]}
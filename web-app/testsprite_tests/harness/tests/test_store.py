@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from harness.store import ResultStore, import_testsprite_json
+
+
+def _item(title, status="PASSED"):
+    return {"title": title, "testStatus": status, "description": "", "code": "print()",
+            "testError": "", "created": "2025-07-24T10:00:00.000Z", "modified": "2025-07-24T10:00:05.000Z"}
+
+
+def test_import_is_idempotent(tmp_path):
+    path = tmp_path / "test_results.json"
+    path.write_text(json.dumps([_item("TC001-Login works"), _item("TC002-Logout works", "FAILED")]))
+    with ResultStore(tmp_path / "results.db") as store:
+        run_id = import_testsprite_json(store, path)
+        assert run_id is not None
+        assert [row["name"] for row in store.results(run_id)] == ["TC001_Login_works", "TC002_Logout_works"]
+        assert import_testsprite_json(store, path) is None
+
+
+def test_failed_import_leaves_no_partial_run(tmp_path):
+    path = tmp_path / "test_results.json"
+    broken = _item("TC002-Logout works")
+    del broken["testStatus"]
+    path.write_text(json.dumps([_item("TC001-Login works"), broken]))
+    with ResultStore(tmp_path / "results.db") as store:
+        with pytest.raises(KeyError):
+            import_testsprite_json(store, path)
+        assert store.runs() == []
+        assert store.db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 0
+
+        # A retry imports again instead of reporting the file as already imported.
+        with pytest.raises(KeyError):
+            import_testsprite_json(store, path)
+
+
+def test_run_is_finished_once(tmp_path):
+    with ResultStore(tmp_path / "results.db") as store:
+        store.begin_run("run", 1.0, None)
+        assert not store.begin_run("run", 2.0, None)
+        store.finish_run("run", 10.0)
+        store.finish_run("run", 20.0)
+        assert store.db.execute("SELECT finished_at FROM runs").fetchone()[0] == 10.0
@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+
+from harness.loader import TestScript
+from harness.runner import Step
+from harness.store import ResultStore
+from harness.timeouts import MIN_SAMPLES, AdaptiveTimeouts, budget
+
+TIMEOUT = "TimeoutError: Locator.click: Timeout 1000ms exceeded."
+
+
+def test_budget_needs_history():
+    assert budget([100.0] * (MIN_SAMPLES - 1)) is None
+    assert budget([100.0, 200.0, 1000.0], factor=3.0) == 3000.0
+
+
+def test_timed_out_steps_widen_the_budget():
+    tight = budget([300.0, 320.0, 340.0], factor=3.0)
+    assert tight == 1020.0
+    # The step then times out at its 1020 ms budget: it took at least that long.
+    assert budget([300.0, 320.0, 340.0], factor=3.0, timed_out=[1020.0]) == 1020.0 * 2 * 3
+    assert budget([], factor=3.0, timed_out=[1020.0] * MIN_SAMPLES) == 1020.0 * 2 * 3
+
+
+def _plugin(db, steps_per_run):
+    store = ResultStore(db)
+    store.begin_run("run", 0.0, None)
+    for number, steps in enumerate(steps_per_run):
+        store.add_result("run", test_id="TC001", name="TC001_X", status="PASSED", started_at=float(number),
+                         steps=steps)
+    return store, AdaptiveTimeouts(store, factor=3.0)
+
+
+def _configure(plugin, step, options):
+    test = TestScript(Path("TC001_X.py"))
+    asyncio.run(plugin.on_test_start(test))
+    options = dict(options)
+    plugin.configure_step(test, step, options)
+    return options
+
+
+def test_timeouts_in_history_are_learned(tmp_path):
+    click = lambda ms, error="": Step(1, "click", "button", 0.0, ms, error)
+    store, plugin = _plugin(tmp_path / "results.db", [[click(300.0)], [click(320.0)], [click(1000.0, TIMEOUT)]])
+    with store:
+        assert _configure(plugin, click(0.0), {"timeout": 5000}) == {"timeout": 6000}
+
+
+def test_swallowed_waits_are_not_tightened(tmp_path):
+    wait = lambda ms: Step(0, "wait_for_load_state", "domcontentloaded", 0.0, ms)
+    click = lambda ms: Step(0, "click", "button", 0.0, ms)
+    store, plugin = _plugin(tmp_path / "waits.db", [[wait(100.0)]] * 3)
+    with store:
+        assert _configure(plugin, wait(0.0), {"timeout": 3000}) == {"timeout": 3000}
+        assert _configure(plugin, wait(0.0), {}) == {"timeout": 5000}
+    store, plugin = _plugin(tmp_path / "clicks.db", [[click(100.0)]] * 3)
+    with store:
+        assert _configure(plugin, click(0.0), {"timeout": 5000}) == {"timeout": 1000}
@@ -0,0 +1,96 @@
+import asyncio
+import base64
+import json
+import os
+import time
+
+from harness.ws_server import StreamServer, accept_key, read_frame
+
+
+def test_accept_key_matches_rfc_6455_example():
+    assert accept_key("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+
+
+async def _connect(port, path="/ws"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    response = (await reader.readuntil(b"\r\n\r\n")).decode()
+    return reader, writer, key, response
+
+
+def _client_frame(payload: bytes) -> bytes:
+    mask = os.urandom(4)
+    masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return bytes([0x81, 0x80 | len(payload)]) + mask + masked
+
+
+async def _messages(reader, seconds):
+    found = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            opcode, payload = await asyncio.wait_for(read_frame(reader), deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            break
+        found.append(json.loads(payload))
+    return found
+
+
+def test_streams_scheduled_messages_to_open_connections():
+    server = StreamServer("ws://127.0.0.1:0/ws")
+    server.start()
+    try:
+        async def scenario():
+            server.set_rate(200)
+            await asyncio.sleep(0.1)
+            # Nothing was delivered while no client was connected.
+            assert server.drain()["delivered"] == 0
+
+            reader, writer, key, response = await _connect(server.port)
+            assert response.startswith("HTTP/1.1 101") and accept_key(key) in response
+            messages = await _messages(reader, 0.3)
+            assert messages and {m["type"] for m in messages} == {"DASHBOARD_UPDATE", "REAL_TIME_DATA"}
+            stats = server.drain()
+            assert stats["sockets"] == 1 and stats["delivered"] >= len(messages)
+
+            server.set_rate(0)
+            await asyncio.sleep(0.05)
+            await _messages(reader, 0.05)
+            writer.write(_client_frame(json.dumps({"type": "HEARTBEAT"}).encode()))
+            assert [m["type"] for m in await _messages(reader, 0.3)] == ["HEARTBEAT"]
+            assert server.sent == {"HEARTBEAT": 1}
+            writer.close()
+
+            _, other, _, response = await _connect(server.port, "/elsewhere")
+            assert response.startswith("HTTP/1.1 404")
+            other.close()
+
+        asyncio.run(scenario())
+    finally:
+        server.stop()
+
+
+def test_frames_carry_their_scheduled_time():
+    server = StreamServer("ws://127.0.0.1:0/ws")
+    server.start()
+    try:
+        async def scenario():
+            reader, writer, _, _ = await _connect(server.port)
+            await asyncio.sleep(0.05)
+            started = time.time() * 1000
+            server.set_rate(100)
+            messages = await _messages(reader, 0.25)
+            writer.close()
+            return started, messages
+
+        started, messages = asyncio.run(scenario())
+    finally:
+        server.stop()
+    timestamps = [m["timestamp"] for m in messages]
+    assert timestamps == sorted(timestamps)
+    assert abs(timestamps[0] - started) < 50
+    assert all(abs((b - a) - 10) < 1 for a, b in zip(timestamps, timestamps[1:]))
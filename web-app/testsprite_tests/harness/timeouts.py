@@ -0,0 +1,94 @@
+"""Adaptive per-step timeouts learned from the results store.
+
+The scripts hardcode their timeouts: 10 s for ``goto``, 5 s for clicks, 3 s
+for ``wait_for_load_state``. Steps that are usually slow flake against them,
+and a step that normally takes 80 ms still waits the full 5 s before a
+failure is reported.
+
+``AdaptiveTimeouts`` sets each step's ``timeout`` argument to the p99 of the
+step's durations in the script's last ``WINDOW`` results, times
+``SAFETY_FACTOR``, clamped to ``[MIN_TIMEOUT_MS, MAX_TIMEOUT_MS]``. Steps are
+identified by ``Step.key`` (position, action, target). A step with fewer than
+``MIN_SAMPLES`` recorded durations keeps the script's own timeout.
+
+A step that timed out only tells us it takes longer than its timeout, so its
+duration counts as a lower bound, ``TIMEOUT_FACTOR`` times the time it
+waited; a budget set too tight then widens on the next run instead of
+failing forever. Steps that failed for other reasons are left out.
+
+Waits in ``NO_TIGHTEN`` are never given less than the script's own timeout:
+the scripts wrap ``wait_for_load_state`` in ``try/except: pass``, so a
+shorter wait would not fail, it would silently cut the wait short.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from .config import DEFAULT_TIMEOUT_MS
+from .loader import TestScript
+from .runner import Plugin, Step, TestResult
+from .store import ResultStore
+
+WINDOW = 20
+PERCENTILE = 99
+SAFETY_FACTOR = 3.0
+MIN_SAMPLES = 3
+MIN_TIMEOUT_MS = 1000.0
+MAX_TIMEOUT_MS = 60_000.0
+TIMEOUT_FACTOR = 2.0
+NO_TIGHTEN = ("wait_for_load_state",)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def budget(durations: list[float], factor: float = SAFETY_FACTOR, timed_out: list[float] = ()) -> float | None:
+    """Timeout (ms) for a step with these past durations, or ``None`` without enough history.
+
+    ``timed_out`` are the waits of runs where the step timed out; each counts
+    as a ``TIMEOUT_FACTOR`` times longer duration.
+    """
+    samples = list(durations) + [waited * TIMEOUT_FACTOR for waited in timed_out]
+    if len(samples) < MIN_SAMPLES:
+        return None
+    return min(max(percentile(samples, PERCENTILE) * factor, MIN_TIMEOUT_MS), MAX_TIMEOUT_MS)
+
+
+class AdaptiveTimeouts(Plugin):
+    """Runner plugin replacing step timeouts with budgets learned from history."""
+
+    def __init__(self, store: ResultStore, factor: float = SAFETY_FACTOR, window: int = WINDOW):
+        self.store = store
+        self.factor = factor
+        self.window = window
+        self.budgets: dict[str, float] = {}
+        self.applied: dict[str, float] = {}
+
+    async def on_test_start(self, test: TestScript) -> None:
+        history = self.store.step_durations(test.name, self.window)
+        timed_out = self.store.step_timeouts(test.name, self.window)
+        self.budgets = {
+            key: timeout for key, timeout in
+            ((key, budget(history.get(key, []), self.factor, timed_out.get(key, [])))
+             for key in history.keys() | timed_out.keys())
+            if timeout is not None
+        }
+        self.applied = {}
+
+    def configure_step(self, test: TestScript, step: Step, options: dict[str, Any]) -> None:
+        timeout = self.budgets.get(step.key)
+        if timeout is None:
+            return
+        if step.action in NO_TIGHTEN:
+            timeout = max(timeout, options.get("timeout", DEFAULT_TIMEOUT_MS))
+        options["timeout"] = round(timeout)
+        self.applied[step.key] = round(timeout)
+
+    async def on_test_end(self, test: TestScript, result: TestResult) -> None:
+        if self.applied:
+            result.metrics["timeouts"] = self.applied
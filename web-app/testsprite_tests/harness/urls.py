@@ -0,0 +1,62 @@
+"""Mapping of app URLs to routes and source modules.
+
+The suite runs against the Vite dev server, which serves every source file
+under its own URL (``/src/features/email/services/emailService.js?t=...``).
+These helpers turn such URLs back into repository paths and route patterns.
+"""
+
+from __future__ import annotations
+
+import re
+from urllib.parse import urlsplit
+
+from .config import BASE_URL
+
+_ID_SEGMENT_RE = re.compile(
+    r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{16,})$",
+    re.IGNORECASE,
+)
+_TOOLING_PREFIXES = ("@vite/", "@react-refresh", "@id/__x00__")
+
+
+def route_for_url(url: str) -> str:
+    """Route pattern for a page URL: path only, with id-like segments as ``:id``."""
+    path = urlsplit(url).path or "/"
+    segments = [":id" if _ID_SEGMENT_RE.match(s) else s for s in path.split("/") if s]
+    return "/" + "/".join(segments)
+
+
+def module_for_url(url: str, base_url: str = BASE_URL) -> str | None:
+    """Repository-relative module path for an app asset URL.
+
+    Returns ``None`` for URLs that do not belong to the app origin (iframes,
+    extensions, ``about:`` documents, evaluated snippets).
+    """
+    parts = urlsplit(url)
+    if not parts.scheme.startswith("http") or parts.netloc != urlsplit(base_url).netloc:
+        return None
+    path = parts.path.lstrip("/")
+    if not path:
+        return None
+    if path.startswith("@fs/"):
+        # Files outside the Vite root: keep the part from node_modules/ or src/.
+        for marker in ("node_modules/", "src/"):
+            index = path.find(marker)
+            if index != -1:
+                return path[index:]
+        return path[len("@fs/"):]
+    return path
+
+
+def module_group(module: str) -> str:
+    """Coarse bucket for a module: a feature, a top-level source dir, or deps."""
+    if module.startswith(_TOOLING_PREFIXES):
+        return "tooling"
+    if module.startswith("node_modules/"):
+        return "deps"
+    parts = module.split("/")
+    if parts[0] == "src" and len(parts) > 2:
+        if parts[1] == "features" and len(parts) > 3:
+            return f"src/features/{parts[2]}"
+        return f"src/{parts[1]}"
+    return parts[0]
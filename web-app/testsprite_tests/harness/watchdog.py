@@ -0,0 +1,108 @@
+"""Wall-clock budgets for tests and steps, enforced while the script runs.
+
+Playwright's own timeouts do not cover everything: a wedged driver, a
+``wait_for_timeout`` with a huge value or an ``asyncio.sleep`` in a script can
+hold a serial run until the CI job times out. The runner executes each script
+in its own task and ``Watchdog.guard`` polls it:
+
+- the test has run longer than ``test_budget_s``, or
+- the current step has run longer than ``step_budget_s``.
+
+On a breach the watchdog records a ``Breach``, with the stacks of all pending
+asyncio tasks and the last completed step. It then closes every context the
+script opened, which fails its pending Playwright calls. If the script has
+not finished ``GRACE_S`` later, its task is cancelled, and after another
+``GRACE_S`` the runner moves on without it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+logger = logging.getLogger("harness.watchdog")
+
+TEST_BUDGET_S = 300.0
+STEP_BUDGET_S = 120.0
+POLL_S = 0.5
+GRACE_S = 5.0
+
+
+@dataclass
+class Breach:
+    reason: str
+    step: str  # the step that was running, if any
+    last_completed: str
+    tasks: str
+
+    def describe(self) -> str:
+        return "\n".join([
+            f"Watchdog: {self.reason}",
+            f"  running step:        {self.step or '-'}",
+            f"  last completed step: {self.last_completed or '-'}",
+            "Pending asyncio tasks:",
+            self.tasks,
+        ])
+
+
+def task_dump(exclude: Sequence[asyncio.Task] = ()) -> str:
+    """Stacks of every pending task on the running loop."""
+    out = io.StringIO()
+    for task in asyncio.all_tasks():
+        if task in exclude or task.done():
+            continue
+        out.write(f"--- {task.get_name()}: {task.get_coro()!r}\n")
+        task.print_stack(limit=8, file=out)
+    return out.getvalue()
+
+
+class Watchdog:
+    def __init__(self, test_budget_s: float | None = TEST_BUDGET_S, step_budget_s: float | None = STEP_BUDGET_S):
+        self.test_budget_s = test_budget_s
+        self.step_budget_s = step_budget_s
+
+    def _check(self, started: float, dispatcher: Any) -> str | None:
+        now = time.time()
+        if self.test_budget_s and now - started > self.test_budget_s:
+            return f"test exceeded its {self.test_budget_s:.0f}s budget"
+        step = dispatcher.step
+        if self.step_budget_s and step is not None and now - step.started_at > self.step_budget_s:
+            return f"step {step.key} exceeded its {self.step_budget_s:.0f}s budget"
+        return None
+
+    async def guard(self, task: asyncio.Task, dispatcher: Any, contexts: list) -> Breach | None:
+        """Watch ``task`` until it finishes; on a breach, free the slot and return what happened."""
+        started = time.time()
+        while not task.done():
+            await asyncio.wait({task}, timeout=POLL_S)
+            reason = None if task.done() else self._check(started, dispatcher)
+            if reason is None:
+                continue
+            completed = [step for step in dispatcher.steps if step is not dispatcher.step]
+            breach = Breach(
+                reason=reason,
+                step=dispatcher.step.key if dispatcher.step else "",
+                last_completed=completed[-1].key if completed else "",
+                tasks=task_dump(exclude=[asyncio.current_task()]),
+            )
+            logger.warning("%s: %s", dispatcher.test.name if dispatcher.test else "?", reason)
+            await self._free(task, contexts)
+            return breach
+        return None
+
+    async def _free(self, task: asyncio.Task, contexts: list) -> None:
+        for context in contexts:
+            try:
+                await asyncio.wait_for(context.close(), GRACE_S)
+            except Exception:
+                logger.debug("force-closing %s failed", context, exc_info=True)
+        await asyncio.wait({task}, timeout=GRACE_S)
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task}, timeout=GRACE_S)
+        if not task.done():
+            logger.warning("test task ignored cancellation; abandoning it")
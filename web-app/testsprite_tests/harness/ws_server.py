@@ -0,0 +1,233 @@
+"""Local WebSocket server streaming ``websocketService`` messages.
+
+The real-time benchmark needs a message source whose cost does not land on
+the page it measures. ``StreamServer`` is that source: a minimal RFC 6455
+server (text frames, ping/pong, close; no extensions) that runs on its own
+thread and event loop in the harness process. The dev server's
+``VITE_WS_URL`` points the app at it (``ws://localhost:8080/ws``), so the
+browser receives the stream over a real socket and only decodes and handles
+it, as in production.
+
+Messages alternate ``DASHBOARD_UPDATE`` and ``REAL_TIME_DATA`` and are
+scheduled against wall-clock time; each carries its scheduled time (epoch ms)
+as ``timestamp``, so the page can measure delivery lag (``js/ws_probe.js``).
+Client ``HEARTBEAT`` messages are answered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import struct
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("harness.ws_server")
+
+DEFAULT_URL = "ws://localhost:8080/ws"
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_TEXT, _CLOSE, _PING, _PONG = 0x1, 0x8, 0x9, 0xA
+# Longest sleep between schedule checks; short enough for 5000 msg/s batches.
+_TICK_S = 0.005
+
+
+def accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + _GUID).encode()).digest()).decode()
+
+
+def encode_frame(payload: bytes, opcode: int = _TEXT) -> bytes:
+    """A final, unmasked server frame."""
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 1 << 16:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Opcode and unmasked payload of the next frame; fragments are not reassembled."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else b""
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def message(seq: int, timestamp: float) -> dict:
+    if seq % 2:
+        return {"type": "DASHBOARD_UPDATE", "payload": {"metric": "revenue", "value": seq, "seq": seq},
+                "timestamp": timestamp}
+    return {"type": "REAL_TIME_DATA", "payload": {"type": "metrics", "metrics": {"activeUsers": seq % 500, "seq": seq}},
+            "timestamp": timestamp}
+
+
+class StreamServer:
+    def __init__(self, url: str = DEFAULT_URL):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port if parts.port is not None else 80  # 0: any free port, set on start
+        self.path = parts.path or "/"
+        self.connects = 0
+        self.sent: dict[str, int] = {}
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._rate = 0.0
+        self._started_at = 0.0
+        self._scheduled = 0
+        self._delivered = 0
+        self._window_start = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._stopping: asyncio.Event | None = None
+        self._error: BaseException | None = None
+
+    # -- control (any thread) ---------------------------------------------------
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), name="ws-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = self._loop = None
+
+    def _call(self, function, *args) -> Any:
+        async def call():
+            return function(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result()
+
+    def set_rate(self, rate: float) -> None:
+        """Send ``rate`` messages per second to every open connection."""
+        self._call(self._set_rate, rate)
+
+    def drain(self) -> dict:
+        """Open connections and messages written to at least one since the previous drain."""
+        return self._call(self._drain)
+
+    # -- server loop --------------------------------------------------------------
+
+    def _set_rate(self, rate: float) -> None:
+        self._rate = rate
+        self._started_at = time.time()
+        self._scheduled = 0
+
+    def _drop(self) -> None:
+        for writer in list(self._clients):
+            writer.transport.abort()
+        self._clients.clear()
+
+    def _drain(self) -> dict:
+        now = time.monotonic()
+        snapshot = {"sockets": len(self._clients), "delivered": self._delivered,
+                    "elapsed_ms": (now - self._window_start) * 1000}
+        self._delivered = 0
+        self._window_start = now
+        return snapshot
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError as exc:
+            self._error = exc
+            self._ready.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        pump = asyncio.create_task(self._pump())
+        try:
+            await self._stopping.wait()
+        finally:
+            pump.cancel()
+            self._drop()
+            server.close()
+            await server.wait_closed()
+
+    async def _pump(self) -> None:
+        while True:
+            await asyncio.sleep(_TICK_S)
+            if not self._rate:
+                continue
+            due = int((time.time() - self._started_at) * self._rate)
+            frames = []
+            for seq in range(self._scheduled, due):
+                timestamp = (self._started_at + seq / self._rate) * 1000
+                frames.append(encode_frame(json.dumps(message(seq, timestamp)).encode()))
+            self._scheduled = max(self._scheduled, due)
+            if not frames or not self._clients:
+                continue
+            self._delivered += len(frames)
+            payload = b"".join(frames)
+            for writer in list(self._clients):
+                writer.write(payload)
+            # A client that stops reading holds the schedule back, as a real server's buffers would.
+            await asyncio.gather(*(writer.drain() for writer in list(self._clients)), return_exceptions=True)
+
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        request = await reader.readuntil(b"\r\n\r\n")
+        lines = request.decode("latin-1").split("\r\n")
+        path = lines[0].split(" ")[1] if len(lines[0].split(" ")) > 1 else ""
+        headers = {name.strip().lower(): value.strip() for name, _, value in (l.partition(":") for l in lines[1:] if l)}
+        if urlsplit(path).path != self.path or "sec-websocket-key" not in headers:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return False
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            + f"Sec-WebSocket-Accept: {accept_key(headers['sec-websocket-key'])}\r\n\r\n".encode()
+        )
+        return True
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            if not await self._handshake(reader, writer):
+                return
+            self.connects += 1
+            self._clients.add(writer)
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == _CLOSE:
+                    writer.write(encode_frame(payload[:2], _CLOSE))
+                    break
+                if opcode == _PING:
+                    writer.write(encode_frame(payload, _PONG))
+                elif opcode == _TEXT:
+                    self._receive(writer, payload)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        except Exception:
+            logger.debug("websocket connection failed", exc_info=True)
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def _receive(self, writer: asyncio.StreamWriter, payload: bytes) -> None:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return  # non-JSON frames are accepted and dropped
+        kind = data.get("type") if isinstance(data, dict) else None
+        self.sent[str(kind)] = self.sent.get(str(kind), 0) + 1
+        if kind == "HEARTBEAT":
+            writer.write(encode_frame(json.dumps({"type": "HEARTBEAT", "timestamp": time.time() * 1000}).encode()))
@@ -0,0 +1,42 @@
+"""Python side of ``js/ws_source.js``, the in-page WebSocket message source.
+
+The source stands in for the server ``websocketService`` connects to
+(``ws://localhost:8080/ws`` in development), so flows that depend on the
+socket can run without one. It runs on the page's main thread, so it is for
+flows under the virtual clock; ``ws_server`` serves the real-time benchmark.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from .config import JS_DIR
+
+SOURCE_SCRIPT = JS_DIR / "ws_source.js"
+# Substring of the socket URLs served by the source
+DEFAULT_MATCH = "ws://localhost:8080"
+
+
+async def install(context: Any, match: str = DEFAULT_MATCH) -> None:
+    """Serve sockets whose URL contains ``match`` from the in-page source."""
+    await context.add_init_script(script=f"window.__harnessWsSourceMatch = {json.dumps(match)};")
+    await context.add_init_script(path=str(SOURCE_SCRIPT))
+
+
+async def set_rate(page: Any, rate: float) -> None:
+    await page.evaluate("rate => window.__harnessWsSource.setRate(rate)", rate)
+
+
+async def set_accepting(page: Any, accepting: bool) -> None:
+    await page.evaluate("value => window.__harnessWsSource.setAccepting(value)", accepting)
+
+
+async def drop(page: Any) -> None:
+    """Close every open source socket uncleanly (code 1006)."""
+    await page.evaluate("() => window.__harnessWsSource.drop()")
+
+
+async def stats(page: Any) -> dict | None:
+    """``{"connects", "open", "sent": {type: count}}``, or ``None`` if not installed."""
+    return await page.evaluate("() => window.__harnessWsSource ? window.__harnessWsSource.stats() : null")